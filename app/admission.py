@@ -0,0 +1,233 @@
+import asyncio
+import hmac
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from fastapi import HTTPException, Request
+
+from .config import settings
+from .deadlines import deadline_exceeded, timeout_for
+from .metrics import (
+    LLM_ADMISSION_ACTIVE,
+    LLM_ADMISSION_WAITING,
+    LLM_ADMISSIONS,
+    RATE_LIMIT_CLIENTS,
+    RATE_LIMITED,
+)
+
+
+class AdmissionRejected(Exception):
+    """Too many LLM calls are running and waiting; shed this one."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Global cap on concurrent LLM calls with a small, bounded wait queue.
+
+    Up to ``max_concurrent`` calls run at once. Up to ``max_waiting`` more
+    may wait ``max_wait_seconds`` for a slot, or less under a client
+    deadline; anything beyond that is rejected immediately instead of
+    piling up behind the upstream.
+    """
+
+    def __init__(self, max_concurrent: int, max_waiting: int, max_wait_seconds: float):
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.max_wait_seconds = max_wait_seconds
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # What this controller has added to the shared gauges so far
+        self._published_active = 0
+        self._published_waiting = 0
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _publish(self) -> None:
+        """Move the Prometheus gauges by the change since the last call."""
+        LLM_ADMISSION_ACTIVE.inc(self.active - self._published_active)
+        LLM_ADMISSION_WAITING.inc(self.waiting - self._published_waiting)
+        self._published_active = self.active
+        self._published_waiting = self.waiting
+
+    def _count(self, outcome: str) -> None:
+        if outcome == "admitted":
+            self.admitted += 1
+        else:
+            self.rejected += 1
+        LLM_ADMISSIONS.labels(outcome).inc()
+
+    async def acquire(self) -> None:
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self._count("admitted")
+            self._publish()
+            return
+
+        if len(self._waiters) >= self.max_waiting:
+            self._count("rejected")
+            raise AdmissionRejected("The server is busy. Please try again shortly.", retry_after=1)
+
+        timeout, deadline_limited = timeout_for(self.max_wait_seconds, stage="queue")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._publish()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            self._publish()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._count("rejected")
+            if deadline_limited:
+                raise deadline_exceeded(
+                    "queue", "The request deadline passed while waiting for a free model slot."
+                ) from None
+            raise AdmissionRejected(
+                "The server is busy. Please try again shortly.",
+                retry_after=self.max_wait_seconds,
+            ) from None
+
+        self._count("admitted")
+
+    def release(self) -> None:
+        # Hand the slot straight to the next waiter, if any
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._publish()
+                return
+        self.active -= 1
+        self._publish()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def take(self) -> float:
+        """Take one token; return 0 on success or the seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Token bucket per client, keeping at most ``max_clients`` buckets (LRU)."""
+
+    def __init__(self, per_minute: float, burst: int, max_clients: int = 10000):
+        self.rate = per_minute / 60
+        self.burst = burst
+        self.max_clients = max_clients
+        self.limited = 0
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    def check(self, client_key: str) -> float:
+        """0 if the request may proceed, otherwise seconds to wait."""
+        if self.rate <= 0:
+            return 0.0
+
+        bucket = self._buckets.get(client_key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst)
+            self._buckets[client_key] = bucket
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+            else:
+                RATE_LIMIT_CLIENTS.inc()
+        else:
+            self._buckets.move_to_end(client_key)
+
+        wait = bucket.take()
+        if wait:
+            self.limited += 1
+            RATE_LIMITED.inc()
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        return {"clients": len(self._buckets), "limited": self.limited}
+
+
+def _is_configured_api_key(api_key: str) -> bool:
+    return any(
+        hmac.compare_digest(api_key.encode(), known.encode())
+        for known in settings.rate_limit_api_keys
+    )
+
+
+def client_key(request: Request) -> str:
+    """A configured API key when the client sends one, otherwise its IP address.
+
+    Unknown keys are ignored: a client could otherwise get a fresh bucket
+    per request, and push other clients' buckets out, by making keys up.
+    """
+    api_key = request.headers.get("x-api-key")
+    if api_key and _is_configured_api_key(api_key):
+        return f"key:{api_key}"
+
+    forwarded: Optional[str] = request.headers.get("x-forwarded-for")
+    if settings.rate_limit_trust_forwarded_for and forwarded:
+        return f"ip:{forwarded.split(',')[0].strip()}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+async def enforce_rate_limit(request: Request) -> None:
+    """Router dependency: 429 once a client's token bucket is empty."""
+    wait = rate_limiter.check(client_key(request))
+    if wait:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests. Please slow down.",
+            headers={"Retry-After": str(max(1, round(wait)))},
+        )
+
+
+llm_admission = AdmissionController(
+    max_concurrent=settings.llm_max_concurrency,
+    max_waiting=settings.llm_max_queue,
+    max_wait_seconds=settings.llm_queue_timeout_seconds,
+)
+
+rate_limiter = RateLimiter(
+    per_minute=settings.rate_limit_per_minute,
+    burst=settings.rate_limit_burst,
+)
@@ -0,0 +1,284 @@
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+# Spelling variants mapped to one canonical term
+SYNONYMS: Dict[str, str] = {
+    "k8s": "kubernetes",
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "golang": "go",
+    "py": "python",
+    "python3": "python",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "nextjs": "next.js",
+    "dotnet": ".net",
+    "asp.net": ".net",
+    "amazon web services": "aws",
+    "google cloud platform": "gcp",
+    "google cloud": "gcp",
+    "microsoft azure": "azure",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "ci/cd": "ci/cd",
+    "cicd": "ci/cd",
+    "continuous integration": "ci/cd",
+    "rest": "rest api",
+    "restful": "rest api",
+    "restful api": "rest api",
+    "restful apis": "rest api",
+    "rest apis": "rest api",
+    "apis": "api",
+    "microservice": "microservices",
+    "oop": "object-oriented programming",
+    "object oriented programming": "object-oriented programming",
+    "sql server": "sql server",
+    "mssql": "sql server",
+    "tf": "tensorflow",
+    "sklearn": "scikit-learn",
+    "gh actions": "github actions",
+    "unit tests": "unit testing",
+    "test automation": "automated testing",
+}
+
+# Known multi-word skills, matched as phrases before single words
+SKILL_PHRASES = {
+    "machine learning",
+    "deep learning",
+    "data structures",
+    "data analysis",
+    "data engineering",
+    "distributed systems",
+    "system design",
+    "unit testing",
+    "automated testing",
+    "github actions",
+    "rest api",
+    "object-oriented programming",
+    "natural language processing",
+    "artificial intelligence",
+    "computer vision",
+    "sql server",
+    "spring boot",
+    "event driven",
+    "message queues",
+    "version control",
+    "agile",
+} | {phrase for phrase in SYNONYMS if " " in phrase}
+
+# Single-word skills worth flagging even when the JD mentions them once
+SKILL_TERMS = {
+    "python", "java", "javascript", "typescript", "go", "rust", "c++", "c#", ".net",
+    "kotlin", "swift", "scala", "ruby", "php", "sql", "nosql", "postgresql", "mysql",
+    "mongodb", "redis", "kafka", "rabbitmq", "elasticsearch", "graphql", "grpc", "api",
+    "react", "angular", "vue", "node.js", "next.js", "django", "flask", "fastapi",
+    "spring", "docker", "kubernetes", "terraform", "ansible", "aws", "azure", "gcp",
+    "linux", "git", "ci/cd", "jenkins", "microservices", "serverless", "pandas",
+    "numpy", "pytorch", "tensorflow", "scikit-learn", "spark", "hadoop", "airflow",
+    "snowflake", "tableau", "html", "css", "saas", "security", "oauth", "caching",
+    "observability", "prometheus", "grafana", "testing", "scrum",
+}
+
+# Words that are also everyday English ("ready to go", "the rest of the
+# team"); only counted as skills when written or used like one, see
+# `_in_skill_context`
+AMBIGUOUS_TERMS = {"go", "rest"}
+
+# Neighbouring words that mark an ambiguous word as a skill
+SKILL_CONTEXT = {
+    "developer", "developers", "engineer", "engineers", "programming", "language",
+    "code", "backend", "service", "services", "microservices", "api", "apis",
+    "endpoint", "endpoints", "interface", "interfaces", "architecture",
+}
+
+STOPWORDS = {
+    "a", "an", "and", "the", "for", "with", "you", "your", "our", "are", "will",
+    "who", "this", "that", "from", "have", "has", "all", "not", "but", "can",
+    "able", "work", "team", "teams", "role", "job", "including", "such", "into",
+    "their", "its", "about", "they", "them", "was", "were", "been", "being",
+    "also", "any", "to", "of", "in", "on", "or", "as", "is", "be", "we", "at",
+    "by", "us", "it", "if", "etc", "using", "use", "used", "new", "strong",
+    "experience", "experienced", "years", "year", "plus", "knowledge", "skills",
+    "skill", "ability", "responsibilities", "requirements", "preferred",
+    "required", "candidate", "candidates", "looking", "join", "company", "working",
+    "help", "build", "building", "across", "within", "well", "good", "great",
+    "excellent", "understanding", "familiarity", "other", "more",
+    "what", "how", "out", "day", "one", "two", "per", "via", "like",
+    "opportunity", "must", "should", "would", "may", "high", "based",
+}
+
+# One alternation, longest phrases first so "google cloud platform" wins
+# over "google cloud"
+_PHRASE_RE = re.compile(
+    r"(?<![a-z0-9])("
+    + "|".join(re.escape(phrase) for phrase in sorted(SKILL_PHRASES, key=len, reverse=True))
+    + r")(?![a-z0-9])"
+)
+_TOKEN_RE = re.compile(
+    r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]|\.net(?![a-z0-9])|c\+\+|c#"
+)
+# Words that may separate items of a skill list
+_LIST_WORDS = {"and", "or"}
+
+
+def _canonical(term: str) -> str:
+    return SYNONYMS.get(term, term)
+
+
+def _in_skill_context(text: str, tokens: List[Tuple[str, int, int]], index: int) -> bool:
+    """Whether the ambiguous word at ``tokens[index]`` is used as a skill.
+
+    It is when capitalized mid-sentence ("experience with Go", "REST"), or
+    next to a word such as "developer" or "endpoints" or to another skill,
+    as in "Python, Go and Rust".
+    """
+    token, start, end = tokens[index]
+    original = text[start:end]
+    if original != token:
+        before = text[:start].rstrip(" \t")
+        sentence_start = not before or before[-1] in "\n.!?-*•"
+        if original.isupper() and len(original) > 2 or not sentence_start:
+            return True
+
+    for step in (-1, 1):
+        neighbour = index + step
+        while 0 <= neighbour < len(tokens) and tokens[neighbour][0] in _LIST_WORDS:
+            neighbour += step
+        if 0 <= neighbour < len(tokens):
+            word = tokens[neighbour][0]
+            if word in SKILL_CONTEXT or (
+                word not in AMBIGUOUS_TERMS and _canonical(word) in SKILL_TERMS
+            ):
+                return True
+    return False
+
+
+def extract_terms(text: str) -> List[str]:
+    """Tokenize text into normalized terms, matching skill phrases first."""
+    lowered = text.lower()
+    terms = [_canonical(phrase) for phrase in _PHRASE_RE.findall(lowered)]
+    # Blanked out at the same length, so token offsets still index ``text``
+    lowered = _PHRASE_RE.sub(lambda match: " " * len(match.group()), lowered)
+    if len(lowered) != len(text):
+        # lower() changed the length (rare non-ASCII); case is then not used
+        text = lowered
+
+    tokens: List[Tuple[str, int, int]] = []
+    for match in _TOKEN_RE.finditer(lowered):
+        word, start = match.group(), match.start()
+        if "/" in word and _canonical(word) not in SKILL_TERMS:
+            # "c#/.net", "python/django": one term per part
+            for part in word.split("/"):
+                if part:
+                    tokens.append((part, start, start + len(part)))
+                start += len(part) + 1
+        else:
+            tokens.append((word, start, match.end()))
+
+    for index, (token, _, _) in enumerate(tokens):
+        if token in STOPWORDS or token.isdigit():
+            continue
+        if token in AMBIGUOUS_TERMS and not _in_skill_context(text, tokens, index):
+            continue
+        terms.append(_canonical(token))
+
+    return terms
+
+
+def _is_keyword(term: str, count: int) -> bool:
+    """Whether a JD term is worth reporting as a keyword."""
+    if term in SKILL_TERMS or " " in term or term in SYNONYMS.values():
+        return True
+    return count >= 2 and len(term) > 3
+
+
+@dataclass
+class KeywordGapReport:
+    match_score: float                       # 0-100, weighted share of JD keywords found
+    matched_keywords: List[str] = field(default_factory=list)
+    missing_keywords: List[str] = field(default_factory=list)
+    suggestions: List[str] = field(default_factory=list)
+
+
+def _suggestions(report: KeywordGapReport, resume_text: str) -> List[str]:
+    suggestions: List[str] = []
+
+    if report.missing_keywords:
+        top = ", ".join(report.missing_keywords[:5])
+        suggestions.append(
+            f"If you have real experience with {top}, name it explicitly in your skills "
+            "or experience bullets so ATS filters can match it."
+        )
+
+    if report.matched_keywords:
+        top = ", ".join(report.matched_keywords[:3])
+        suggestions.append(
+            f"Move bullets that mention {top} to the top of each role, since these are "
+            "the job description's strongest matches."
+        )
+
+    if not re.search(r"\d+\s*(%|percent|x\b|ms\b|k\b|users|requests)", resume_text.lower()):
+        suggestions.append(
+            "Quantify the impact of your work with numbers such as latency, users, "
+            "requests per second or percentage improvements."
+        )
+
+    if report.match_score < 50:
+        suggestions.append(
+            "Mirror the job description's wording for skills you already have, "
+            "e.g. use the same technology names and spelling."
+        )
+
+    return suggestions[:4]
+
+
+def analyze_keyword_gap(resume_text: str, job_description: str) -> KeywordGapReport:
+    """Compare JD keywords with the resume.
+
+    Each JD keyword is weighted by a sublinear term frequency
+    (1 + log tf), doubled for known skills. The score is the weighted share
+    of JD keywords that also appear in the resume.
+    """
+    jd_counts = Counter(extract_terms(job_description))
+    resume_terms = set(extract_terms(resume_text))
+
+    weights: Dict[str, float] = {}
+    for term, count in jd_counts.items():
+        if not _is_keyword(term, count):
+            continue
+        weight = 1 + math.log(count)
+        if term in SKILL_TERMS or term in SKILL_PHRASES:
+            weight *= 2
+        weights[term] = weight
+
+    ranked = sorted(weights, key=lambda t: (-weights[t], t))
+    matched = [term for term in ranked if term in resume_terms]
+    missing = [term for term in ranked if term not in resume_terms]
+
+    total = sum(weights.values())
+    score = 100 * sum(weights[t] for t in matched) / total if total else 0.0
+
+    report = KeywordGapReport(
+        match_score=round(score, 1),
+        matched_keywords=matched,
+        missing_keywords=missing,
+    )
+    report.suggestions = _suggestions(report, resume_text)
+    return report
+
+
+def keyword_suggestions(resume_text: str, job_description: str) -> List[str]:
+    return analyze_keyword_gap(resume_text, job_description).suggestions
+
@@ -1,8 +1,140 @@
+from typing import List
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
-    hf_api_key: str
+    # Without a key the app still starts; /ready reports it and model calls
+    # fail with 503
+    hf_api_key: str = ""
     hf_model_id: str = "mistralai/Mistral-7B-Instruct-v0.2"  
+    # Tried in order when hf_model_id keeps failing, e.g. '["google/gemma-2-2b-it"]'
+    hf_fallback_model_ids: List[str] = []
+    # Send model calls to "<url>/models/<model id>" instead of the Hugging
+    # Face API, e.g. a self-hosted TGI gateway or the benchmark fake server
+    hf_inference_base_url: str = ""
+
+    # Which inference API prompts go to: "huggingface" (the settings above)
+    # or "openai", i.e. self-hosted OpenAI-compatible servers (vLLM, TGI)
+    # balanced across llm_base_urls, e.g. '["http://tgi-1:8080", "http://tgi-2:8080"]'.
+    # llm_api picks /v1/completions ("completions") or /v1/chat/completions ("chat").
+    llm_backend: str = "huggingface"
+    llm_base_urls: List[str] = []
+    llm_api: str = "completions"
+    llm_api_key: str = ""
+    # Shared connection pool for the "openai" backend, and how often each
+    # server's GET /health is probed
+    llm_pool_max_connections: int = 100
+    llm_pool_max_keepalive: int = 50
+    llm_pool_keepalive_seconds: float = 60.0
+    llm_connect_timeout_seconds: float = 5.0
+    llm_health_check_seconds: float = 10.0
+
+    # Upstream resilience: per-call timeout, retries with jittered backoff,
+    # and a circuit breaker per model
+    llm_timeout_seconds: float = 60.0
+    llm_max_retries: int = 2
+    llm_retry_base_delay: float = 0.5
+    llm_retry_max_delay: float = 8.0
+    circuit_failure_threshold: int = 5
+    circuit_reset_seconds: float = 30.0
+
+    # Client deadlines (X-Request-Timeout, in seconds) cap the upstream
+    # timeout and, at this expected decode speed, max_new_tokens. A request
+    # whose deadline cannot fit llm_min_new_tokens fails fast with 504.
+    llm_tokens_per_second: float = 30.0
+    llm_first_token_seconds: float = 1.0
+    llm_min_new_tokens: int = 48
+
+    # Admission control: LLM calls running at once, how many may queue and
+    # for how long, and a per-client token bucket (requests per minute)
+    llm_max_concurrency: int = 16
+    llm_max_queue: int = 32
+    llm_queue_timeout_seconds: float = 10.0
+    rate_limit_per_minute: float = 30
+    rate_limit_burst: int = 10
+    rate_limit_trust_forwarded_for: bool = False
+    # Clients sending one of these in X-API-Key get a bucket per key; any
+    # other X-API-Key value is ignored and the client is limited by IP
+    rate_limit_api_keys: List[str] = []
+
+    # Uploads larger than this are rejected with 413
+    max_upload_bytes: int = 5 * 1024 * 1024
+    # Other request content (JSON bodies, form fields) larger than this is
+    # rejected with 413; multipart bodies may carry this on top of the upload
+    max_request_bytes: int = 10 * 1024 * 1024
+
+    # Uploaded resumes are parsed once and kept by content hash
+    resume_store_max_items: int = 500
+    resume_store_ttl_seconds: int = 3600
+
+    # Batch cover letters: jobs per request and generations in flight at once
+    batch_max_jobs: int = 50
+    batch_concurrency: int = 4
+
+    # PDF extraction runs in a process pool with hard limits
+    pdf_extraction_workers: int = 2
+    pdf_timeout_seconds: float = 15.0
+    pdf_max_pages: int = 30
+    pdf_max_chars: int = 60000
+    pdf_pages_per_worker: int = 8
+
+    # Prompt size limits. The model tokenizer is used for counting when the
+    # optional `tokenizers` package is installed.
+    prompt_use_model_tokenizer: bool = True
+    prompt_jd_token_budget: int = 800
+    # Give every task the same resume/JD context at the start of its prompt
+    # (prefix-cache friendly). When false, each task's resume is trimmed to
+    # its own budget in prompt_builder.TASK_BUDGETS instead.
+    prompt_shared_context: bool = True
+
+    # LLM response cache: "memory" (per process), "sqlite" (shared by all
+    # workers on the host) or "none"
+    llm_cache_backend: str = "memory"
+    llm_cache_path: str = "llm_cache.sqlite3"
+    llm_cache_max_items: int = 1000
+    llm_cache_ttl_seconds: int = 3600
+
+    # Asynchronous jobs (?async=1): worker tasks per process, queue bound,
+    # and how long results are kept in the SQLite job store
+    job_workers: int = 4
+    job_queue_max: int = 100
+    job_store_path: str = "jobs.sqlite3"
+    job_ttl_seconds: int = 3600
+
+    # Interview question pools, one per (role, interview type, difficulty):
+    # background workers generate batches whenever a pool drops below the
+    # low-water mark. Kept in SQLite so every worker process shares them;
+    # served questions are remembered for the TTL to avoid repeats.
+    question_pool_path: str = "questions.sqlite3"
+    question_pool_low_water: int = 5
+    question_pool_target: int = 20
+    question_pool_workers: int = 2
+    question_pool_seen_ttl_seconds: int = 7 * 24 * 3600
+    # Roles are free text, so bound what they can cost: a pool is only
+    # refilled in the background once it has had this many requests, at
+    # most question_pool_max_pools pools are kept (least recently used
+    # dropped) and at most question_pool_max_queued refills wait
+    question_pool_refill_after: int = 2
+    question_pool_max_pools: int = 200
+    question_pool_max_queued: int = 50
+    # Answers per interview feedback request (evaluated four per model call)
+    feedback_max_answers: int = 20
+
+    # Job descriptions that differ only in formatting, job-board boilerplate
+    # ("Apply now", links) or a few words (word 3-gram Jaccard similarity at
+    # least jd_near_duplicate_similarity) are treated as one posting: prompts
+    # use its first-seen text, so cached results are shared, and
+    # GET /job-descriptions/popular counts them together
+    jd_dedup_enabled: bool = True
+    jd_near_duplicate_similarity: float = 0.95
+    jd_index_max_items: int = 5000
+
+    # Resume/job matching index, saved here on shutdown ("" keeps it in memory)
+    matching_index_dir: str = "matching_index"
+
+    # Load the inference client, tokenizer, PDF workers and matching index in
+    # the background at startup instead of on the first request that needs them
+    startup_warmup: bool = True
 
     class Config:
         env_file = ".env"
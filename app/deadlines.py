@@ -0,0 +1,200 @@
+import asyncio
+import dataclasses
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional, Tuple
+
+from fastapi import Query
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+from .metrics import CLIENT_DISCONNECTS, DEADLINE_REJECTIONS
+from .resilience import UpstreamTimeout
+from .task_profiles import TaskProfile
+
+logger = logging.getLogger(__name__)
+
+# Seconds the client is prepared to wait for the whole response
+DEADLINE_HEADER = "x-request-timeout"
+
+# time.monotonic() by which the current request must be answered; None
+# when the client gave no deadline (and inside jobs, which outlive it)
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(UpstreamTimeout):
+    """The client's deadline leaves too little time for the work.
+
+    Not retryable, and not held against the model's circuit breaker: the
+    upstream did nothing wrong.
+    """
+
+
+def remaining() -> Optional[float]:
+    """Seconds left until the request deadline, or None without one."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def clear_deadline() -> None:
+    _deadline.set(None)
+
+
+def deadline_exceeded(
+    stage: str, message: str = "The request deadline leaves too little time to finish."
+) -> DeadlineExceeded:
+    """Count, and build the error for, a deadline that ran out in ``stage``."""
+    DEADLINE_REJECTIONS.labels(stage).inc()
+    return DeadlineExceeded(message)
+
+
+def timeout_for(limit: float, stage: str = "llm") -> Tuple[float, bool]:
+    """The timeout for one step: ``limit``, or less if the deadline is sooner.
+
+    Returns ``(timeout, deadline_limited)``; when ``deadline_limited`` is
+    true a timeout means the client's deadline passed, not that the step
+    hung. Raises DeadlineExceeded once no time is left.
+    """
+    left = remaining()
+    if left is None or left >= limit:
+        return limit, False
+    if left <= 0:
+        raise deadline_exceeded(stage)
+    return left, True
+
+
+def min_generation_seconds() -> float:
+    """The shortest deadline that fits a first token and `llm_min_new_tokens`."""
+    decode_seconds = settings.llm_min_new_tokens / settings.llm_tokens_per_second
+    return settings.llm_first_token_seconds + decode_seconds
+
+
+def cap_profile(profile: TaskProfile) -> TaskProfile:
+    """``profile`` with max_new_tokens cut to what the deadline leaves time for.
+
+    Generating tokens the client will never see only keeps the model busy.
+    Raises DeadlineExceeded when fewer than `llm_min_new_tokens` fit.
+    """
+    left = remaining()
+    if left is None:
+        return profile
+    tokens = int((left - settings.llm_first_token_seconds) * settings.llm_tokens_per_second)
+    if tokens >= profile.max_new_tokens:
+        return profile
+    if tokens < settings.llm_min_new_tokens:
+        raise deadline_exceeded("llm")
+    return dataclasses.replace(profile, max_new_tokens=tokens)
+
+
+async def require_generation_time(
+    run_async: bool = Query(False, alias="async", include_in_schema=False),
+) -> None:
+    """Route dependency: 504 before any extraction when no model call fits the deadline.
+
+    Queued jobs are exempt; they run after the request has been answered.
+    """
+    left = remaining()
+    if not run_async and left is not None and left < min_generation_seconds():
+        raise deadline_exceeded("admission")
+
+
+def _deadline_seconds(scope: Scope) -> Optional[float]:
+    for name, value in scope["headers"]:
+        if name == DEADLINE_HEADER.encode():
+            seconds = float(value.decode("latin-1"))
+            if not seconds > 0:
+                raise ValueError(seconds)
+            return seconds
+    return None
+
+
+class DeadlineMiddleware:
+    """Set the request deadline and cancel the work if the client hangs up.
+
+    The X-Request-Timeout header, in seconds, sets the deadline read by
+    `remaining`. Once the request body has been read, the connection is
+    watched: a disconnect before the response is complete cancels the
+    handler, and with it any in-flight model call or PDF extraction.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            seconds = _deadline_seconds(scope)
+        except ValueError:
+            response = PlainTextResponse(
+                "X-Request-Timeout must be a positive number of seconds.", status_code=400
+            )
+            await response(scope, receive, send)
+            return
+
+        token = _deadline.set(None if seconds is None else time.monotonic() + seconds)
+        try:
+            await self._run_until_disconnect(scope, receive, send)
+        finally:
+            _deadline.reset(token)
+
+    async def _run_until_disconnect(self, scope: Scope, receive: Receive, send: Send) -> None:
+        body_read = False
+        response_complete = False
+        client_gone = False
+        after_body: asyncio.Queue = asyncio.Queue()
+        watcher: Optional[asyncio.Task] = None
+
+        async def watch() -> None:
+            nonlocal client_gone
+            while True:
+                message = await receive()
+                after_body.put_nowait(message)
+                if message["type"] == "http.disconnect":
+                    if not response_complete:
+                        client_gone = True
+                        handler.cancel()
+                    return
+
+        async def receive_and_watch() -> Message:
+            nonlocal body_read, watcher
+            if body_read:
+                message = await after_body.get()
+                if message["type"] == "http.disconnect":
+                    # Every later receive() sees the disconnect too
+                    after_body.put_nowait(message)
+                return message
+
+            message = await receive()
+            if message["type"] != "http.request" or not message.get("more_body", False):
+                body_read = True
+                if message["type"] == "http.disconnect":
+                    after_body.put_nowait(message)
+                else:
+                    watcher = asyncio.create_task(watch())
+            return message
+
+        async def send_and_track(message: Message) -> None:
+            nonlocal response_complete
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+
+        handler = asyncio.ensure_future(self.app(scope, receive_and_watch, send_and_track))
+        try:
+            await handler
+        except asyncio.CancelledError:
+            if not client_gone:
+                raise
+            CLIENT_DISCONNECTS.inc()
+            scope.setdefault("state", {})["client_disconnected"] = True
+            logger.info("Client disconnected; cancelled %s %s", scope["method"], scope["path"])
+        finally:
+            if watcher is not None:
+                watcher.cancel()
@@ -0,0 +1,154 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, UploadFile
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+from .metrics import stage
+
+CHUNK_SIZE = 64 * 1024
+# The PDF spec allows junk before the header as long as it starts in the first 1 KiB
+PDF_MAGIC = b"%PDF-"
+SNIFF_BYTES = 1024
+
+
+@dataclass
+class IngestedUpload:
+    data: bytes
+    sha256: str
+    content_type: str  # detected from the content, not the client header
+
+
+def sniff_content_type(data: bytes) -> Optional[str]:
+    """Return "application/pdf" or "text/plain" based on the bytes, else None."""
+    if PDF_MAGIC in data[:SNIFF_BYTES]:
+        return "application/pdf"
+
+    if b"\x00" in data[:SNIFF_BYTES]:
+        return None
+    try:
+        data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    return "text/plain"
+
+
+async def ingest_upload(upload: UploadFile, max_bytes: Optional[int] = None) -> IngestedUpload:
+    """Read an upload in chunks, hashing it and enforcing the size limit as we go."""
+    max_bytes = settings.max_upload_bytes if max_bytes is None else max_bytes
+    with stage("upload"):
+        return await _read_upload(upload, max_bytes)
+
+
+async def _read_upload(upload: UploadFile, max_bytes: int) -> IngestedUpload:
+    digest = hashlib.sha256()
+    chunks = []
+    size = 0
+    while True:
+        chunk = await upload.read(CHUNK_SIZE)
+        if not chunk:
+            break
+
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Resume file is too large. The limit is {max_bytes // 1024} KB.",
+            )
+        digest.update(chunk)
+        chunks.append(chunk)
+
+    if size == 0:
+        raise HTTPException(status_code=400, detail="The uploaded file is empty.")
+
+    data = b"".join(chunks)
+    content_type = sniff_content_type(data)
+    if content_type is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Unsupported file type. Please upload a PDF or plain text resume.",
+        )
+
+    return IngestedUpload(data=data, sha256=digest.hexdigest(), content_type=content_type)
+
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized request bodies with 413 before they are fully read.
+
+    Multipart bodies may hold an upload of ``max_bytes`` plus
+    ``max_request_bytes`` of boundaries and other fields; any other body
+    (JSON, url-encoded forms) only ``max_request_bytes``.
+    A Content-Length over the limit is refused without reading anything.
+    Bodies without one (chunked uploads) are counted as they arrive, and
+    refused as soon as the count passes the limit; the app then sees a
+    disconnect, and whatever it sends afterwards is dropped.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_bytes: Optional[int] = None,
+        max_request_bytes: Optional[int] = None,
+    ):
+        self.app = app
+        self.max_bytes = settings.max_upload_bytes if max_bytes is None else max_bytes
+        self.max_request_bytes = (
+            settings.max_request_bytes if max_request_bytes is None else max_request_bytes
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT"):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_type = headers.get(b"content-type", b"").split(b";")[0].strip().lower()
+        limit = self.max_request_bytes
+        if content_type == b"multipart/form-data":
+            limit += self.max_bytes
+
+        content_length = headers.get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > limit:
+            await self._reject(scope, receive, send)
+            return
+
+        body_bytes = 0
+        response_started = False
+        rejected = False
+
+        async def receive_counted() -> Message:
+            nonlocal body_bytes, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                body_bytes += len(message.get("body", b""))
+                if body_bytes > limit:
+                    rejected = True
+                    if not response_started:
+                        await self._reject(scope, receive, send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def send_unless_rejected(message: Message) -> None:
+            nonlocal response_started
+            if rejected:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_counted, send_unless_rejected)
+        except Exception:
+            # The app failing on the disconnect we handed it; already answered
+            if not rejected:
+                raise
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send) -> None:
+        response = PlainTextResponse("Request body too large.", status_code=413)
+        await response(scope, receive, send)
@@ -0,0 +1,203 @@
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+from .config import settings
+from .metrics import JD_LOOKUPS
+
+# List markers pasted from job boards and word processors
+_BULLET = re.compile(r"^[\-\*•‣⁃∙▪▫●◦■□►▶✓✔➢·–—>]+\s*")
+_URL = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+# Soft hyphens, zero-width characters and byte-order marks
+_INVISIBLE = re.compile("[\u00ad\u200b\u200c\u200d\u2060\ufeff]")
+# Job-board chrome around the posting itself
+_BOILERPLATE_LINE = re.compile(
+    r"^(?:apply (?:now|today|here|for this job)|easy apply|click (?:here )?to apply"
+    r"|(?:save|share|report) (?:this )?(?:job|posting)|show (?:more|less)|see more"
+    r"|posted (?:\d+|a|an) (?:minute|hour|day|week|month)s? ago|\d+\+? applicants?"
+    r"|promoted|actively recruiting|be an early applicant)\b[\s.!:]*$",
+    re.IGNORECASE,
+)
+_WORD = re.compile(r"\w+")
+
+
+def normalize_job_description(text: str) -> str:
+    """The posting without formatting noise: the text that goes into prompts.
+
+    Unicode compatibility forms are folded, bullet glyphs become "- ",
+    links, blank lines and job-board lines such as "Apply now" are
+    dropped, and whitespace is collapsed. Case and wording are kept.
+    """
+    text = _INVISIBLE.sub("", unicodedata.normalize("NFKC", text))
+    lines = []
+    for line in text.splitlines():
+        line = " ".join(_URL.sub(" ", line).split())
+        if not line or _BOILERPLATE_LINE.match(line):
+            continue
+        bullet = _BULLET.match(line)
+        if bullet and bullet.end() < len(line):
+            line = "- " + line[bullet.end() :]
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _words(normalized: str) -> List[str]:
+    return _WORD.findall(normalized.casefold())
+
+
+# MinHash: NUM_PERM hash functions (a * h + b) mod a Mersenne prime, with
+# fixed seeds so every process computes the same signature. a < 2**29 keeps
+# a * h + b for 32-bit h below 2**62, with no uint64 overflow.
+NUM_PERM = 64
+LSH_BANDS = 8
+_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.default_rng(20240611)
+_A = _rng.integers(1, 1 << 29, NUM_PERM, dtype=np.uint64)[:, None]
+_B = _rng.integers(0, (1 << 61) - 1, NUM_PERM, dtype=np.uint64)[:, None]
+
+
+def shingle_hashes(words: List[str], size: int = 3) -> np.ndarray:
+    """Sorted, unique 32-bit hashes of the word ``size``-grams."""
+    if len(words) < size:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [" ".join(words[i : i + size]) for i in range(len(words) - size + 1)]
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "big")
+        for s in shingles
+    ]
+    return np.unique(np.array(hashes, dtype=np.uint64))
+
+
+def minhash(shingles: np.ndarray) -> np.ndarray:
+    """NUM_PERM-value signature; equal values estimate the Jaccard similarity."""
+    return ((_A * shingles[None, :] + _B) % _PRIME).min(axis=1)
+
+
+def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    shared = len(np.intersect1d(a, b, assume_unique=True))
+    return shared / (len(a) + len(b) - shared)
+
+
+@dataclass
+class JobPosting:
+    id: str                   # fingerprint of the first variant seen
+    text: str                 # normalized text of that variant, used in prompts
+    shingles: np.ndarray = field(repr=False)
+    band_keys: List[bytes] = field(repr=False)
+    job_title: str = ""
+    requests: int = 0
+    variant_keys: Set[str] = field(default_factory=set)
+
+
+class JobDescriptionIndex:
+    """Groups job descriptions that are the same posting.
+
+    Variants that normalize to the same words are found by exact key.
+    Otherwise MinHash LSH (`LSH_BANDS` bands of the signature) proposes
+    postings likely to be similar, and the one whose word-shingle Jaccard
+    similarity is highest, and at least ``min_similarity``, is taken. The
+    least recently used postings are evicted beyond ``max_items``.
+    """
+
+    def __init__(self, max_items: int, min_similarity: float):
+        self.max_items = max_items
+        self.min_similarity = min_similarity
+        self._postings: "OrderedDict[str, JobPosting]" = OrderedDict()
+        self._variants: Dict[str, str] = {}
+        self._bands: List[Dict[bytes, Set[str]]] = [{} for _ in range(LSH_BANDS)]
+        self._lock = threading.Lock()
+        self.lookups = {"new": 0, "exact": 0, "near": 0}
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    @staticmethod
+    def _band_keys(signature: np.ndarray) -> List[bytes]:
+        return [band.tobytes() for band in np.split(signature, LSH_BANDS)]
+
+    def _near(self, shingles: np.ndarray, band_keys: List[bytes]) -> Optional[JobPosting]:
+        candidates: Set[str] = set()
+        for band, key in zip(self._bands, band_keys):
+            candidates.update(band.get(key, ()))
+
+        best: Optional[JobPosting] = None
+        best_similarity = self.min_similarity
+        for posting_id in candidates:
+            posting = self._postings[posting_id]
+            similarity = jaccard(shingles, posting.shingles)
+            if similarity >= best_similarity:
+                best, best_similarity = posting, similarity
+        return best
+
+    def resolve(self, job_description: str) -> JobPosting:
+        """The posting this job description is a variant of, added if new."""
+        normalized = normalize_job_description(job_description)
+        words = _words(normalized)
+        key = hashlib.sha256(" ".join(words).encode("utf-8")).hexdigest()
+
+        with self._lock:
+            posting_id = self._variants.get(key)
+            if posting_id is not None:
+                result = "exact"
+                posting = self._postings[posting_id]
+            else:
+                shingles = shingle_hashes(words)
+                band_keys = self._band_keys(minhash(shingles))
+                posting = self._near(shingles, band_keys)
+                if posting is not None:
+                    result = "near"
+                else:
+                    result = "new"
+                    posting = JobPosting(
+                        id=key[:16], text=normalized, shingles=shingles, band_keys=band_keys
+                    )
+                    self._add(posting)
+                posting.variant_keys.add(key)
+                self._variants[key] = posting.id
+
+            self._postings.move_to_end(posting.id)
+            self.lookups[result] += 1
+        JD_LOOKUPS.labels(result).inc()
+        return posting
+
+    def _add(self, posting: JobPosting) -> None:
+        self._postings[posting.id] = posting
+        for band, key in zip(self._bands, posting.band_keys):
+            band.setdefault(key, set()).add(posting.id)
+
+        while len(self._postings) > self.max_items:
+            _, evicted = self._postings.popitem(last=False)
+            for key in evicted.variant_keys:
+                self._variants.pop(key, None)
+            for band, key in zip(self._bands, evicted.band_keys):
+                band[key].discard(evicted.id)
+                if not band[key]:
+                    del band[key]
+
+    def record(self, posting: JobPosting, job_title: str = "") -> None:
+        """Count one request for ``posting``, for `popular`."""
+        with self._lock:
+            posting.requests += 1
+            if job_title and not posting.job_title:
+                posting.job_title = job_title
+
+    def popular(self, limit: int) -> List[JobPosting]:
+        with self._lock:
+            postings = [posting for posting in self._postings.values() if posting.requests]
+        return sorted(postings, key=lambda posting: posting.requests, reverse=True)[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"postings": len(self._postings), "variants": len(self._variants), **self.lookups}
+
+
+jd_index = JobDescriptionIndex(
+    max_items=settings.jd_index_max_items,
+    min_similarity=settings.jd_near_duplicate_similarity,
+)
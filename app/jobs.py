@@ -0,0 +1,257 @@
+import asyncio
+import contextvars
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from .admission import AdmissionRejected
+from .config import settings
+from .deadlines import clear_deadline
+from .pdf_extraction import PdfExtractionError, PdfExtractionTimeout, PdfWorkersUnavailable
+from .resilience import UpstreamError
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+JobWork = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str
+    created_at: float
+    updated_at: float
+    result: Any = None
+    error: Optional[str] = None
+    status_code: Optional[int] = None  # HTTP status the synchronous call would have returned
+
+
+class JobStore:
+    """Job status and results in SQLite, kept for `job_ttl_seconds`.
+
+    The file is shared by every worker process on the host, so a job can be
+    polled through any of them. The connection is opened on first use.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, "
+                "result TEXT, error TEXT, status_code INTEGER, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at)")
+        return self._db
+
+    def create(self, kind: str) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._conn.execute(
+            "INSERT INTO jobs (id, kind, status, created_at, updated_at, expires_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, kind, QUEUED, now, now, now + self.ttl_seconds),
+        )
+        self._conn.execute("DELETE FROM jobs WHERE expires_at <= ?", (now,))
+        return job_id
+
+    def update(
+        self,
+        job_id: str,
+        status: str,
+        result: Any = None,
+        error: Optional[str] = None,
+        status_code: Optional[int] = None,
+    ) -> None:
+        now = time.time()
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, status_code = ?, "
+            "updated_at = ?, expires_at = ? WHERE id = ?",
+            (
+                status,
+                None if result is None else json.dumps(result),
+                error,
+                status_code,
+                now,
+                now + self.ttl_seconds,
+                job_id,
+            ),
+        )
+
+    def get(self, job_id: str) -> Optional[Job]:
+        row = self._conn.execute(
+            "SELECT id, kind, status, result, error, status_code, created_at, updated_at "
+            "FROM jobs WHERE id = ? AND expires_at > ?",
+            (job_id, time.time()),
+        ).fetchone()
+        if row is None:
+            return None
+        return Job(
+            id=row[0],
+            kind=row[1],
+            status=row[2],
+            result=None if row[3] is None else json.loads(row[3]),
+            error=row[4],
+            status_code=row[5],
+            created_at=row[6],
+            updated_at=row[7],
+        )
+
+
+def _describe_failure(exc: Exception) -> Tuple[int, str]:
+    """The status code and message the synchronous endpoint would have returned."""
+    if isinstance(exc, HTTPException):
+        return exc.status_code, str(exc.detail)
+    if isinstance(exc, UpstreamError):
+        return exc.status_code, str(exc)
+    if isinstance(exc, AdmissionRejected):
+        return 429, str(exc)
+    if isinstance(exc, PdfExtractionTimeout):
+        return 504, str(exc)
+    if isinstance(exc, PdfExtractionError):
+        return 422, str(exc)
+    if isinstance(exc, PdfWorkersUnavailable):
+        return 503, str(exc)
+    return 500, "The job failed unexpectedly."
+
+
+class JobQueue:
+    """Bounded in-process queue drained by a fixed pool of worker tasks.
+
+    Work is run in a copy of the submitting request's context, so per-request
+    settings such as the LLM cache opt-out still apply.
+    """
+
+    def __init__(self, store: JobStore, workers: int, max_queued: int):
+        self.store = store
+        self.workers = workers
+        self.max_queued = max_queued
+        self.completed = 0
+        self.failed = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self._updates: Dict[str, asyncio.Event] = {}
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Jobs still waiting would otherwise stay queued forever in the store
+        while self._queue is not None and not self._queue.empty():
+            job_id, _, _ = self._queue.get_nowait()
+            self.store.update(
+                job_id,
+                FAILED,
+                error="The server shut down before the job finished.",
+                status_code=503,
+            )
+            self._notify(job_id)
+        self._queue = None
+        self._loop = None
+
+    def submit(self, kind: str, work: JobWork) -> str:
+        if self._loop is not asyncio.get_running_loop():
+            # Not started by the app lifespan (or started on another loop)
+            self.start()
+        if self._queue.full():
+            raise AdmissionRejected("Too many queued jobs. Please try again shortly.", retry_after=5)
+
+        job_id = self.store.create(kind)
+        context = contextvars.copy_context()
+        # The job outlives the request, so the client's deadline does not apply
+        context.run(clear_deadline)
+        self._queue.put_nowait((job_id, work, context))
+        return job_id
+
+    async def wait_for_update(self, job_id: str, timeout: float) -> None:
+        """Return when this process updates the job, or after ``timeout``.
+
+        Jobs run by another worker process are only seen by polling, which
+        is why callers re-read the store after every wake-up.
+        """
+        event = self._updates.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._updates.pop(job_id, None)
+
+    def _notify(self, job_id: str) -> None:
+        event = self._updates.get(job_id)
+        if event is not None:
+            event.set()
+
+    async def _worker(self) -> None:
+        while True:
+            job_id, work, context = await self._queue.get()
+            try:
+                await self._run(job_id, work, context)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str, work: JobWork, context: contextvars.Context) -> None:
+        self.store.update(job_id, RUNNING)
+        self._notify(job_id)
+        try:
+            result = await asyncio.create_task(work(), context=context)
+        except asyncio.CancelledError:
+            self.store.update(
+                job_id,
+                FAILED,
+                error="The server shut down before the job finished.",
+                status_code=503,
+            )
+            raise
+        except Exception as e:
+            status_code, message = _describe_failure(e)
+            if status_code >= 500:
+                logger.exception("Job %s failed", job_id)
+            self.store.update(job_id, FAILED, error=message, status_code=status_code)
+            self.failed += 1
+        else:
+            self.store.update(job_id, SUCCEEDED, result=result, status_code=200)
+            self.completed += 1
+        finally:
+            self._notify(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+job_store = JobStore(settings.job_store_path, settings.job_ttl_seconds)
+
+job_queue = JobQueue(job_store, workers=settings.job_workers, max_queued=settings.job_queue_max)
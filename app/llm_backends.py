@@ -0,0 +1,510 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from .config import settings
+from .metrics import LLM_FALLBACKS, llm_call
+from .task_profiles import TaskProfile
+
+logger = logging.getLogger(__name__)
+
+
+class LLMBackend:
+    """Where `HuggingFaceClient` sends prompts; one subclass per kind of server.
+
+    ``generate`` returns the whole text. ``stream`` returns once the server
+    has accepted the request, so failures before the first token can be
+    retried like any other call, and the iterator it returns closes the
+    upstream response when closed early. Errors are raised as they come
+    and classified by `as_upstream_error`.
+    """
+
+    name = "base"
+
+    def missing_configuration(self) -> Optional[str]:
+        """Why the backend cannot be used, or None."""
+        return None
+
+    def load(self) -> None:
+        """Blocking setup for the startup warm-up (runs in a thread)."""
+
+    async def start(self) -> None:
+        """Background work tied to the app lifespan, e.g. health checks."""
+
+    async def aclose(self) -> None:
+        pass
+
+    async def generate(self, prompt: str, model: str, profile: TaskProfile) -> str:
+        raise NotImplementedError
+
+    async def stream(self, prompt: str, model: str, profile: TaskProfile) -> AsyncIterator[str]:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+
+def _stop_kwargs(profile: TaskProfile) -> Dict[str, Any]:
+    # Only sent when set, as not every deployment accepts stop sequences
+    return {"stop": list(profile.stop)} if profile.stop else {}
+
+
+async def _aclose(stream: Any) -> None:
+    """Close an upstream stream early so its HTTP response is released."""
+    aclose = getattr(stream, "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
+async def _aiter_text(tokens: AsyncIterator[str]) -> AsyncIterator[str]:
+    try:
+        async for token in tokens:
+            yield token
+    finally:
+        await _aclose(tokens)
+
+
+async def _aiter_chat_deltas(chunks: AsyncIterator[Any]) -> AsyncIterator[str]:
+    try:
+        async for chunk in chunks:
+            choices = chunk.get("choices") or []
+            if choices:
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    yield content
+    finally:
+        await _aclose(chunks)
+
+
+# ---------------------------------------------------------------------------
+# Hugging Face Inference API
+# ---------------------------------------------------------------------------
+
+
+class LazyInferenceClient:
+    """The shared AsyncInferenceClient, built on first use.
+
+    Importing huggingface_hub takes longer than importing the rest of the
+    app, so it happens in the startup warm-up (or on the first model call)
+    rather than at import time. Attribute access is forwarded to the client.
+    """
+
+    def __init__(self):
+        self._client: Any = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._client is not None
+
+    def get(self) -> Any:
+        if self._client is None:
+            from huggingface_hub import AsyncInferenceClient
+
+            self._client = AsyncInferenceClient(token=settings.hf_api_key)
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+
+# Global Hugging Face text client – token only, model passed per call.
+# The async client keeps a pooled HTTP session, so many generations can be
+# in flight on a single event loop without blocking each other.
+hf_text_client = LazyInferenceClient()
+
+
+def _model_target(model: str) -> str:
+    """What to pass as ``model`` to the client: the id, or its URL on a custom endpoint."""
+    if settings.hf_inference_base_url:
+        return f"{settings.hf_inference_base_url.rstrip('/')}/models/{model}"
+    return model
+
+
+def _is_conversational_only(e: ValueError) -> bool:
+    msg = str(e)
+    logger.warning("text_generation not supported for this model: %s", msg)
+    return "conversational" in msg.lower()
+
+
+class HuggingFaceBackend(LLMBackend):
+    """The hosted HF Inference API (or a TGI gateway at `hf_inference_base_url`).
+
+    text_generation is tried first, chat_completion for models that only
+    support the conversational task.
+    """
+
+    name = "huggingface"
+
+    def missing_configuration(self) -> Optional[str]:
+        return None if settings.hf_api_key else "Hugging Face API key not configured."
+
+    def load(self) -> None:
+        hf_text_client.get()
+
+    async def generate(self, prompt: str, model: str, profile: TaskProfile) -> str:
+        try:
+            with llm_call(model, "text_generation"):
+                text = await hf_text_client.text_generation(
+                    prompt,
+                    model=_model_target(model),
+                    max_new_tokens=profile.max_new_tokens,
+                    **_stop_kwargs(profile),
+                )
+            logger.info("HF text_generation returned %d characters", len(text))
+            return text
+
+        except ValueError as e:
+            if not _is_conversational_only(e):
+                raise
+
+        # Conversational-style call (chat completion)
+        LLM_FALLBACKS.labels("chat_completion").inc()
+        with llm_call(model, "chat_completion"):
+            resp = await hf_text_client.chat_completion(
+                model=_model_target(model),
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=profile.max_new_tokens,
+                **_stop_kwargs(profile),
+            )
+        if isinstance(resp, dict):
+            choices = resp.get("choices", [])
+            if choices:
+                content = choices[0].get("message", {}).get("content")
+                if content:
+                    logger.info(
+                        "HF chat_completion returned %d characters",
+                        len(content),
+                    )
+                    return content
+
+        logger.warning("Unexpected chat_completion response format: %s", resp)
+        return str(resp)
+
+    async def stream(self, prompt: str, model: str, profile: TaskProfile) -> AsyncIterator[str]:
+        try:
+            with llm_call(model, "text_generation"):
+                tokens = await hf_text_client.text_generation(
+                    prompt,
+                    model=_model_target(model),
+                    max_new_tokens=profile.max_new_tokens,
+                    stream=True,
+                    **_stop_kwargs(profile),
+                )
+            return _aiter_text(tokens)
+        except ValueError as e:
+            if not _is_conversational_only(e):
+                raise
+
+        # Conversational-style call (chat completion)
+        LLM_FALLBACKS.labels("chat_completion").inc()
+        with llm_call(model, "chat_completion"):
+            chunks = await hf_text_client.chat_completion(
+                model=_model_target(model),
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=profile.max_new_tokens,
+                stream=True,
+                **_stop_kwargs(profile),
+            )
+        return _aiter_chat_deltas(chunks)
+
+
+# ---------------------------------------------------------------------------
+# OpenAI-compatible servers (vLLM, TGI, llama.cpp server, ...)
+# ---------------------------------------------------------------------------
+
+
+class Endpoint:
+    """One inference server base URL and what we know about its health."""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.healthy = True
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        # When an endpoint marked unhealthy by a failed request gets a
+        # request again even without a passing health check
+        self.retry_at = 0.0
+
+    def available(self, now: float) -> bool:
+        return self.healthy or now >= self.retry_at
+
+    def mark_down(self, retry_after: float) -> None:
+        self.healthy = False
+        self.retry_at = time.monotonic() + retry_after
+
+    def mark_up(self) -> None:
+        self.healthy = True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+def _marks_endpoint_down(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.TransportError):
+        return True
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    # 429 and 503 mean busy, not broken; the retry logic backs off instead
+    return isinstance(status, int) and status >= 500 and status != 503
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """`/v1/completions` or `/v1/chat/completions` on one or more servers.
+
+    Requests share one pooled httpx client with keep-alive connections, and
+    go to the available endpoint with the fewest requests in flight. An
+    endpoint is taken out of rotation when a request to it fails at the
+    transport level or with a 5xx, and put back when a background health
+    check (``GET /health``) passes, or after ``health_check_seconds`` if no
+    health checks are running.
+    """
+
+    name = "openai"
+
+    def __init__(
+        self,
+        base_urls: List[str],
+        api: str = "completions",
+        api_key: str = "",
+        max_connections: int = 100,
+        max_keepalive_connections: int = 50,
+        keepalive_expiry: float = 60.0,
+        connect_timeout: float = 5.0,
+        health_check_seconds: float = 10.0,
+    ):
+        if api not in ("completions", "chat"):
+            raise ValueError(f"Unknown OpenAI-compatible API {api!r}; use 'completions' or 'chat'")
+        self.endpoints = [Endpoint(url) for url in base_urls]
+        self.api = api
+        self.api_key = api_key
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.connect_timeout = connect_timeout
+        self.health_check_seconds = health_check_seconds
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self._turn = 0
+
+    def missing_configuration(self) -> Optional[str]:
+        return None if self.endpoints else "No inference server URLs configured (LLM_BASE_URLS)."
+
+    @property
+    def path(self) -> str:
+        return "/v1/completions" if self.api == "completions" else "/v1/chat/completions"
+
+    def _http(self) -> httpx.AsyncClient:
+        # Pooled connections belong to the loop that opened them
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._client = httpx.AsyncClient(
+                limits=self.limits,
+                # The overall deadline is llm_timeout_seconds, applied by the caller
+                timeout=httpx.Timeout(None, connect=self.connect_timeout),
+                headers=headers,
+            )
+            self._client_loop = loop
+        return self._client
+
+    def _pick(self) -> Endpoint:
+        now = time.monotonic()
+        candidates = [e for e in self.endpoints if e.available(now)] or self.endpoints
+        # Fewest in flight; rotating the starting point spreads ties
+        self._turn += 1
+        n = len(candidates)
+        rotated = [candidates[(self._turn + i) % n] for i in range(n)]
+        return min(rotated, key=lambda e: e.in_flight)
+
+    def _body(self, prompt: str, model: str, profile: TaskProfile, stream: bool) -> Dict[str, Any]:
+        body: Dict[str, Any] = {
+            "model": model,
+            "max_tokens": profile.max_new_tokens,
+            "stream": stream,
+            **_stop_kwargs(profile),
+        }
+        if self.api == "completions":
+            body["prompt"] = prompt
+        else:
+            body["messages"] = [{"role": "user", "content": prompt}]
+        return body
+
+    def _text(self, payload: Dict[str, Any], streaming: bool) -> str:
+        choices = payload.get("choices") or []
+        if not choices:
+            return ""
+        choice = choices[0]
+        if self.api == "completions":
+            return choice.get("text") or ""
+        message = choice.get("delta" if streaming else "message") or {}
+        return message.get("content") or ""
+
+    def _failed(self, endpoint: Endpoint, exc: BaseException) -> None:
+        endpoint.failures += 1
+        if _marks_endpoint_down(exc):
+            logger.warning("Inference server %s is unhealthy: %r", endpoint.url, exc)
+            endpoint.mark_down(self.health_check_seconds)
+
+    async def generate(self, prompt: str, model: str, profile: TaskProfile) -> str:
+        endpoint = self._pick()
+        endpoint.requests += 1
+        endpoint.in_flight += 1
+        try:
+            with llm_call(model, self.api):
+                resp = await self._http().post(
+                    endpoint.url + self.path, json=self._body(prompt, model, profile, stream=False)
+                )
+                resp.raise_for_status()
+        except Exception as e:
+            self._failed(endpoint, e)
+            raise
+        finally:
+            endpoint.in_flight -= 1
+
+        text = self._text(resp.json(), streaming=False)
+        logger.info("%s returned %d characters", self.path, len(text))
+        return text
+
+    async def stream(self, prompt: str, model: str, profile: TaskProfile) -> AsyncIterator[str]:
+        endpoint = self._pick()
+        endpoint.requests += 1
+        endpoint.in_flight += 1
+        client = self._http()
+        resp: Optional[httpx.Response] = None
+        try:
+            with llm_call(model, self.api):
+                request = client.build_request(
+                    "POST", endpoint.url + self.path, json=self._body(prompt, model, profile, stream=True)
+                )
+                resp = await client.send(request, stream=True)
+                if resp.is_error:
+                    await resp.aread()
+                    resp.raise_for_status()
+        except Exception as e:
+            endpoint.in_flight -= 1
+            self._failed(endpoint, e)
+            if resp is not None:
+                await resp.aclose()
+            raise
+        return _EventStream(self, endpoint, resp)
+
+    async def check_health(self) -> None:
+        """Probe every endpoint once; this also opens keep-alive connections."""
+
+        async def probe(endpoint: Endpoint) -> None:
+            try:
+                resp = await self._http().get(endpoint.url + "/health", timeout=self.connect_timeout)
+                ok = resp.status_code < 300
+            except httpx.HTTPError:
+                ok = False
+            if ok and not endpoint.healthy:
+                logger.info("Inference server %s is healthy again", endpoint.url)
+            if ok:
+                endpoint.mark_up()
+            else:
+                endpoint.mark_down(self.health_check_seconds)
+
+        await asyncio.gather(*(probe(endpoint) for endpoint in self.endpoints))
+
+    async def _health_loop(self) -> None:
+        while True:
+            await self.check_health()
+            await asyncio.sleep(self.health_check_seconds)
+
+    async def start(self) -> None:
+        if self._health_task is None and self.endpoints:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def aclose(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+        if self._client is not None and self._client_loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "api": self.api,
+            "endpoints": [endpoint.stats() for endpoint in self.endpoints],
+        }
+
+
+class _EventStream:
+    """Text pieces from a streamed (SSE) response.
+
+    Unlike an async generator, ``aclose()`` releases the connection and the
+    endpoint's in-flight count even if iteration never started.
+    """
+
+    def __init__(self, backend: OpenAICompatibleBackend, endpoint: Endpoint, resp: httpx.Response):
+        self._backend = backend
+        self._endpoint = endpoint
+        self._resp = resp
+        self._lines = resp.aiter_lines()
+        self._closed = False
+
+    def __aiter__(self) -> "_EventStream":
+        return self
+
+    async def __anext__(self) -> str:
+        while not self._closed:
+            try:
+                line = await self._lines.__anext__()
+            except StopAsyncIteration:
+                break
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:") :].strip()
+            if data == "[DONE]":
+                break
+            text = self._backend._text(json.loads(data), streaming=True)
+            if text:
+                return text
+
+        await self.aclose()
+        raise StopAsyncIteration
+
+    async def aclose(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._endpoint.in_flight -= 1
+        await self._resp.aclose()
+
+
+def create_backend() -> LLMBackend:
+    """The backend selected by `llm_backend` in Settings."""
+    if settings.llm_backend == "huggingface":
+        return HuggingFaceBackend()
+    if settings.llm_backend == "openai":
+        return OpenAICompatibleBackend(
+            settings.llm_base_urls,
+            api=settings.llm_api,
+            api_key=settings.llm_api_key,
+            max_connections=settings.llm_pool_max_connections,
+            max_keepalive_connections=settings.llm_pool_max_keepalive,
+            keepalive_expiry=settings.llm_pool_keepalive_seconds,
+            connect_timeout=settings.llm_connect_timeout_seconds,
+            health_check_seconds=settings.llm_health_check_seconds,
+        )
+    raise ValueError(f"Unknown LLM_BACKEND {settings.llm_backend!r}; use 'huggingface' or 'openai'")
+
+
+llm_backend = create_backend()
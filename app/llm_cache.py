@@ -0,0 +1,148 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+
+from .config import settings
+from .ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Per-request opt-out, set from the Cache-Control request header
+cache_enabled: ContextVar[bool] = ContextVar("llm_cache_enabled", default=True)
+
+
+def make_cache_key(model: str, prompt: str, params: Dict[str, Any]) -> str:
+    """Hash of everything that determines the model output."""
+    payload = json.dumps(
+        {"model": model, "prompt": prompt, "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Base class for LLM response caches; counts hits and misses."""
+
+    backend = "none"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        if not cache_enabled.get():
+            return None
+
+        value = self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        if cache_enabled.get():
+            self._set(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.backend, "hits": self.hits, "misses": self.misses}
+
+    def _get(self, key: str) -> Optional[str]:
+        return None
+
+    def _set(self, key: str, value: str) -> None:
+        pass
+
+
+class MemoryLLMCache(LLMCache):
+    """Per-process LRU with TTL."""
+
+    backend = "memory"
+
+    def __init__(self, max_items: int, ttl_seconds: float):
+        super().__init__()
+        self._entries: TTLCache[str] = TTLCache(max_items, ttl_seconds)
+
+    def _get(self, key: str) -> Optional[str]:
+        return self._entries.get(key)
+
+    def _set(self, key: str, value: str) -> None:
+        self._entries.put(key, value)
+
+
+class SQLiteLLMCache(LLMCache):
+    """File-backed cache shared by every worker process on the host.
+
+    Lookups are single-row primary-key reads on a WAL database, cheap enough
+    to run on the event loop.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str, max_items: int, ttl_seconds: float):
+        super().__init__()
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_cache_expires_at ON llm_cache (expires_at)"
+        )
+
+    def _get(self, key: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT value FROM llm_cache WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: str) -> None:
+        now = time.time()
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + self.ttl_seconds),
+            )
+            self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+            # Drop the entries closest to expiry once over capacity
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_items,),
+            )
+        except sqlite3.Error:
+            logger.exception("Could not write LLM response to the SQLite cache")
+
+
+def build_llm_cache(backend: str) -> LLMCache:
+    if backend == "memory":
+        return MemoryLLMCache(settings.llm_cache_max_items, settings.llm_cache_ttl_seconds)
+    if backend == "sqlite":
+        return SQLiteLLMCache(
+            settings.llm_cache_path,
+            settings.llm_cache_max_items,
+            settings.llm_cache_ttl_seconds,
+        )
+    if backend == "none":
+        return LLMCache()
+    raise ValueError(f"Unknown LLM cache backend: {backend!r}")
+
+
+async def llm_cache_preference(request: Request) -> None:
+    """Router dependency: `Cache-Control: no-cache` bypasses the LLM cache."""
+    directives = request.headers.get("cache-control", "").lower()
+    cache_enabled.set("no-cache" not in directives and "no-store" not in directives)
+
+
+llm_cache = build_llm_cache(settings.llm_cache_backend)
@@ -1,8 +1,43 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import career
+from .admission import llm_admission, rate_limiter
+from .deadlines import DeadlineMiddleware
+from .ingestion import UploadSizeLimitMiddleware
+from .jd_dedup import jd_index
+from .jobs import job_queue
+from .llm_cache import llm_cache
+from .matching import matching_engine
+from .metrics import CONTENT_TYPE_LATEST, MetricsMiddleware, render_metrics
+from .pdf_extraction import shutdown_pool
+from .question_pool import question_pool
+from .routers import career, interview, jobs, matching
+from .services import llm_backend, llm_in_flight
+from .warmup import readiness, start_warmup
+
+logging.basicConfig(level=logging.INFO)
+
 
-app = FastAPI(title="AI Interview Practice Bot Backend")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    job_queue.start()
+    question_pool.start()
+    # Runs in the background: /health answers while the warm-up is going on
+    warmup = start_warmup()
+    await llm_backend.start()
+    yield
+    if warmup is not None:
+        warmup.cancel()
+    await job_queue.stop()
+    await question_pool.stop()
+    await llm_backend.aclose()
+    shutdown_pool()
+    matching_engine.save()
+
+
+app = FastAPI(title="AI Interview Practice Bot Backend", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -11,11 +46,52 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(UploadSizeLimitMiddleware)
+# Sets the X-Request-Timeout deadline and cancels work for clients that hang up
+app.add_middleware(DeadlineMiddleware)
+# Outermost, so rejected and failed requests are timed too
+app.add_middleware(MetricsMiddleware)
 app.include_router(career.router)   
+app.include_router(jobs.router)
+app.include_router(interview.router)
+app.include_router(matching.router)
+for exc_class, handler in career.exception_handlers.items():
+    app.add_exception_handler(exc_class, handler)
 
 
 @app.get("/health")
 def health_check():
+    """Liveness: the process is up and serving."""
     return {"status": "ok"}
 
+
+@app.get("/ready")
+def ready_check(response: Response):
+    """Readiness: the startup warm-up has finished and the LLM backend is configured."""
+    is_ready, checks = readiness.report()
+    if not is_ready:
+        response.status_code = 503
+    return {"status": "ready" if is_ready else "not_ready", "checks": checks}
+
+
+@app.get("/metrics")
+def metrics():
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/stats")
+def stats():
+    return {
+        "llm_cache": llm_cache.stats(),
+        "llm_in_flight": llm_in_flight.stats(),
+        "llm_backend": llm_backend.stats(),
+        "admission": llm_admission.stats(),
+        "rate_limiter": rate_limiter.stats(),
+        "matching_index": matching_engine.stats(),
+        "job_descriptions": jd_index.stats(),
+        "jobs": job_queue.stats(),
+        "question_pool": question_pool.stats(),
+        "startup": readiness.stats(),
+    }
+
 # A Schneider Electric Software Engineer job description typically involves designing, developing, and maintaining software for energy management, automation, and sustainability solutions, often requiring skills in languages like C# and .NET Core, and experience with SaaS-based platforms, APIs, and building automation systems. Roles can vary from senior-level positions focused on business-critical applications to more application-based roles involving system integration, customization, and customer support. Common responsibilities include collaborating with cross-functional teams, writing clean code, participating in code reviews, troubleshooting issues, and developing APIs. 
@@ -0,0 +1,305 @@
+import json
+import logging
+import os
+import threading
+import zlib
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# scipy is imported where it is used, so the web process does not pay for
+# it at startup
+if TYPE_CHECKING:
+    from scipy import sparse
+
+from .ats import extract_terms
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Terms are hashed into a fixed feature space, so the index never needs a
+# vocabulary rebuild when documents are added.
+N_FEATURES = 2 ** 20
+
+
+def _feature(term: str) -> int:
+    return zlib.crc32(term.encode("utf-8")) % N_FEATURES
+
+
+def term_frequencies(text: str) -> "sparse.csr_matrix":
+    """One 1 x N_FEATURES row of sublinear term frequencies (1 + log tf)."""
+    from scipy import sparse
+
+    counts: Counter = Counter(_feature(term) for term in extract_terms(text))
+    if not counts:
+        return sparse.csr_matrix((1, N_FEATURES), dtype=np.float32)
+
+    columns = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+    values = 1 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+    order = np.argsort(columns)
+    return sparse.csr_matrix(
+        (values[order], columns[order], np.array([0, len(columns)], dtype=np.int32)),
+        shape=(1, N_FEATURES),
+    )
+
+
+class MatchIndex:
+    """Sparse TF-IDF index over one kind of document (resumes or jobs).
+
+    Rows hold raw sublinear term frequencies; document frequencies are kept
+    alongside so IDF weighting is applied at query time and stays correct as
+    documents come and go. Removed rows are tombstoned and dropped on the
+    next compaction.
+    """
+
+    def __init__(self, name: str):
+        from scipy import sparse
+
+        self.name = name
+        self.ids: List[str] = []
+        self.meta: List[Dict[str, Any]] = []
+        self.alive = np.zeros(0, dtype=bool)
+        self.df = np.zeros(N_FEATURES, dtype=np.int32)
+        self._rows: Dict[str, int] = {}
+        self._matrix = sparse.csr_matrix((0, N_FEATURES), dtype=np.float32)
+        self._pending: List["sparse.csr_matrix"] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._rows
+
+    @property
+    def matrix(self) -> "sparse.csr_matrix":
+        if self._pending:
+            from scipy import sparse
+
+            self._matrix = sparse.vstack([self._matrix, *self._pending], format="csr")
+            self._pending = []
+        return self._matrix
+
+    def add(self, doc_id: str, text: str, meta: Optional[Dict[str, Any]] = None) -> None:
+        """Index a document, replacing any earlier version with the same id."""
+        self.remove(doc_id)
+        row = term_frequencies(text)
+        np.add.at(self.df, row.indices, 1)
+
+        self._rows[doc_id] = len(self.ids)
+        self.ids.append(doc_id)
+        self.meta.append(meta or {})
+        self.alive = np.append(self.alive, True)
+        self._pending.append(row)
+
+    def remove(self, doc_id: str) -> bool:
+        row_no = self._rows.pop(doc_id, None)
+        if row_no is None:
+            return False
+
+        np.subtract.at(self.df, self.row(row_no).indices, 1)
+        self.alive[row_no] = False
+
+        dead = len(self.ids) - len(self._rows)
+        if dead > 1000 and dead > len(self._rows):
+            self.compact()
+        return True
+
+    def row(self, row_no: int) -> "sparse.csr_matrix":
+        return self.matrix[row_no]
+
+    def vector(self, doc_id: str) -> Optional["sparse.csr_matrix"]:
+        row_no = self._rows.get(doc_id)
+        return None if row_no is None else self.row(row_no)
+
+    def meta_for(self, doc_id: str) -> Dict[str, Any]:
+        row_no = self._rows.get(doc_id)
+        return {} if row_no is None else self.meta[row_no]
+
+    def compact(self) -> None:
+        """Drop tombstoned rows."""
+        keep = np.flatnonzero(self.alive)
+        self._matrix = self.matrix[keep]
+        self.ids = [self.ids[i] for i in keep]
+        self.meta = [self.meta[i] for i in keep]
+        self.alive = np.ones(len(keep), dtype=bool)
+        self._rows = {doc_id: i for i, doc_id in enumerate(self.ids)}
+
+    def idf(self) -> np.ndarray:
+        n = len(self._rows)
+        return (np.log((1 + n) / (1 + self.df)) + 1).astype(np.float32)
+
+    def search(self, queries: "sparse.csr_matrix", k: int = 10) -> List[List[Tuple[str, float]]]:
+        """Rank this index's documents for each query row by cosine similarity.
+
+        ``queries`` is an m x N_FEATURES matrix of raw term frequencies (as
+        produced by ``term_frequencies`` or another index's rows). All
+        queries are scored with a single sparse matrix product.
+        """
+        if not self._rows or queries.shape[0] == 0:
+            return [[] for _ in range(queries.shape[0])]
+
+        from scipy import sparse
+
+        matrix = self.matrix
+        idf = self.idf()
+        idf_sq = sparse.diags(idf * idf)
+
+        # cos(d, q) = sum(d * idf * q * idf) / (|d * idf| * |q * idf|)
+        doc_norms = np.sqrt(matrix.multiply(matrix) @ (idf * idf))
+        query_norms = np.sqrt(queries.multiply(queries) @ (idf * idf))
+        scores = (matrix @ (idf_sq @ queries.T)).toarray()
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = scores / np.outer(doc_norms, query_norms)
+        scores[~np.isfinite(scores)] = 0.0
+        scores[~self.alive] = -np.inf
+
+        k = min(k, len(self._rows))
+        results = []
+        for column in scores.T:
+            top = np.argpartition(-column, k - 1)[:k]
+            top = top[np.argsort(-column[top], kind="stable")]
+            results.append([(self.ids[i], round(float(column[i]), 4)) for i in top])
+        return results
+
+    def search_text(self, text: str, k: int = 10) -> List[Tuple[str, float]]:
+        return self.search(term_frequencies(text), k)[0]
+
+    def save(self, directory: str) -> None:
+        """Write the index as .npy files that `load` can memory-map."""
+        self.compact()
+        os.makedirs(directory, exist_ok=True)
+        matrix = self.matrix
+
+        arrays = {
+            "data": matrix.data,
+            "indices": matrix.indices,
+            "indptr": matrix.indptr,
+            "df": self.df,
+        }
+        for key, array in arrays.items():
+            path = os.path.join(directory, f"{self.name}.{key}.npy")
+            tmp = path + ".tmp.npy"
+            np.save(tmp, array)
+            os.replace(tmp, path)
+
+        path = os.path.join(directory, f"{self.name}.docs.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"ids": self.ids, "meta": self.meta}, f)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, name: str, directory: str) -> "MatchIndex":
+        """Load a saved index; the matrix arrays are memory-mapped read-only."""
+        index = cls(name)
+        docs_path = os.path.join(directory, f"{name}.docs.json")
+        if not os.path.exists(docs_path):
+            return index
+
+        with open(docs_path, encoding="utf-8") as f:
+            docs = json.load(f)
+        from scipy import sparse
+
+        def array(key: str) -> np.ndarray:
+            return np.load(os.path.join(directory, f"{name}.{key}.npy"), mmap_mode="r")
+
+        index.ids = docs["ids"]
+        index.meta = docs["meta"]
+        index.alive = np.ones(len(index.ids), dtype=bool)
+        index.df = np.array(array("df"))
+        index._rows = {doc_id: i for i, doc_id in enumerate(index.ids)}
+        index._matrix = sparse.csr_matrix(
+            (array("data"), array("indices"), array("indptr")),
+            shape=(len(index.ids), N_FEATURES),
+            copy=False,
+        )
+        return index
+
+
+class MatchingEngine:
+    """Resume and job indexes, ranked against each other.
+
+    Saved indexes are loaded from ``directory`` on first use (or by the
+    startup warm-up), not when the engine is created.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self._resumes: Optional[MatchIndex] = None
+        self._jobs: Optional[MatchIndex] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._resumes is not None and self._jobs is not None
+
+    def load(self) -> None:
+        if self.loaded:
+            return
+        with self._lock:
+            if self._resumes is not None:
+                return
+            if self.directory:
+                self._jobs = MatchIndex.load("jobs", self.directory)
+                self._resumes = MatchIndex.load("resumes", self.directory)
+            else:
+                self._jobs = MatchIndex("jobs")
+                self._resumes = MatchIndex("resumes")
+
+    @property
+    def resumes(self) -> MatchIndex:
+        self.load()
+        return self._resumes
+
+    @resumes.setter
+    def resumes(self, index: MatchIndex) -> None:
+        self._resumes = index
+
+    @property
+    def jobs(self) -> MatchIndex:
+        self.load()
+        return self._jobs
+
+    @jobs.setter
+    def jobs(self, index: MatchIndex) -> None:
+        self._jobs = index
+
+    def rank_resumes_for_job(self, job_id: str, k: int = 10) -> Optional[List[Tuple[str, float]]]:
+        vector = self.jobs.vector(job_id)
+        if vector is None:
+            return None
+        return self.resumes.search(vector, k)[0]
+
+    def rank_jobs_for_resume(self, resume_id: str, k: int = 10) -> Optional[List[Tuple[str, float]]]:
+        vector = self.resumes.vector(resume_id)
+        if vector is None:
+            return None
+        return self.jobs.search(vector, k)[0]
+
+    def rank_resumes_for_jobs(
+        self, job_ids: Sequence[str], k: int = 10
+    ) -> Dict[str, List[Tuple[str, float]]]:
+        """Top resumes for several indexed jobs in one matrix product."""
+        known = [job_id for job_id in job_ids if job_id in self.jobs]
+        if not known:
+            return {}
+        from scipy import sparse
+
+        queries = sparse.vstack([self.jobs.vector(job_id) for job_id in known], format="csr")
+        return dict(zip(known, self.resumes.search(queries, k)))
+
+    def save(self) -> None:
+        if not self.directory or not self.loaded:
+            return
+        self.resumes.save(self.directory)
+        self.jobs.save(self.directory)
+        logger.info(
+            "Saved matching index: %d resumes, %d jobs", len(self.resumes), len(self.jobs)
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {"resumes": len(self.resumes), "jobs": len(self.jobs)}
+
+
+matching_engine = MatchingEngine(settings.matching_index_dir or None)
@@ -0,0 +1,213 @@
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, Iterator, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .prompt_builder import count_tokens
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80)
+
+REQUEST_SECONDS = Histogram(
+    "career_request_seconds",
+    "HTTP request latency, until the response body is fully sent",
+    ["endpoint", "method", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+STAGE_SECONDS = Histogram(
+    "career_stage_seconds",
+    "Time spent in each stage of a request (upload, extract, prompt, llm, parse)",
+    ["endpoint", "stage"],
+    buckets=_LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge(
+    "career_http_requests_in_flight",
+    "HTTP requests being handled",
+    multiprocess_mode="livesum",
+)
+LLM_IN_FLIGHT = Gauge(
+    "career_llm_calls_in_flight",
+    "Upstream model calls awaiting a response",
+    multiprocess_mode="livesum",
+)
+LLM_CALLS = Counter(
+    "career_llm_calls_total",
+    "Upstream model calls by API path and outcome",
+    ["model", "api", "outcome"],
+)
+LLM_FALLBACKS = Counter(
+    "career_llm_fallbacks_total",
+    "Calls that fell back to chat_completion or to a fallback model",
+    ["kind"],
+)
+LLM_EARLY_STOPS = Counter(
+    "career_llm_early_stops_total",
+    "Generations closed as soon as the output parser saw complete output",
+    ["task"],
+)
+CLIENT_DISCONNECTS = Counter(
+    "career_client_disconnects_total",
+    "Requests whose work was cancelled because the client went away",
+)
+DEADLINE_REJECTIONS = Counter(
+    "career_deadline_rejections_total",
+    "Requests failed with 504 because the client's deadline could not be met",
+    ["stage"],
+)
+LLM_ADMISSION_ACTIVE = Gauge(
+    "career_llm_admission_active",
+    "Model calls holding an admission slot",
+    multiprocess_mode="livesum",
+)
+LLM_ADMISSION_WAITING = Gauge(
+    "career_llm_admission_waiting",
+    "Model calls waiting in the admission queue",
+    multiprocess_mode="livesum",
+)
+LLM_ADMISSIONS = Counter(
+    "career_llm_admissions_total",
+    "Model calls admitted or rejected by admission control",
+    ["outcome"],
+)
+RATE_LIMITED = Counter(
+    "career_rate_limited_total",
+    "Requests refused with 429 by the per-client rate limiter",
+)
+RATE_LIMIT_CLIENTS = Gauge(
+    "career_rate_limit_clients",
+    "Clients with a rate-limiter token bucket",
+    multiprocess_mode="livesum",
+)
+JD_LOOKUPS = Counter(
+    "career_jd_lookups_total",
+    "Job descriptions matched to a known posting exactly, as a near duplicate, or new",
+    ["result"],
+)
+LLM_TOKENS = Histogram(
+    "career_llm_tokens",
+    "Prompt (input) and generated (output) tokens per model call",
+    ["direction"],
+    buckets=(50, 100, 250, 500, 750, 1000, 1500, 2000, 3000, 4000, 6000),
+)
+
+# Per-request stage durations in seconds; None outside a request
+_stage_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "stage_timings", default=None
+)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block (or, as a decorator, a function) as a request stage.
+
+    Repeated stages within one request add up. Outside a request this is a
+    no-op apart from two clock reads.
+    """
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings = _stage_timings.get()
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + perf_counter() - start
+
+
+@contextmanager
+def llm_call(model: str, api: str) -> Iterator[None]:
+    """Count one upstream call and keep the in-flight gauge up to date."""
+    LLM_IN_FLIGHT.inc()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    except BaseException as e:
+        # Timeouts reach the call as cancellation
+        if not isinstance(e, Exception):
+            outcome = "cancelled"
+        raise
+    finally:
+        LLM_IN_FLIGHT.dec()
+        LLM_CALLS.labels(model, api, outcome).inc()
+
+
+def record_tokens(prompt: str, output: str) -> None:
+    LLM_TOKENS.labels("input").observe(count_tokens(prompt))
+    LLM_TOKENS.labels("output").observe(count_tokens(output))
+
+
+def server_timing(timings: Dict[str, float], total: float) -> str:
+    parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class MetricsMiddleware:
+    """Request latency histograms plus a Server-Timing header per response.
+
+    Stages recorded with `stage()` before the response starts appear in the
+    header; all of them, including those of a streamed body, go to the
+    per-stage histogram once the response is complete.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: Dict[str, float] = {}
+        token = _stage_timings.set(timings)
+        start = perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(timings, perf_counter() - start))
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            _stage_timings.reset(token)
+            if scope.get("state", {}).get("client_disconnected"):
+                # nginx's "client closed request"; nothing was sent
+                status = 499
+
+            # The route template keeps label cardinality bounded
+            route = scope.get("route")
+            endpoint = getattr(route, "path", "unmatched")
+            REQUEST_SECONDS.labels(endpoint, scope["method"], str(status)).observe(
+                perf_counter() - start
+            )
+            for name, seconds in timings.items():
+                STAGE_SECONDS.labels(endpoint, name).observe(seconds)
+
+
+def render_metrics() -> bytes:
+    """Prometheus text format, aggregated across workers in multiprocess mode."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import List, Optional, Tuple
+
+from .config import settings
+from .deadlines import deadline_exceeded, timeout_for
+
+logger = logging.getLogger(__name__)
+
+
+class PdfExtractionError(Exception):
+    """The uploaded PDF could not be parsed."""
+
+
+class PdfExtractionTimeout(Exception):
+    """Parsing the uploaded PDF took longer than `pdf_timeout_seconds`."""
+
+
+class PdfWorkersUnavailable(Exception):
+    """The extraction workers kept failing; the PDF itself may be fine."""
+
+
+def _extract_pages(
+    file_bytes: bytes, start: int, stop: int, max_chars: int
+) -> Tuple[int, List[str]]:
+    """Return ``(page_count, page_texts)`` for pages ``start..stop``.
+
+    Runs inside a pool worker. Stops early once ``max_chars`` characters
+    have been collected.
+    """
+    # Imported here so the web process does not pay for pypdf at startup
+    from pypdf import PdfReader
+
+    reader = PdfReader(BytesIO(file_bytes))
+    page_count = len(reader.pages)
+
+    parts: List[str] = []
+    collected = 0
+    for index in range(start, min(stop, page_count)):
+        page_text = reader.pages[index].extract_text() or ""
+        parts.append(page_text)
+        collected += len(page_text) + 1
+        if collected >= max_chars:
+            break
+
+    return page_count, parts
+
+
+def extract_text_from_pdf(
+    file_bytes: bytes,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> str:
+    """Extract text from a PDF file given its bytes, in the calling process."""
+    max_pages = settings.pdf_max_pages if max_pages is None else max_pages
+    max_chars = settings.pdf_max_chars if max_chars is None else max_chars
+
+    _, parts = _extract_pages(file_bytes, 0, max_pages, max_chars)
+    return "\n".join(parts)[:max_chars]
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: forking a process that already runs the event loop and its
+        # thread pool can deadlock the child.
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.pdf_extraction_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def _reset_pool(pool: ProcessPoolExecutor) -> None:
+    """Kill ``pool``'s workers, e.g. one stuck on a pathological PDF.
+
+    Does nothing if ``pool`` has already been replaced, so a request that
+    gives up late cannot kill a fresh pool serving other uploads.
+    """
+    global _pool
+    if _pool is not pool:
+        return
+    _pool = None
+
+    # ProcessPoolExecutor cannot cancel a running task; terminating the
+    # workers is the only way to get the CPU back.
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _import_pypdf() -> None:
+    import pypdf  # noqa: F401
+
+
+def warm_pool() -> None:
+    """Start every pool worker and import pypdf in it.
+
+    Blocks until done, so call it from a thread. Spawned workers otherwise
+    start (and import the app) on the first PDF upload.
+    """
+    pool = _get_pool()
+    futures = [pool.submit(_import_pypdf) for _ in range(settings.pdf_extraction_workers)]
+    for future in futures:
+        future.result()
+
+
+def shutdown_pool() -> None:
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_in_pool(pool: ProcessPoolExecutor, *args) -> asyncio.Future:
+    try:
+        return asyncio.get_running_loop().run_in_executor(pool, _extract_pages, *args)
+    except RuntimeError as e:
+        # Shut down by `shutdown_pool` or another upload's reset after we
+        # picked it up; that is the same as a pool broken mid-way.
+        raise BrokenProcessPool(str(e)) from e
+
+
+async def _extract_in_pool(pool: ProcessPoolExecutor, file_bytes: bytes) -> str:
+    max_pages = settings.pdf_max_pages
+    max_chars = settings.pdf_max_chars
+    first_batch = settings.pdf_pages_per_worker
+
+    page_count, parts = await _run_in_pool(
+        pool, file_bytes, 0, min(first_batch, max_pages), max_chars
+    )
+
+    pages = min(page_count, max_pages)
+    if page_count > max_pages:
+        logger.warning("PDF has %d pages; extracting only the first %d", page_count, max_pages)
+
+    collected = sum(len(part) + 1 for part in parts)
+    if pages > first_batch and collected < max_chars:
+        # Long document: fan the remaining pages out across the pool
+        ranges = [
+            (start, min(start + first_batch, pages))
+            for start in range(first_batch, pages, first_batch)
+        ]
+        batches = await asyncio.gather(
+            *[
+                _run_in_pool(pool, file_bytes, start, stop, max_chars)
+                for start, stop in ranges
+            ]
+        )
+        for _, batch in batches:
+            parts.extend(batch)
+
+    return "\n".join(parts)[:max_chars]
+
+
+async def extract_pdf_text(file_bytes: bytes) -> str:
+    """Extract PDF text in the process pool, bounded by page, size and time limits.
+
+    The time limit shrinks to the request deadline, if that is sooner. A
+    pool that breaks mid-way, usually because another upload's timeout
+    reset it, is replaced and the extraction tried once more.
+    """
+    timeout, deadline_limited = timeout_for(settings.pdf_timeout_seconds, stage="extract")
+    pools: List[ProcessPoolExecutor] = []
+
+    async def extract() -> str:
+        while True:
+            pool = _get_pool()
+            pools.append(pool)
+            try:
+                return await _extract_in_pool(pool, file_bytes)
+            except BrokenProcessPool:
+                _reset_pool(pool)
+                if len(pools) > 1:
+                    raise
+                logger.warning("PDF worker pool broke; retrying on a fresh pool")
+
+    try:
+        text = await asyncio.wait_for(extract(), timeout=timeout)
+    except asyncio.TimeoutError:
+        if deadline_limited:
+            # The workers are not stuck; the client just cannot wait longer
+            raise deadline_exceeded(
+                "extract", "The request deadline passed while reading the PDF."
+            ) from None
+        logger.error("PDF extraction timed out after %.1fs", settings.pdf_timeout_seconds)
+        if pools:
+            _reset_pool(pools[-1])
+        raise PdfExtractionTimeout("Timed out while reading the PDF.") from None
+    except BrokenProcessPool as e:
+        raise PdfWorkersUnavailable("The PDF could not be processed right now.") from e
+    except Exception as e:
+        logger.warning("PDF extraction failed: %r", e)
+        raise PdfExtractionError("The PDF could not be read. Is it a valid PDF?") from e
+
+    logger.info("Extracted resume text length: %d characters", len(text))
+    return text
@@ -0,0 +1,204 @@
+import logging
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Set, Tuple
+
+from .config import settings
+from .resume_sections import split_sections
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio for English text with Llama/Mistral style
+# tokenizers, used when the model tokenizer is unavailable.
+CHARS_PER_TOKEN = 4
+
+_STOPWORDS = {
+    "and", "the", "for", "with", "you", "your", "our", "are", "will", "who",
+    "this", "that", "from", "have", "has", "all", "not", "but", "can", "able",
+    "work", "team", "role", "job", "including", "such", "into", "their", "its",
+    "about", "they", "them", "was", "were", "been", "being", "also", "any",
+}
+
+
+SHARED_CONTEXT = "shared_context"
+
+
+@dataclass(frozen=True)
+class PromptBudget:
+    """How much resume context one task may send, and from which sections."""
+
+    resume_tokens: int
+    sections: Tuple[str, ...]
+    # Sections whose bullets are ranked individually instead of kept whole
+    ranked_sections: Tuple[str, ...] = ("experience", "projects")
+
+
+TASK_BUDGETS = {
+    "rewrite_summary": PromptBudget(
+        resume_tokens=600,
+        sections=("summary", "skills", "experience"),
+    ),
+    "improve_resume": PromptBudget(
+        resume_tokens=1500,
+        sections=("summary", "experience", "skills", "projects", "education"),
+    ),
+    "cover_letter": PromptBudget(
+        resume_tokens=1500,
+        sections=("header", "summary", "experience", "projects", "skills", "education"),
+    ),
+    # One context for every task, so their prompts share a prefix
+    SHARED_CONTEXT: PromptBudget(
+        resume_tokens=1500,
+        sections=("header", "summary", "experience", "projects", "skills", "education"),
+    ),
+}
+
+
+@lru_cache(maxsize=1)
+def _model_tokenizer():
+    """The model's tokenizer, or None when `tokenizers` is not installed."""
+    if not settings.prompt_use_model_tokenizer:
+        return None
+    try:
+        from tokenizers import Tokenizer
+    except ImportError:
+        return None
+
+    try:
+        return Tokenizer.from_pretrained(settings.hf_model_id, token=settings.hf_api_key)
+    except Exception:
+        logger.warning("Could not load tokenizer for %s; estimating tokens", settings.hf_model_id)
+        return None
+
+
+def count_tokens(text: str) -> int:
+    tokenizer = _model_tokenizer()
+    if tokenizer is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text down to roughly ``max_tokens``, on a line boundary when possible."""
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    kept: List[str] = []
+    used = 0
+    for line in text.splitlines():
+        cost = count_tokens(line) + 1
+        if used + cost > max_tokens:
+            if not kept:
+                kept.append(line[: max_tokens * CHARS_PER_TOKEN])
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
+
+
+def _terms(text: str) -> Set[str]:
+    words = re.findall(r"[a-z][a-z0-9+#.\-]*[a-z0-9+#]|[a-z]", text.lower())
+    return {word for word in words if len(word) > 2 and word not in _STOPWORDS}
+
+
+def _relevance(text: str, jd_terms: Set[str]) -> float:
+    terms = _terms(text)
+    if not terms:
+        return 0.0
+    return len(terms & jd_terms) / math.sqrt(len(terms))
+
+
+def fit_resume_to_budget(task: str, resume_text: str, job_description: str) -> str:
+    """Return the resume context for ``task``, trimmed to its token budget.
+
+    Resumes that already fit are returned unchanged. Otherwise the task's
+    sections are split into units (whole sections, or single bullets for
+    experience/projects), the units most relevant to the JD are kept until
+    the budget is spent, and the result is re-assembled in resume order.
+    """
+    budget = TASK_BUDGETS[task]
+    if count_tokens(resume_text) <= budget.resume_tokens:
+        return resume_text
+
+    sections = split_sections(resume_text)
+    if set(sections) <= {"header"}:
+        # Nothing recognisable: rank every line of the resume
+        sections = {"experience": resume_text}
+        budget = PromptBudget(budget.resume_tokens, ("experience",))
+
+    jd_terms = _terms(job_description)
+
+    # (section order, line order, relevance, text)
+    units: List[Tuple[int, int, float, str]] = []
+    for order, name in enumerate(budget.sections):
+        body = sections.get(name)
+        if not body:
+            continue
+        if name in budget.ranked_sections:
+            for line_no, line in enumerate(body.splitlines()):
+                if line.strip():
+                    units.append((order, line_no, _relevance(line, jd_terms), line))
+        else:
+            # Kept whole, ahead of individual bullets
+            units.append((order, 0, math.inf, body))
+
+    chosen = []
+    used = 0
+    for unit in sorted(units, key=lambda u: (-u[2], u[0], u[1])):
+        remaining = budget.resume_tokens - used
+        cost = count_tokens(unit[3]) + 1
+        if cost > remaining:
+            if unit[2] != math.inf or remaining < 50:
+                continue
+            # An oversized whole section still gets what room is left
+            unit = unit[:3] + (truncate_to_tokens(unit[3], remaining - 1),)
+            cost = remaining
+        chosen.append(unit)
+        used += cost
+
+    parts: List[str] = []
+    current: Optional[int] = None
+    for order, _, _, text in sorted(chosen, key=lambda u: (u[0], u[1])):
+        if order != current:
+            current = order
+            name = budget.sections[order]
+            if name != "header":
+                parts.append(f"\n{name.upper()}:" if parts else f"{name.upper()}:")
+        parts.append(text)
+
+    fitted = "\n".join(parts).strip()
+    logger.info(
+        "Prompt builder (%s): resume context %d -> %d tokens",
+        task,
+        count_tokens(resume_text),
+        count_tokens(fitted),
+    )
+    return fitted
+
+
+def fit_job_description(job_description: str) -> str:
+    return truncate_to_tokens(job_description, settings.prompt_jd_token_budget)
+
+
+def fit_context(task: str, resume_text: str, job_description: str) -> Tuple[str, str]:
+    """The ``(resume, job description)`` text that ``task``'s prompt starts with.
+
+    With `prompt_shared_context` every task gets the same text, so prompts
+    for one resume and JD share a byte-identical prefix that inference
+    servers with prefix caching only prefill once.
+    """
+    budget = SHARED_CONTEXT if settings.prompt_shared_context else task
+    return _fit_context(budget, resume_text, job_description, settings.prompt_jd_token_budget)
+
+
+@lru_cache(maxsize=64)
+def _fit_context(
+    budget: str, resume_text: str, job_description: str, jd_token_budget: int
+) -> Tuple[str, str]:
+    # Cached: the tasks of one full analysis all fit the same context
+    return (
+        fit_resume_to_budget(budget, resume_text, job_description),
+        fit_job_description(job_description),
+    )
@@ -0,0 +1,317 @@
+import asyncio
+import logging
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .config import settings
+from .deadlines import clear_deadline
+from .llm_cache import cache_enabled
+from .resilience import UpstreamUnavailable
+from .services import hf_client
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Recent questions listed in the prompt so the model avoids them
+AVOID_IN_PROMPT = 20
+# Upper bound on generations per refill, in case the model keeps repeating itself
+MAX_BATCHES_PER_REFILL = 5
+
+
+# Seniority and level words; questions at each difficulty are shared across them
+_ROLE_LEVEL_WORDS = {
+    "senior", "sr", "junior", "jr", "mid", "level", "entry", "principal", "staff",
+    "lead", "i", "ii", "iii", "iv",
+}
+
+
+def normalize_role(role: str) -> str:
+    """``role`` without case, punctuation or seniority words.
+
+    "Sr. Backend Engineer II" and "backend engineer" share a pool.
+    """
+    words = re.sub(r"[^\w\s+#]", " ", role.casefold()).split()
+    core = [word for word in words if word not in _ROLE_LEVEL_WORDS]
+    return " ".join(core or words)
+
+
+def pool_key(role: str, interview_type: str, difficulty: str) -> str:
+    """One pool per normalized role, interview type and difficulty."""
+    parts = (normalize_role(role), interview_type, difficulty)
+    return "|".join(" ".join(part.split()).casefold() for part in parts)
+
+
+def question_fingerprint(question: str) -> str:
+    """Equal for questions that differ only in case, spacing or punctuation."""
+    return " ".join(re.sub(r"[^\w\s]", " ", question.casefold()).split())
+
+
+class QuestionStore:
+    """Pre-generated interview questions in SQLite, shared by all worker processes.
+
+    Served questions are kept for `question_pool_seen_ttl_seconds` so the
+    same question is not generated and served again in the meantime. The
+    connection is opened on first use.
+    """
+
+    def __init__(self, path: str, seen_ttl_seconds: float):
+        self.path = path
+        self.seen_ttl_seconds = seen_ttl_seconds
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS questions ("
+                "pool TEXT NOT NULL, fingerprint TEXT NOT NULL, question TEXT NOT NULL, "
+                "created_at REAL NOT NULL, served_at REAL, PRIMARY KEY (pool, fingerprint))"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS questions_unserved "
+                "ON questions (pool, served_at, created_at)"
+            )
+        return self._db
+
+    def add(self, pool: str, questions: List[str]) -> int:
+        """Store the questions not seen before in ``pool``; returns how many were new."""
+        now = time.time()
+        self._conn.execute(
+            "DELETE FROM questions WHERE served_at <= ?", (now - self.seen_ttl_seconds,)
+        )
+        before = self._conn.total_changes
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO questions (pool, fingerprint, question, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (pool, question_fingerprint(question), question, now)
+                for question in questions
+                if question_fingerprint(question)
+            ],
+        )
+        return self._conn.total_changes - before
+
+    def pop(self, pool: str) -> Optional[str]:
+        """Take the oldest unserved question, atomically across processes."""
+        row = self._conn.execute(
+            "UPDATE questions SET served_at = ? WHERE rowid = ("
+            "SELECT rowid FROM questions WHERE pool = ? AND served_at IS NULL "
+            "ORDER BY created_at LIMIT 1) RETURNING question",
+            (time.time(), pool),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def available(self, pool: str) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM questions WHERE pool = ? AND served_at IS NULL", (pool,)
+        ).fetchone()[0]
+
+    def evict_pools(self, keep: int) -> int:
+        """Drop all but the ``keep`` most recently used pools; returns rows deleted."""
+        before = self._conn.total_changes
+        self._conn.execute(
+            "DELETE FROM questions WHERE pool NOT IN ("
+            "SELECT pool FROM questions GROUP BY pool "
+            "ORDER BY MAX(COALESCE(served_at, created_at)) DESC LIMIT ?)",
+            (keep,),
+        )
+        return self._conn.total_changes - before
+
+    def recent(self, pool: str, limit: int) -> List[str]:
+        rows = self._conn.execute(
+            "SELECT question FROM questions WHERE pool = ? ORDER BY created_at DESC LIMIT ?",
+            (pool, limit),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+
+class QuestionPool:
+    """Serves interview questions from pre-generated pools.
+
+    A question is popped from the store; when a pool that has had
+    ``refill_after`` requests drops below ``low_water`` unserved questions,
+    background workers generate batches until it holds ``target`` again.
+    Only an empty pool makes the request wait for a generation, shared by
+    every request for that pool. A role asked for once therefore costs a
+    single batch, and at most ``max_pools`` pools and ``max_queued``
+    pending refills are kept.
+    """
+
+    def __init__(
+        self,
+        store: QuestionStore,
+        low_water: int,
+        target: int,
+        workers: int,
+        refill_after: int = 2,
+        max_pools: int = 200,
+        max_queued: int = 50,
+    ):
+        self.store = store
+        self.low_water = low_water
+        self.target = target
+        self.workers = workers
+        self.refill_after = refill_after
+        self.max_pools = max_pools
+        self.max_queued = max_queued
+        self.served = 0
+        self.cold_misses = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.failed_refills = 0
+        self.dropped_refills = 0
+        # Requests per pool key, least recently requested first
+        self._requests: "OrderedDict[str, int]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self._scheduled: Set[str] = set()
+        self._cold_refills = SingleFlight()
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._loop = None
+        self._scheduled.clear()
+
+    async def next_question(
+        self, role: str, interview_type: str, difficulty: str
+    ) -> Tuple[str, bool]:
+        """Return ``(question, from_pool)``; ``from_pool`` is false after a cold miss."""
+        spec = (normalize_role(role), interview_type, difficulty)
+        key = pool_key(*spec)
+        requests = self._count_request(key)
+
+        question = self.store.pop(key)
+        from_pool = question is not None
+        if question is None:
+            self.cold_misses += 1
+            # One batch now; the workers top the pool up afterwards
+            await self._cold_refills.do(key, lambda: self._cold_refill(*spec))
+            question = self.store.pop(key)
+            if question is None:
+                raise UpstreamUnavailable("Could not generate a new interview question.")
+
+        self.served += 1
+        if requests >= self.refill_after and self.store.available(key) < self.low_water:
+            self.schedule_refill(*spec)
+        return question, from_pool
+
+    def _count_request(self, key: str) -> int:
+        requests = self._requests.pop(key, 0) + 1
+        self._requests[key] = requests
+        if len(self._requests) > self.max_pools:
+            self._requests.popitem(last=False)
+        return requests
+
+    async def _cold_refill(self, role: str, interview_type: str, difficulty: str) -> int:
+        added = await self.refill(role, interview_type, difficulty, max_batches=1)
+        # A new pool may have pushed the store over max_pools
+        self.store.evict_pools(self.max_pools)
+        return added
+
+    def schedule_refill(self, role: str, interview_type: str, difficulty: str) -> None:
+        """Queue a background refill, unless one is already queued for the pool."""
+        if self._loop is not asyncio.get_running_loop():
+            # Not started by the app lifespan (or started on another loop)
+            self.start()
+        key = pool_key(role, interview_type, difficulty)
+        if key in self._scheduled:
+            return
+        try:
+            self._queue.put_nowait((role, interview_type, difficulty))
+        except asyncio.QueueFull:
+            # The pool is retried on its next request below the low-water mark
+            self.dropped_refills += 1
+            return
+        self._scheduled.add(key)
+
+    async def refill(
+        self,
+        role: str,
+        interview_type: str,
+        difficulty: str,
+        max_batches: int = MAX_BATCHES_PER_REFILL,
+    ) -> int:
+        """Generate batches until the pool holds ``target`` questions.
+
+        Returns how many questions were added.
+        """
+        key = pool_key(role, interview_type, difficulty)
+        # A cached batch would only repeat questions the pool already has
+        token = cache_enabled.set(False)
+        added = 0
+        try:
+            for _ in range(max_batches):
+                missing = self.target - self.store.available(key)
+                if missing <= 0:
+                    break
+                questions = await hf_client.generate_questions(
+                    role, interview_type, difficulty, avoid=self.store.recent(key, AVOID_IN_PROMPT)
+                )
+                new = self.store.add(key, questions[:missing])
+                self.generated += new
+                self.duplicates += len(questions[:missing]) - new
+                added += new
+                if not new:
+                    # The model has run out of new questions for now
+                    break
+        finally:
+            cache_enabled.reset(token)
+        return added
+
+    async def _worker(self) -> None:
+        # Refills outlive the request that scheduled them
+        clear_deadline()
+        while True:
+            spec = await self._queue.get()
+            try:
+                added = await self.refill(*spec)
+                logger.info("Added %d questions to pool %s", added, pool_key(*spec))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Refilling question pool %s failed", pool_key(*spec))
+                self.failed_refills += 1
+            finally:
+                self._scheduled.discard(pool_key(*spec))
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "refills_queued": self._queue.qsize() if self._queue is not None else 0,
+            "served": self.served,
+            "cold_misses": self.cold_misses,
+            "generated": self.generated,
+            "duplicates": self.duplicates,
+            "failed_refills": self.failed_refills,
+            "dropped_refills": self.dropped_refills,
+            "pools_tracked": len(self._requests),
+        }
+
+
+question_store = QuestionStore(settings.question_pool_path, settings.question_pool_seen_ttl_seconds)
+
+question_pool = QuestionPool(
+    question_store,
+    low_water=settings.question_pool_low_water,
+    target=settings.question_pool_target,
+    workers=settings.question_pool_workers,
+    refill_after=settings.question_pool_refill_after,
+    max_pools=settings.question_pool_max_pools,
+    max_queued=settings.question_pool_max_queued,
+)
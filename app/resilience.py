@@ -0,0 +1,139 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+
+
+class UpstreamError(Exception):
+    """The language model could not produce a response."""
+
+    status_code = 502
+
+    def __init__(self, message: str, retryable: bool = False, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class UpstreamTimeout(UpstreamError):
+    """The model call exceeded `llm_timeout_seconds`."""
+
+    status_code = 504
+
+
+class UpstreamUnavailable(UpstreamError):
+    """The model is rate limiting, loading, or its circuit breaker is open."""
+
+    status_code = 503
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def as_upstream_error(exc: BaseException) -> UpstreamError:
+    """Classify an exception from the inference client."""
+    if isinstance(exc, UpstreamError):
+        return exc
+    if isinstance(exc, TimeoutError):
+        return UpstreamTimeout("The language model took too long to respond.", retryable=True)
+
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if isinstance(status, int):
+        retry_after = parse_retry_after(response.headers.get("retry-after"))
+        if status in (429, 503):
+            return UpstreamUnavailable(
+                "The language model is busy. Please try again shortly.",
+                retryable=True,
+                retry_after=retry_after,
+            )
+        if status >= 500:
+            return UpstreamError(f"The language model returned HTTP {status}.", retryable=True)
+        return UpstreamError(f"The language model rejected the request (HTTP {status}).")
+
+    if isinstance(exc, (httpx.TransportError, ConnectionError)):
+        return UpstreamError("Could not reach the language model.", retryable=True)
+
+    return UpstreamError("Could not generate a response at this time.")
+
+
+def backoff_delay(
+    attempt: int,
+    base: float,
+    cap: float,
+    retry_after: Optional[float] = None,
+) -> Optional[float]:
+    """Full-jitter exponential backoff, or the server's Retry-After when given.
+
+    None when Retry-After is longer than ``cap``: retrying sooner than the
+    server asked would only fail again, so the caller should give up and
+    pass Retry-After on instead.
+    """
+    if retry_after is not None:
+        return retry_after if retry_after <= cap else None
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Fail fast after repeated upstream failures.
+
+    Opens after ``failure_threshold`` consecutive failures. Once
+    ``reset_seconds`` have passed a single trial call is let through
+    (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def retry_after(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+
+    def release(self) -> None:
+        """The call was cancelled before it could tell us anything."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._trial_in_flight = False
@@ -0,0 +1,102 @@
+import re
+from typing import Dict
+
+# Canonical section name -> headings that introduce it
+SECTION_HEADINGS = {
+    "summary": (
+        "summary",
+        "professional summary",
+        "career summary",
+        "profile",
+        "professional profile",
+        "about me",
+        "objective",
+        "career objective",
+    ),
+    "experience": (
+        "experience",
+        "work experience",
+        "professional experience",
+        "relevant experience",
+        "employment",
+        "employment history",
+        "work history",
+        "internships",
+        "internship experience",
+    ),
+    "skills": (
+        "skills",
+        "technical skills",
+        "core skills",
+        "key skills",
+        "core competencies",
+        "technologies",
+        "tools and technologies",
+    ),
+    "projects": (
+        "projects",
+        "personal projects",
+        "academic projects",
+        "selected projects",
+        "key projects",
+    ),
+    "education": (
+        "education",
+        "academic background",
+        "certifications",
+        "education and certifications",
+    ),
+}
+
+_HEADING_TO_SECTION = {
+    heading: section
+    for section, headings in SECTION_HEADINGS.items()
+    for heading in headings
+}
+_MAX_HEADING_LENGTH = 40
+
+
+def _match_heading(line: str):
+    """Return ``(section, rest_of_line)`` if the line starts a section, else None."""
+    stripped = line.strip()
+    if not stripped or len(stripped) > 200:
+        return None
+
+    heading, sep, rest = stripped.partition(":")
+    if not sep:
+        heading, rest = stripped, ""
+    if len(heading) > _MAX_HEADING_LENGTH:
+        return None
+
+    key = re.sub(r"[^a-z ]+", " ", heading.lower())
+    key = " ".join(key.replace(" & ", " and ").split())
+    section = _HEADING_TO_SECTION.get(key)
+    if section is None:
+        return None
+    return section, rest.strip()
+
+
+def split_sections(resume_text: str) -> Dict[str, str]:
+    """Split resume text into canonical sections.
+
+    Text before the first recognised heading (name, contact details) is
+    returned under "header". Repeated headings are merged into one section.
+    """
+    sections: Dict[str, list] = {}
+    current = "header"
+
+    for line in resume_text.splitlines():
+        match = _match_heading(line)
+        if match is not None:
+            current, rest = match
+            sections.setdefault(current, [])
+            if rest:
+                sections[current].append(rest)
+            continue
+        sections.setdefault(current, []).append(line)
+
+    return {
+        name: "\n".join(lines).strip()
+        for name, lines in sections.items()
+        if "\n".join(lines).strip()
+    }
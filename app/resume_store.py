@@ -0,0 +1,26 @@
+import hashlib
+import re
+
+from .config import settings
+from .ttl_cache import TTLCache
+
+
+def resume_id_for(file_bytes: bytes) -> str:
+    """Content-addressed id: the same file always maps to the same resume_id."""
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+def normalize_resume_text(text: str) -> str:
+    """Collapse runs of whitespace and blank lines left behind by PDF extraction."""
+    lines = [" ".join(line.split()) for line in text.replace("\x00", "").splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+class ResumeStore(TTLCache[str]):
+    """Extracted, normalized resume text keyed by resume_id."""
+
+
+resume_store = ResumeStore(
+    max_items=settings.resume_store_max_items,
+    ttl_seconds=settings.resume_store_ttl_seconds,
+)
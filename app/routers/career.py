@@ -1,84 +1,484 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+import json
+from dataclasses import asdict
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional
+
+from fastapi import APIRouter, Depends, Query, Request, UploadFile, File, Form, HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter, ValidationError
+from fastapi.responses import JSONResponse, StreamingResponse
+from ..admission import AdmissionRejected, enforce_rate_limit
+from ..config import settings
+from ..deadlines import require_generation_time
+from ..resilience import UpstreamError
 from ..schemas import (
+    BatchCoverLetterJob,
+    BatchCoverLetterResult,
     CoverLetterRequest,
     CoverLetterResponse,
+    FullAnalysisResponse,
+    JobAccepted,
+    KeywordGapResponse,
+    PopularJobPosting,
+    ResumeUploadResponse,
     SmartResumeRequest,
     SmartResumeResponse,
 )
+from ..ingestion import ingest_upload
+from ..jobs import QUEUED, job_queue
+from ..llm_cache import llm_cache_preference
+from ..pdf_extraction import PdfExtractionError, PdfExtractionTimeout, PdfWorkersUnavailable
 from ..services import career_service
 
 
-router = APIRouter(prefix="/api/career", tags=["career"])
+router = APIRouter(
+    prefix="/api/career",
+    tags=["career"],
+    dependencies=[Depends(enforce_rate_limit), Depends(llm_cache_preference)],
+)
+
+
+async def _sse_events(first: Optional[str], chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Wrap generated text chunks as Server-Sent Events."""
+    try:
+        if first is not None:
+            yield f"data: {json.dumps({'token': first})}\n\n"
+        async for chunk in chunks:
+            yield f"data: {json.dumps({'token': chunk})}\n\n"
+    except UpstreamError as e:
+        # Headers are already sent; report the failure in-band
+        yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+        return
+    yield "event: done\ndata: {}\n\n"
+
+
+async def _sse_response(chunks: AsyncIterator[str]) -> StreamingResponse:
+    # Wait for the first chunk so failures to start generating still become
+    # regular HTTP errors.
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = None
+
+    return StreamingResponse(
+        _sse_events(first, chunks),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _upstream_error(request: Request, exc: UpstreamError) -> JSONResponse:
+    headers = {}
+    if exc.retry_after is not None:
+        headers["Retry-After"] = str(max(1, round(exc.retry_after)))
+    return JSONResponse(status_code=exc.status_code, content={"detail": str(exc)}, headers=headers)
+
+
+async def _admission_rejected(request: Request, exc: AdmissionRejected) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+    )
+
+
+async def _pdf_extraction_error(request: Request, exc: PdfExtractionError) -> JSONResponse:
+    return JSONResponse(status_code=422, content={"detail": str(exc)})
+
+
+async def _pdf_extraction_timeout(request: Request, exc: PdfExtractionTimeout) -> JSONResponse:
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+
+async def _pdf_workers_unavailable(request: Request, exc: PdfWorkersUnavailable) -> JSONResponse:
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
+# Registered on the app in main.py; APIRouter cannot hold exception handlers
+exception_handlers = {
+    PdfExtractionError: _pdf_extraction_error,
+    PdfExtractionTimeout: _pdf_extraction_timeout,
+    PdfWorkersUnavailable: _pdf_workers_unavailable,
+    UpstreamError: _upstream_error,
+    AdmissionRejected: _admission_rejected,
+}
+
+
+def _stored_resume_text(resume_id: Optional[str]) -> str:
+    """Look up a resume previously sent to POST /resumes."""
+    if not resume_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Please upload a resume file or pass a resume_id.",
+        )
+
+    resume_text = career_service.get_resume_text(resume_id)
+    if resume_text is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Unknown or expired resume_id. Please upload the resume again.",
+        )
+    return resume_text
 
 
-@router.post("/cover-letter", response_model=CoverLetterResponse)
+async def canonical_job_description(request: Request, job_description: str = Form(...)) -> str:
+    """The `job_description` form field as the prompts should see it.
+
+    Resolved against known postings once per request, which also counts the
+    request for /job-descriptions/popular.
+    """
+    form = await request.form()
+    job_title = form.get("job_title")
+    return career_service.resolve_job_description(
+        job_description, job_title if isinstance(job_title, str) else ""
+    )
+
+
+# On the routes that call the model: fail fast when the client's deadline
+# cannot fit a generation, before the upload is extracted
+NeedsGeneration = [Depends(require_generation_time)]
+
+JobDescription = Depends(canonical_job_description)
+
+# `?async=1` on the JSON endpoints below returns a job id instead of waiting
+RunAsync = Query(False, alias="async", description="Queue the work and return a job id")
+
+
+async def _respond(run_async: bool, kind: str, work: Callable[[], Awaitable[Any]]) -> Any:
+    """Run ``work`` now, or queue it as a job and answer 202 straight away.
+
+    ``work`` must not touch the request: uploads are read before it is built.
+    """
+    if not run_async:
+        return await work()
+
+    async def job() -> Any:
+        return jsonable_encoder(await work())
+
+    job_id = job_queue.submit(kind, job)
+    status_url = f"/api/career/jobs/{job_id}"
+    accepted = JobAccepted(
+        job_id=job_id,
+        status=QUEUED,
+        status_url=status_url,
+        events_url=f"{status_url}/events",
+    )
+    return JSONResponse(
+        status_code=202,
+        content=accepted.model_dump(),
+        headers={"Location": status_url},
+    )
+
+
+@router.post("/resumes", response_model=ResumeUploadResponse)
+async def upload_resume(file: UploadFile = File(...)):
+    upload = await ingest_upload(file)
+
+    resume_id, resume_text = await career_service.load_resume(
+        upload.data, upload.content_type, resume_id=upload.sha256
+    )
+
+    return ResumeUploadResponse(resume_id=resume_id, characters=len(resume_text))
+
+
+@router.post("/cover-letter", response_model=CoverLetterResponse, dependencies=NeedsGeneration)
 async def generate_cover_letter(
-    resume: UploadFile = File(...),
+    resume: Optional[UploadFile] = File(None),
+    resume_id: Optional[str] = Form(None),
     job_title: str = Form(...),
     company_name: str = Form(...),
-    job_description: str = Form(...),
+    job_description: str = JobDescription,
     tone: str = Form("professional"),
+    run_async: bool = RunAsync,
 ):
-    allowed_types = ("application/pdf", "text/plain")
+    if resume is None:
+        resume_text = _stored_resume_text(resume_id)
 
-    if resume.content_type not in allowed_types:
-        raise HTTPException(
-            status_code=400,
-            detail="Unsupported resume file type. Please upload a PDF or plain text resume.",
+        async def work():
+            letter = await career_service.generate_cover_letter_from_text(
+                job_title=job_title,
+                company_name=company_name,
+                job_description=job_description,
+                tone=tone,
+                resume_text=resume_text,
+            )
+            return CoverLetterResponse(cover_letter=letter)
+
+        return await _respond(run_async, "cover-letter", work)
+
+    upload = await ingest_upload(resume)
+
+    async def work():
+        letter = await career_service.generate_cover_letter_from_file(
+            job_title=job_title,
+            company_name=company_name,
+            job_description=job_description,
+            tone=tone,
+            resume_bytes=upload.data,
+            resume_content_type=upload.content_type,
+            resume_id=upload.sha256,
+        )
+        return CoverLetterResponse(cover_letter=letter)
+
+    return await _respond(run_async, "cover-letter", work)
+
+
+@router.post("/cover-letter/stream", dependencies=NeedsGeneration)
+async def stream_cover_letter(
+    resume: Optional[UploadFile] = File(None),
+    resume_id: Optional[str] = Form(None),
+    job_title: str = Form(...),
+    company_name: str = Form(...),
+    job_description: str = JobDescription,
+    tone: str = Form("professional"),
+):
+    if resume is None:
+        chunks = career_service.stream_cover_letter_from_text(
+            job_title=job_title,
+            company_name=company_name,
+            job_description=job_description,
+            tone=tone,
+            resume_text=_stored_resume_text(resume_id),
         )
+        return await _sse_response(chunks)
+
+    upload = await ingest_upload(resume)
 
-    resume_bytes = await resume.read()
+    # Parse before the response starts so extraction errors become HTTP errors
+    _, resume_text = await career_service.load_resume(
+        upload.data, upload.content_type, resume_id=upload.sha256
+    )
 
-    letter = career_service.generate_cover_letter_from_file(
+    chunks = career_service.stream_cover_letter_from_text(
         job_title=job_title,
         company_name=company_name,
         job_description=job_description,
         tone=tone,
-        resume_bytes=resume_bytes,
-        resume_content_type=resume.content_type,
+        resume_text=resume_text,
     )
 
-    return CoverLetterResponse(cover_letter=letter)
+    return await _sse_response(chunks)
 
-@router.post("/rewrite-summary-upload")
+@router.post("/rewrite-summary-upload", dependencies=NeedsGeneration)
 async def rewrite_summary_upload(
-    file: UploadFile = File(...),
-    job_description: str = Form(...),
+    file: Optional[UploadFile] = File(None),
+    resume_id: Optional[str] = Form(None),
+    job_description: str = JobDescription,
+    run_async: bool = RunAsync,
 ):
-    if file.content_type not in ("application/pdf", "text/plain"):
-        raise HTTPException(
-            status_code=400,
-            detail="Unsupported file type. Please upload a PDF or plain text resume.",
+    if file is None:
+        resume_text = _stored_resume_text(resume_id)
+
+        async def work():
+            rewritten_summary = await career_service.rewrite_summary_from_text(
+                resume_text=resume_text,
+                job_description=job_description,
+            )
+            return {"rewritten_summary": rewritten_summary}
+
+        return await _respond(run_async, "rewrite-summary", work)
+
+    upload = await ingest_upload(file)
+
+    async def work():
+        rewritten_summary = await career_service.rewrite_summary_from_file(
+            file_bytes=upload.data,
+            content_type=upload.content_type,
+            job_description=job_description,
+            resume_id=upload.sha256,
         )
+        return {"rewritten_summary": rewritten_summary}
+
+    return await _respond(run_async, "rewrite-summary", work)
 
-    file_bytes = await file.read()
 
-    rewritten_summary = career_service.rewrite_summary_from_file(
-        file_bytes=file_bytes,
-        content_type=file.content_type,
+@router.post("/rewrite-summary-upload/stream", dependencies=NeedsGeneration)
+async def stream_rewrite_summary_upload(
+    file: Optional[UploadFile] = File(None),
+    resume_id: Optional[str] = Form(None),
+    job_description: str = JobDescription,
+):
+    if file is None:
+        chunks = career_service.stream_summary_from_text(
+            resume_text=_stored_resume_text(resume_id),
+            job_description=job_description,
+        )
+        return await _sse_response(chunks)
+
+    upload = await ingest_upload(file)
+
+    # Parse before the response starts so extraction errors become HTTP errors
+    _, resume_text = await career_service.load_resume(
+        upload.data, upload.content_type, resume_id=upload.sha256
+    )
+
+    chunks = career_service.stream_summary_from_text(
+        resume_text=resume_text,
         job_description=job_description,
     )
 
-    return {"rewritten_summary": rewritten_summary}
+    return await _sse_response(chunks)
 
 
-@router.post("/smart-resume-upload")
+@router.post("/smart-resume-upload", dependencies=NeedsGeneration)
 async def generate_smart_resume_upload(
-    file: UploadFile = File(...),
-    job_description: str = Form(...),
+    file: Optional[UploadFile] = File(None),
+    resume_id: Optional[str] = Form(None),
+    job_description: str = JobDescription,
+    run_async: bool = RunAsync,
+):
+    if file is None:
+        resume_text = _stored_resume_text(resume_id)
+
+        async def work():
+            suggestions = await career_service.improve_resume_from_text(
+                resume_text=resume_text,
+                job_description=job_description,
+            )
+            return {"suggestions": suggestions}
+
+        return await _respond(run_async, "smart-resume", work)
+
+    upload = await ingest_upload(file)
+
+    async def work():
+        suggestions = await career_service.improve_resume_from_file(
+            file_bytes=upload.data,
+            content_type=upload.content_type,
+            job_description=job_description,
+            resume_id=upload.sha256,
+        )
+        return {"suggestions": suggestions}
+
+    return await _respond(run_async, "smart-resume", work)
+
+
+@router.post("/keyword-gap", response_model=KeywordGapResponse)
+async def keyword_gap(
+    file: Optional[UploadFile] = File(None),
+    resume_id: Optional[str] = Form(None),
+    job_description: str = JobDescription,
 ):
-    if file.content_type not in ("application/pdf", "text/plain"):
+    """Fast, LLM-free match score and missing JD keywords."""
+    if file is None:
+        resume_text = _stored_resume_text(resume_id)
+    else:
+        upload = await ingest_upload(file)
+        _, resume_text = await career_service.load_resume(
+            upload.data, upload.content_type, resume_id=upload.sha256
+        )
+
+    report = career_service.keyword_gap(resume_text, job_description)
+
+    return KeywordGapResponse(**asdict(report))
+
+
+@router.post(
+    "/full-analysis", response_model=FullAnalysisResponse, dependencies=NeedsGeneration
+)
+async def full_analysis(
+    resume: Optional[UploadFile] = File(None),
+    resume_id: Optional[str] = Form(None),
+    job_title: str = Form(...),
+    company_name: str = Form(...),
+    job_description: str = JobDescription,
+    tone: str = Form("professional"),
+    combined: bool = Query(False, description="Generate all three parts in one model call"),
+    run_async: bool = RunAsync,
+):
+    """Suggestions, rewritten summary and cover letter from a single upload."""
+    upload = None
+    if resume is None:
+        resume_text = _stored_resume_text(resume_id)
+    else:
+        upload = await ingest_upload(resume)
+
+    async def work():
+        if upload is None:
+            text, stored_id = resume_text, resume_id
+        else:
+            stored_id, text = await career_service.load_resume(
+                upload.data, upload.content_type, resume_id=upload.sha256
+            )
+
+        analysis = await career_service.full_analysis_from_text(
+            resume_text=text,
+            job_title=job_title,
+            company_name=company_name,
+            job_description=job_description,
+            tone=tone,
+            combined=combined,
+        )
+        return FullAnalysisResponse(resume_id=stored_id, **analysis)
+
+    return await _respond(run_async, "full-analysis", work)
+
+
+@router.post("/cover-letters/batch", dependencies=NeedsGeneration)
+async def generate_cover_letters_batch(
+    resume: Optional[UploadFile] = File(None),
+    resume_id: Optional[str] = Form(None),
+    jobs: str = Form(..., description="JSON list of {job_title, company_name, job_description, tone}"),
+    run_async: bool = RunAsync,
+):
+    """One resume against many postings; streams one JSON line per finished letter.
+
+    As a job (``?async=1``) the result is ``{"results": [...]}`` in job order.
+    """
+    try:
+        parsed_jobs = TypeAdapter(List[BatchCoverLetterJob]).validate_json(jobs)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+
+    if not parsed_jobs:
+        raise HTTPException(status_code=400, detail="Please provide at least one job.")
+    if len(parsed_jobs) > settings.batch_max_jobs:
         raise HTTPException(
             status_code=400,
-            detail="Unsupported file type. Please upload a PDF or plain text resume.",
+            detail=f"Too many jobs. The limit is {settings.batch_max_jobs} per request.",
+        )
+    for job in parsed_jobs:
+        job.job_description = career_service.resolve_job_description(
+            job.job_description, job.job_title
         )
 
-    file_bytes = await file.read()
+    if resume is None:
+        resume_text = _stored_resume_text(resume_id)
+    else:
+        upload = await ingest_upload(resume)
+        _, resume_text = await career_service.load_resume(
+            upload.data, upload.content_type, resume_id=upload.sha256
+        )
 
-    suggestions = career_service.improve_resume_from_file(
-        file_bytes=file_bytes,
-        content_type=file.content_type,
-        job_description=job_description,
+    results = career_service.generate_cover_letters_batch(
+        resume_text=resume_text,
+        jobs=[job.model_dump() for job in parsed_jobs],
+        concurrency=settings.batch_concurrency,
     )
 
-    return {"suggestions": suggestions}
+    if run_async:
+        async def work():
+            collected = [BatchCoverLetterResult(**result) async for result in results]
+            return {"results": sorted(collected, key=lambda result: result.index)}
+
+        return await _respond(run_async, "cover-letters-batch", work)
+
+    async def ndjson_lines() -> AsyncIterator[str]:
+        async for result in results:
+            yield BatchCoverLetterResult(**result).model_dump_json() + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@router.get("/job-descriptions/popular", response_model=List[PopularJobPosting])
+async def popular_job_descriptions(limit: int = Query(10, ge=1, le=100)):
+    """The most requested postings in this process, near-duplicate variants counted together."""
+    return [
+        PopularJobPosting(
+            posting_id=posting.id,
+            job_title=posting.job_title,
+            requests=posting.requests,
+            variants=len(posting.variant_keys),
+            preview=posting.text[:160],
+        )
+        for posting in career_service.popular_job_postings(limit)
+    ]
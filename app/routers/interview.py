@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from ..admission import enforce_rate_limit
+from ..config import settings
+from ..deadlines import require_generation_time
+from ..llm_cache import llm_cache_preference
+from ..question_pool import question_pool
+from ..schemas import (
+    AnswerFeedbackResult,
+    InterviewFeedbackRequest,
+    InterviewFeedbackResponse,
+    InterviewQuestionRequest,
+    InterviewQuestionResponse,
+)
+from ..services import career_service
+
+
+router = APIRouter(
+    prefix="/api/interview",
+    tags=["interview"],
+    dependencies=[Depends(enforce_rate_limit), Depends(llm_cache_preference)],
+)
+
+
+@router.post("/questions", response_model=InterviewQuestionResponse)
+async def next_question(request: InterviewQuestionRequest):
+    """The next unasked question from the pool for this role, type and difficulty."""
+    question, from_pool = await question_pool.next_question(
+        request.role, request.interview_type, request.difficulty
+    )
+    return InterviewQuestionResponse(
+        question=question,
+        role=request.role,
+        interview_type=request.interview_type,
+        difficulty=request.difficulty,
+        from_pool=from_pool,
+    )
+
+
+@router.post(
+    "/feedback",
+    response_model=InterviewFeedbackResponse,
+    dependencies=[Depends(require_generation_time)],
+)
+async def interview_feedback(request: InterviewFeedbackRequest):
+    """Score, strengths, improvements and a sample answer for every answer of a session."""
+    if not request.answers:
+        raise HTTPException(status_code=400, detail="Please provide at least one answer.")
+    if len(request.answers) > settings.feedback_max_answers:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many answers. The limit is {settings.feedback_max_answers} per request.",
+        )
+
+    results = await career_service.evaluate_interview(
+        [(item.question, item.answer) for item in request.answers]
+    )
+    scores = [result["score"] for result in results if result["status"] == "ok"]
+    return InterviewFeedbackResponse(
+        results=[AnswerFeedbackResult(**result) for result in results],
+        average_score=round(sum(scores) / len(scores), 1) if scores else None,
+    )
@@ -0,0 +1,75 @@
+import json
+from dataclasses import asdict
+from typing import AsyncIterator
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from ..jobs import FINISHED, SUCCEEDED, Job, job_queue, job_store
+from ..schemas import JobStatusResponse
+
+# Not rate limited: clients are expected to poll
+router = APIRouter(prefix="/api/career/jobs", tags=["jobs"])
+
+POLL_SECONDS = 1.0
+HEARTBEAT_SECONDS = 15.0
+
+
+def _get_job(job_id: str) -> Job:
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job_id.")
+    return job
+
+
+def _status_response(job: Job) -> JobStatusResponse:
+    fields = asdict(job)
+    return JobStatusResponse(job_id=fields.pop("id"), **fields)
+
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str):
+    return _status_response(_get_job(job_id))
+
+
+@router.get("/{job_id}/events")
+async def job_events(job_id: str):
+    """Server-Sent Events: a `status` event per change, then `result` or `error`."""
+    job = _get_job(job_id)
+
+    async def events(job: Job) -> AsyncIterator[str]:
+        last_status = None
+        idle = 0.0
+        while True:
+            if job.status != last_status:
+                last_status = job.status
+                idle = 0.0
+                yield f"event: status\ndata: {json.dumps({'status': job.status})}\n\n"
+
+            if job.status in FINISHED:
+                body = _status_response(job)
+                if job.status == SUCCEEDED:
+                    yield f"event: result\ndata: {json.dumps(body.result)}\n\n"
+                else:
+                    detail = {"detail": body.error, "status_code": body.status_code}
+                    yield f"event: error\ndata: {json.dumps(detail)}\n\n"
+                yield "event: done\ndata: {}\n\n"
+                return
+
+            await job_queue.wait_for_update(job_id, POLL_SECONDS)
+            idle += POLL_SECONDS
+            if idle >= HEARTBEAT_SECONDS:
+                # Keeps proxies from closing an idle connection
+                idle = 0.0
+                yield ": keep-alive\n\n"
+
+            job = job_store.get(job_id)
+            if job is None:
+                yield f"event: error\ndata: {json.dumps({'detail': 'The job expired.'})}\n\n"
+                return
+
+    return StreamingResponse(
+        events(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,100 @@
+import hashlib
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+
+from ..admission import enforce_rate_limit
+from ..ingestion import ingest_upload
+from ..matching import matching_engine
+from ..schemas import IndexedDocument, MatchJobPosting, MatchResponse, MatchResult
+from ..services import career_service
+
+
+router = APIRouter(
+    prefix="/api/matching",
+    tags=["matching"],
+    dependencies=[Depends(enforce_rate_limit)],
+)
+
+MAX_TOP_K = 500
+
+
+@router.post("/resumes", response_model=IndexedDocument)
+async def index_resume(
+    file: Optional[UploadFile] = File(None),
+    resume_id: Optional[str] = Form(None),
+):
+    """Add an uploaded resume (or one sent earlier to /api/career/resumes)."""
+    if file is not None:
+        upload = await ingest_upload(file)
+        resume_id, resume_text = await career_service.load_resume(
+            upload.data, upload.content_type, resume_id=upload.sha256
+        )
+    else:
+        resume_text = career_service.get_resume_text(resume_id) if resume_id else None
+        if resume_text is None:
+            raise HTTPException(
+                status_code=400 if not resume_id else 404,
+                detail="Please upload a resume file or pass a known resume_id.",
+            )
+
+    matching_engine.resumes.add(resume_id, resume_text)
+    return IndexedDocument(id=resume_id, indexed=len(matching_engine.resumes))
+
+
+@router.delete("/resumes/{resume_id}", status_code=204)
+async def remove_resume(resume_id: str):
+    if not matching_engine.resumes.remove(resume_id):
+        raise HTTPException(status_code=404, detail="Resume is not indexed.")
+
+
+@router.post("/jobs", response_model=List[IndexedDocument])
+async def index_jobs(jobs: List[MatchJobPosting]):
+    indexed = []
+    for job in jobs:
+        job_id = job.job_id or hashlib.sha256(job.job_description.encode("utf-8")).hexdigest()
+        matching_engine.jobs.add(
+            job_id,
+            f"{job.job_title}\n{job.job_description}",
+            meta={"job_title": job.job_title},
+        )
+        indexed.append(job_id)
+
+    return [IndexedDocument(id=job_id, indexed=len(matching_engine.jobs)) for job_id in indexed]
+
+
+@router.delete("/jobs/{job_id}", status_code=204)
+async def remove_job(job_id: str):
+    if not matching_engine.jobs.remove(job_id):
+        raise HTTPException(status_code=404, detail="Job is not indexed.")
+
+
+@router.get("/jobs/{job_id}/resumes", response_model=MatchResponse)
+async def top_resumes_for_job(job_id: str, k: int = Query(10, ge=1, le=MAX_TOP_K)):
+    matches = matching_engine.rank_resumes_for_job(job_id, k)
+    if matches is None:
+        raise HTTPException(status_code=404, detail="Job is not indexed.")
+
+    return MatchResponse(
+        query_id=job_id,
+        matches=[MatchResult(id=resume_id, score=score) for resume_id, score in matches],
+    )
+
+
+@router.get("/resumes/{resume_id}/jobs", response_model=MatchResponse)
+async def top_jobs_for_resume(resume_id: str, k: int = Query(10, ge=1, le=MAX_TOP_K)):
+    matches = matching_engine.rank_jobs_for_resume(resume_id, k)
+    if matches is None:
+        raise HTTPException(status_code=404, detail="Resume is not indexed.")
+
+    return MatchResponse(
+        query_id=resume_id,
+        matches=[
+            MatchResult(
+                id=job_id,
+                score=score,
+                job_title=matching_engine.jobs.meta_for(job_id).get("job_title"),
+            )
+            for job_id, score in matches
+        ],
+    )
@@ -1,6 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
-from typing import List
+from typing import Any, Dict, List, Literal, Optional
 
 class CoverLetterRequest(BaseModel):
     job_title: str
@@ -19,3 +18,108 @@ class SmartResumeRequest(BaseModel):
 class SmartResumeResponse(BaseModel):
     improved_resume: str      # rewritten / tailored version
     suggestions: List[str]    # bullet suggestions for improvement
+
+class ResumeUploadResponse(BaseModel):
+    resume_id: str            # SHA-256 of the uploaded file
+    characters: int           # length of the extracted, normalized text
+
+class FullAnalysisResponse(BaseModel):
+    resume_id: str
+    suggestions: Optional[List[str]] = None
+    rewritten_summary: Optional[str] = None
+    cover_letter: Optional[str] = None
+    errors: Dict[str, str] = Field(default_factory=dict)  # part name -> error message
+
+class BatchCoverLetterJob(BaseModel):
+    job_title: str
+    company_name: str
+    job_description: str
+    tone: str = "professional"
+
+class BatchCoverLetterResult(BaseModel):
+    index: int                # position of the job in the request
+    job_title: str
+    company_name: str
+    status: str               # "ok" or "error"
+    cover_letter: Optional[str] = None
+    error: Optional[str] = None
+
+class KeywordGapResponse(BaseModel):
+    match_score: float              # 0-100
+    matched_keywords: List[str]
+    missing_keywords: List[str]
+    suggestions: List[str]
+
+class PopularJobPosting(BaseModel):
+    posting_id: str
+    job_title: str            # first title sent with it, if any
+    requests: int
+    variants: int             # distinct texts seen for this posting
+    preview: str              # start of the normalized posting text
+
+class MatchJobPosting(BaseModel):
+    job_id: Optional[str] = None    # defaults to a hash of the description
+    job_title: str = ""
+    job_description: str
+
+class IndexedDocument(BaseModel):
+    id: str
+    indexed: int              # documents now in the index
+
+class MatchResult(BaseModel):
+    id: str
+    score: float              # cosine similarity of TF-IDF vectors, 0-1
+    job_title: Optional[str] = None
+
+class MatchResponse(BaseModel):
+    query_id: str
+    matches: List[MatchResult]
+
+class JobAccepted(BaseModel):
+    job_id: str
+    status: str               # "queued"
+    status_url: str           # poll this for the result
+    events_url: str           # or subscribe here (Server-Sent Events)
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    kind: str                 # endpoint that was called, e.g. "cover-letter"
+    status: str               # queued, running, succeeded or failed
+    result: Optional[Any] = None      # the endpoint's normal response body
+    error: Optional[str] = None
+    status_code: Optional[int] = None # what the synchronous call would have returned
+    created_at: float
+    updated_at: float
+
+class InterviewQuestionRequest(BaseModel):
+    role: str = Field(..., min_length=1, max_length=100)   # e.g. "Backend Engineer"
+    interview_type: Literal["technical", "behavioral", "system design"] = "technical"
+    difficulty: Literal["easy", "medium", "hard"] = "medium"
+
+class InterviewQuestionResponse(BaseModel):
+    question: str
+    role: str
+    interview_type: str
+    difficulty: str
+    from_pool: bool           # false when the pool was empty and this request waited for it
+
+class InterviewAnswer(BaseModel):
+    question: str = Field(..., min_length=1, max_length=2000)
+    answer: str = Field(..., max_length=8000)
+
+class InterviewFeedbackRequest(BaseModel):
+    answers: List[InterviewAnswer]
+
+class AnswerFeedbackResult(BaseModel):
+    index: int                # position of the answer in the request
+    question: str
+    status: str               # "ok" or "error"
+    score: Optional[float] = None     # 0-10
+    strengths: List[str] = Field(default_factory=list)
+    improvements: List[str] = Field(default_factory=list)
+    suggested_answer: Optional[str] = None
+    error: Optional[str] = None
+
+class InterviewFeedbackResponse(BaseModel):
+    results: List[AnswerFeedbackResult]
+    average_score: Optional[float] = None     # over the answers that were scored
@@ -1,87 +1,331 @@
-import uuid
+import asyncio
+import json
 import logging
-from typing import List, Tuple
-from io import BytesIO
-
-import requests  
-from pypdf import PdfReader
-from huggingface_hub import InferenceClient
+import re
+from dataclasses import asdict, dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
+from .admission import AdmissionRejected, llm_admission
+from .ats import KeywordGapReport, analyze_keyword_gap, keyword_suggestions
 from .config import settings
+from .deadlines import cap_profile, deadline_exceeded, remaining, timeout_for
+# hf_text_client is re-exported for tests that fake the Hugging Face API
+from .llm_backends import hf_text_client, llm_backend  # noqa: F401
+from .jd_dedup import JobPosting, jd_index
+from .llm_cache import llm_cache, make_cache_key
+from .metrics import LLM_EARLY_STOPS, LLM_FALLBACKS, record_tokens, stage
+from .prompt_builder import fit_context
+from .pdf_extraction import extract_pdf_text
+from .resilience import (
+    CircuitBreaker,
+    UpstreamError,
+    UpstreamUnavailable,
+    as_upstream_error,
+    backoff_delay,
+)
+from .resume_store import normalize_resume_text, resume_id_for, resume_store
+from .singleflight import SingleFlight
+from .task_profiles import FEEDBACK_BATCH, QUESTION_BATCH, TaskProfile, profile_for
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
-# Global Hugging Face text client – token only, model passed per call
-hf_text_client = InferenceClient(
-    token=settings.hf_api_key,
-)
+T = TypeVar("T")
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
-    """Extract text from a PDF file given its bytes."""
-    reader = PdfReader(BytesIO(file_bytes))
-    text = ""
-    for page in reader.pages:
-        page_text = page.extract_text() or ""
-        text += page_text + "\n"
+# One breaker per model id, so a fallback model stays usable while the
+# primary is failing
+circuit_breakers: Dict[str, CircuitBreaker] = {}
 
-    logger.info("Extracted resume text length: %d characters", len(text))
-    # Optional: log a small preview
-    logger.info("Resume preview: %s", text[:300].replace("\n", " ") if text else "EMPTY")
+# Coalesces concurrent _call_model calls for the same cache key
+llm_in_flight = SingleFlight()
 
-    return text
 
+async def extract_resume_text(file_bytes: bytes, content_type: str) -> str:
+    """Return the resume text without blocking the event loop on PDF parsing."""
+    with stage("extract"):
+        if content_type == "application/pdf":
+            return await extract_pdf_text(file_bytes)
+        return file_bytes.decode("utf-8", errors="ignore")
+
+
+def parse_suggestions(raw_output: str) -> List[str]:
+    """The "- " bullet lines after the SUGGESTIONS: label, at most four."""
+    parser = profile_for("improve_resume").parser()
+    parser.feed(raw_output)
+    parser.close()
+    return parser.items
+
+
+def parse_questions(raw_output: str) -> List[str]:
+    """The "- " question lines after the QUESTIONS: label."""
+    parser = profile_for("interview_questions").parser()
+    parser.feed(raw_output)
+    parser.close()
+    return [question for question in parser.items if question]
+
+
+def parse_summary(raw_output: str) -> str:
+    """The summary text without its label or any commentary after it."""
+    parser = profile_for("rewrite_summary").parser()
+    parser.feed(raw_output)
+    parser.close()
+    summary = parser.text().strip()
+
+    if summary.upper().startswith("SUMMARY:"):
+        summary = summary[len("SUMMARY:") :].strip()
+
+    return summary
 
-class HuggingFaceClient:
-    """Adapter for Hugging Face Inference API."""
 
-    def __init__(self, api_key: str):
-        self.api_key = api_key
+def context_prefix(task: str, resume_text: str, job_description: str) -> str:
+    """The inputs every task prompt starts with, ahead of its instructions.
+
+    Byte-identical across tasks for the same resume and JD (see
+    `fit_context`), so an inference server's prefix cache can reuse it.
+    Routes pass the JD through `CareerService.resolve_job_description`
+    first, so variants of a known posting share cached results too.
+    """
+    resume_text, job_description = fit_context(task, resume_text, job_description)
+    return f"""============================
+📄 INPUTS
+============================
+JOB DESCRIPTION:
+{job_description}
+
+RESUME:
+{resume_text}
+"""
+
+
+# Section markers of the combined full-analysis output, in order
+COMBINED_SECTIONS = {
+    "suggestions": "<<<SUGGESTIONS>>>",
+    "rewritten_summary": "<<<SUMMARY>>>",
+    "cover_letter": "<<<COVER_LETTER>>>",
+}
+COMBINED_END = "<<<END>>>"
+
+_COMBINED_MARKER = re.compile(
+    "|".join(re.escape(marker) for marker in (*COMBINED_SECTIONS.values(), COMBINED_END))
+)
 
-    def generate_question(self, role: str, interview_type: str, difficulty: str) -> str:
+
+def parse_combined(raw_output: str) -> Dict[str, Any]:
+    """Split combined output into the full-analysis fields.
+
+    Sections that are missing or empty are left out, so the caller can
+    generate them separately.
+    """
+    names = {marker: name for name, marker in COMBINED_SECTIONS.items()}
+    bodies: Dict[str, str] = {}
+    matches = list(_COMBINED_MARKER.finditer(raw_output))
+    for match, following in zip(matches, matches[1:] + [None]):
+        name = names.get(match.group())
+        if name is None:  # the end marker
+            break
+        end = following.start() if following is not None else len(raw_output)
+        bodies.setdefault(name, raw_output[match.end() : end].strip())
+
+    parts: Dict[str, Any] = {}
+    if bodies.get("suggestions"):
+        suggestions = parse_suggestions(bodies["suggestions"])
+        if suggestions:
+            parts["suggestions"] = suggestions
+    if bodies.get("rewritten_summary"):
+        parts["rewritten_summary"] = parse_summary(bodies["rewritten_summary"])
+    if bodies.get("cover_letter"):
+        parts["cover_letter"] = bodies["cover_letter"]
+    return parts
+
+
+@dataclass
+class AnswerFeedback:
+    score: float              # 0-10
+    strengths: List[str]
+    improvements: List[str]
+    suggested_answer: str
+
+
+# Opens each answer's section of the interview feedback output
+_FEEDBACK_MARKER = re.compile(r"<<<ANSWER (\d+)>>>")
+FEEDBACK_END = "<<<DONE>>>"
+_FEEDBACK_LISTS = ("STRENGTHS", "IMPROVEMENTS")
+
+
+def _parse_feedback_section(body: str) -> Optional[AnswerFeedback]:
+    score = None
+    lists: Dict[str, List[str]] = {name: [] for name in _FEEDBACK_LISTS}
+    sample: List[str] = []
+    section = None
+    for line in body.splitlines():
+        line = line.strip()
+        label, _, rest = line.partition(":")
+        label = label.strip().upper()
+        if label == "SCORE":
+            number = re.search(r"\d+(?:\.\d+)?", rest)
+            # An out-of-range score is a misread, so the answer is retried
+            if number and float(number.group()) <= 10.0:
+                score = float(number.group())
+            section = None
+        elif label in lists:
+            section = label
+        elif label == "SAMPLE ANSWER":
+            section = "SAMPLE"
+            if rest.strip():
+                sample.append(rest.strip())
+        elif section in lists and line.startswith("-"):
+            lists[section].append(line[1:].strip())
+        elif section == "SAMPLE" and line:
+            sample.append(line)
+
+    if score is None:
+        return None
+    return AnswerFeedback(
+        score=score,
+        strengths=lists["STRENGTHS"][:3],
+        improvements=lists["IMPROVEMENTS"][:3],
+        suggested_answer=" ".join(sample),
+    )
+
+
+def parse_feedback(raw_output: str) -> Dict[int, AnswerFeedback]:
+    """Feedback by the 1-based answer number of its ``<<<ANSWER n>>>`` section.
+
+    Sections without a score are left out, so the caller can retry them.
+    """
+    raw_output = raw_output.split(FEEDBACK_END, 1)[0]
+    matches = list(_FEEDBACK_MARKER.finditer(raw_output))
+    feedback: Dict[int, AnswerFeedback] = {}
+    for match, following in zip(matches, matches[1:] + [None]):
+        end = following.start() if following is not None else len(raw_output)
+        parsed = _parse_feedback_section(raw_output[match.end() : end])
+        if parsed is not None:
+            feedback.setdefault(int(match.group(1)), parsed)
+    return feedback
+
+
+def feedback_cache_key(question: str, answer: str) -> str:
+    """Cache key of the parsed feedback on one answer, independent of its batch."""
+    return make_cache_key(
+        settings.hf_model_id, json.dumps([question, answer]), {"task": "interview_feedback"}
+    )
+
+
+class HuggingFaceClient:
+    """Prompts and model calls for each task, sent through `llm_backend`."""
+
+    async def generate_question(self, role: str, interview_type: str, difficulty: str) -> str:
         prompt = (
             f"You are an interviewer for a {role} role. "
             f"Generate ONE {interview_type} interview question at {difficulty} difficulty. "
             "Return only the question text."
         )
-        return self._call_model(prompt)
+        return await self._call_model(prompt, task="interview_question")
 
-    def generate_feedback(self, question: str, answer: str) -> Tuple[float, List[str], List[str], str]:
+    async def generate_questions(
+        self,
+        role: str,
+        interview_type: str,
+        difficulty: str,
+        avoid: Sequence[str] = (),
+    ) -> List[str]:
+        """Up to `QUESTION_BATCH` new questions, none of them in ``avoid``."""
+        prompt = (
+            f"You are an interviewer for a {role} role. "
+            f"Generate {QUESTION_BATCH} different {interview_type} interview questions "
+            f"at {difficulty} difficulty.\n"
+        )
+        if avoid:
+            prompt += "Do not repeat or rephrase any of these questions:\n"
+            prompt += "".join(f"- {question}\n" for question in avoid)
+        prompt += (
+            "\nReturn only the label QUESTIONS: followed by one question per line, "
+            "each starting with \"- \"."
+        )
+        return parse_questions(await self._call_model(prompt, task="interview_questions"))
+
+    async def generate_feedback(
+        self, question: str, answer: str
+    ) -> Tuple[float, List[str], List[str], str]:
+        feedback = (await self.evaluate_answers([(question, answer)])).get(0)
+        if feedback is None:
+            raise UpstreamError("Could not parse the model's feedback.")
+        return feedback.score, feedback.strengths, feedback.improvements, feedback.suggested_answer
+
+    async def evaluate_answers(
+        self, answers: Sequence[Tuple[str, str]]
+    ) -> Dict[int, AnswerFeedback]:
+        """Feedback on several (question, answer) pairs from one generation.
+
+        Keyed by position in ``answers``; answers whose feedback could not
+        be parsed are missing. Output is only cached when every answer's
+        feedback parses, so asking again for the missing ones reaches the
+        model instead of the same garbled output.
+        """
+
+        def complete(raw_output: str) -> bool:
+            return set(parse_feedback(raw_output)) >= set(range(1, len(answers) + 1))
+
+        raw_output = await self._call_model(
+            self._feedback_prompt(answers), task="interview_feedback", cacheable=complete
+        )
+        return {
+            number - 1: feedback
+            for number, feedback in parse_feedback(raw_output).items()
+            if 0 < number <= len(answers)
+        }
+
+    @staticmethod
+    @stage("prompt")
+    def _feedback_prompt(answers: Sequence[Tuple[str, str]]) -> str:
         prompt = (
             "You are an expert interview coach. "
-            "Given the interview question and candidate answer, "
-            "evaluate on a scale of 0-10 and provide:\n"
-            "1) score (just a number)\n"
-            "2) 3 strengths as bullet points\n"
-            "3) 3 improvements as bullet points\n"
-            "4) an improved sample answer.\n\n"
-            f"Question: {question}\n"
-            f"Answer: {answer}\n"
+            f"Evaluate each of the {len(answers)} candidate answers below.\n\n"
         )
-        raw = self._call_model(prompt)
-
-        score = 7.0
-        strengths = ["Good structure", "Relevant examples", "Clear communication"]
-        improvements = ["Add more measurable outcomes", "Use STAR format", "Be more concise"]
-        suggested = raw[:800]
+        for number, (question, answer) in enumerate(answers, start=1):
+            prompt += f"### Answer {number}\nQuestion: {question}\nAnswer: {answer}\n\n"
+        prompt += f"""For every answer, in order, output exactly this and nothing else:
+<<<ANSWER n>>>
+SCORE: <a number from 0 to 10>
+STRENGTHS:
+- <up to 3 bullet points>
+IMPROVEMENTS:
+- <up to 3 bullet points>
+SAMPLE ANSWER: <an improved answer in at most 80 words>
+
+where n is the answer number. After the last answer output {FEEDBACK_END}
+"""
+        return prompt
 
-        return score, strengths, improvements, suggested
-    
-    def generate_cover_letter(
-        self,
+    @staticmethod
+    @stage("prompt")
+    def _cover_letter_prompt(
         job_title: str,
         company_name: str,
         job_description: str,
         resume_text: str,
         tone: str,
     ) -> str:
-        prompt = f"""
+        prompt = context_prefix("cover_letter", resume_text, job_description) + f"""
 You are an expert cover letter writer for software engineering internships and new grad roles.
 
 Your task is to write a personalized, truthful cover letter based ONLY on:
 1) The candidate's resume
 2) The target job description
-3) The provided job title and company name
+3) The job title and company name below
+
+JOB TITLE: {job_title}
+COMPANY NAME: {company_name}
 
 ============================
 ⚠️ STRICT RULES — FOLLOW EXACTLY
@@ -95,27 +339,104 @@ Your task is to write a personalized, truthful cover letter based ONLY on:
 7. Tone: {tone} (professional, confident, concise).
 
 ============================
-📄 INPUTS
+📤 OUTPUT FORMAT
 ============================
+Return ONLY the cover letter text as plain text.
+No markdown headings, no bullet points, no extra labels.
+"""
+        return prompt
+
+    @staticmethod
+    @stage("prompt")
+    def _combined_prompt(
+        job_title: str,
+        company_name: str,
+        job_description: str,
+        resume_text: str,
+        tone: str,
+    ) -> str:
+        prompt = context_prefix("cover_letter", resume_text, job_description) + f"""
+You are an expert technical resume reviewer, resume writer and cover letter writer.
+
+Produce THREE outputs for this candidate and job in one response:
+1) 3–4 short, actionable, one-sentence suggestions to improve the resume
+   (ATS optimization, quantification, clarity, technical alignment).
+2) A rewritten SUMMARY section, 2–3 lines maximum.
+3) A cover letter for the role below: first person singular ("I"),
+   3–5 short paragraphs, tone: {tone} (professional, confident, concise).
+
 JOB TITLE: {job_title}
 COMPANY NAME: {company_name}
 
-JOB DESCRIPTION:
-{job_description}
-
-RESUME:
-{resume_text}
+============================
+⚠️ STRICT RULES — FOLLOW EXACTLY
+============================
+1. DO NOT invent or assume experiences, projects, companies, or technologies that are not present in the resume.
+2. Use ONLY information that already exists in the resume.
+3. Use the given job title and company name explicitly in the cover letter.
+4. No markdown, no commentary outside the sections below.
 
 ============================
-📤 OUTPUT FORMAT
+📤 OUTPUT FORMAT (VERY IMPORTANT)
 ============================
-Return ONLY the cover letter text as plain text.
-No markdown headings, no bullet points, no extra labels.
+
+Return EXACTLY this structure, with each marker on its own line:
+
+{COMBINED_SECTIONS["suggestions"]}
+- <suggestion 1>
+- <suggestion 2>
+- <suggestion 3>
+- <suggestion 4>
+{COMBINED_SECTIONS["rewritten_summary"]}
+<rewritten 2–3 line summary>
+{COMBINED_SECTIONS["cover_letter"]}
+<cover letter as plain text>
+{COMBINED_END}
 """
-        return self._call_model(prompt)
+        return prompt
 
-    def improve_resume(self, resume_text: str, job_description: str) -> str:
-        prompt = f"""
+    async def full_analysis(
+        self,
+        job_title: str,
+        company_name: str,
+        job_description: str,
+        resume_text: str,
+        tone: str,
+    ) -> str:
+        """Suggestions, summary and cover letter from one generation; see `parse_combined`."""
+        prompt = self._combined_prompt(job_title, company_name, job_description, resume_text, tone)
+        return await self._call_model(prompt, task="full_analysis")
+
+    async def generate_cover_letter(
+        self,
+        job_title: str,
+        company_name: str,
+        job_description: str,
+        resume_text: str,
+        tone: str,
+    ) -> str:
+        prompt = self._cover_letter_prompt(
+            job_title, company_name, job_description, resume_text, tone
+        )
+        return await self._call_model(prompt, task="cover_letter")
+
+    def stream_cover_letter(
+        self,
+        job_title: str,
+        company_name: str,
+        job_description: str,
+        resume_text: str,
+        tone: str,
+    ) -> AsyncIterator[str]:
+        prompt = self._cover_letter_prompt(
+            job_title, company_name, job_description, resume_text, tone
+        )
+        return self._stream_model(prompt, task="cover_letter")
+
+    @staticmethod
+    @stage("prompt")
+    def _improve_resume_prompt(resume_text: str, job_description: str) -> str:
+        prompt = context_prefix("improve_resume", resume_text, job_description) + """
 You are an expert technical resume reviewer.
 
 Your job is to evaluate the candidate's resume in the context of the job description
@@ -132,15 +453,6 @@ and provide ONLY 3–4 short, actionable suggestions to improve the resume.
 6. Each suggestion must be one sentence.
 7. Focus on ATS optimization, quantification, clarity, and technical alignment.
 
-============================
-📄 INPUTS
-============================
-JOB DESCRIPTION:
-{job_description}
-
-RESUME:
-{resume_text}
-
 ============================
 📤 OUTPUT FORMAT (VERY IMPORTANT)
 ============================
@@ -155,62 +467,253 @@ SUGGESTIONS:
 
 If fewer suggestions apply, return 2–3. No extra text.
 """
-        return self._call_model(prompt)
+        return prompt
 
-    def _call_model(self, prompt: str) -> str:
-        if not self.api_key:
-            logger.error("Hugging Face API key is not configured.")
-            return "Hugging Face API key not configured."
+    async def improve_resume(self, resume_text: str, job_description: str) -> str:
+        return await self._call_model(
+            self._improve_resume_prompt(resume_text, job_description), task="improve_resume"
+        )
 
-        try:
-            text = hf_text_client.text_generation(
-                prompt,
-                model=settings.hf_model_id,
-                max_new_tokens=700,
-            )
-            logger.info("HF text_generation returned %d characters", len(text))
+    @staticmethod
+    def _cache_key(prompt: str, profile: TaskProfile = profile_for(None)) -> str:
+        params = {"max_new_tokens": profile.max_new_tokens}
+        if profile.stop:
+            params["stop"] = list(profile.stop)
+        if profile.parser is not None:
+            params["parsed"] = True
+        return make_cache_key(settings.hf_model_id, prompt, params)
+
+    def _check_configured(self) -> None:
+        problem = llm_backend.missing_configuration()
+        if problem:
+            logger.error(problem)
+            raise UpstreamUnavailable(problem)
+
+    async def _call_model(
+        self,
+        prompt: str,
+        task: Optional[str] = None,
+        cacheable: Optional[Callable[[str], bool]] = None,
+    ) -> str:
+        """Generate text for ``prompt`` under the task's generation profile.
+
+        The output is cached unless ``cacheable`` is given and rejects it.
+        """
+        self._check_configured()
+
+        profile = profile_for(task)
+        cache_key = self._cache_key(prompt, profile)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            logger.info("LLM cache hit (%d characters)", len(cached))
+            return cached
+
+        # Not a cache hit, so generate no more than the deadline leaves time for
+        capped = cap_profile(profile)
+        if capped is not profile:
+            profile = capped
+            cache_key = self._cache_key(prompt, profile)
+
+        async def generate_and_cache() -> str:
+            async with llm_admission.slot():
+                model, text = await self._with_fallbacks(
+                    lambda prompt, model: self._generate(prompt, model, profile, task), prompt
+                )
+            record_tokens(prompt, text)
+            if model == settings.hf_model_id and (cacheable is None or cacheable(text)):
+                llm_cache.set(cache_key, text)
             return text
 
-        except ValueError as e:
-            msg = str(e)
-            logger.warning("text_generation not supported for this model: %s", msg)
-            if "conversational" not in msg.lower():
-                raise
+        # Identical prompts already being generated share that generation
+        with stage("llm"):
+            return await llm_in_flight.do(cache_key, generate_and_cache)
 
+    async def _with_fallbacks(
+        self,
+        call: Callable[[str, str], Awaitable[T]],
+        prompt: str,
+    ) -> Tuple[str, T]:
+        """Run ``call(prompt, model)`` with timeout, retries and model fallback.
+
+        Models are tried in order: `hf_model_id`, then `hf_fallback_model_ids`.
+        Each model gets up to `llm_max_retries` retries on retryable errors,
+        with jittered exponential backoff that honours Retry-After; a
+        Retry-After longer than `llm_retry_max_delay` ends the retries. A model
+        whose circuit breaker is open is skipped. Returns ``(model, result)``
+        or raises the last UpstreamError.
+
+        Under a client deadline each attempt gets only the time left, and
+        DeadlineExceeded is raised instead of retrying once it runs out.
+        """
+        last_error: UpstreamError = UpstreamUnavailable("No language model is available.")
+
+        for model in [settings.hf_model_id, *settings.hf_fallback_model_ids]:
+            breaker = circuit_breakers.setdefault(
+                model,
+                CircuitBreaker(settings.circuit_failure_threshold, settings.circuit_reset_seconds),
+            )
+
+            for attempt in range(settings.llm_max_retries + 1):
+                timeout, deadline_limited = timeout_for(settings.llm_timeout_seconds)
+                if not breaker.allow():
+                    last_error = UpstreamUnavailable(
+                        "The language model is temporarily unavailable.",
+                        retry_after=breaker.retry_after(),
+                    )
+                    break
+
+                try:
+                    result = await asyncio.wait_for(call(prompt, model), timeout=timeout)
+                except asyncio.CancelledError:
+                    breaker.release()
+                    raise
+                except Exception as e:
+                    if deadline_limited and isinstance(e, asyncio.TimeoutError):
+                        # The client's deadline ran out, not the model's timeout
+                        breaker.release()
+                        raise deadline_exceeded(
+                            "llm", "The request deadline passed while waiting for the language model."
+                        ) from None
+                    last_error = as_upstream_error(e)
+                    if last_error.retryable:
+                        breaker.record_failure()
+                    else:
+                        # The upstream answered; the request itself was bad
+                        breaker.record_success()
+                    logger.warning(
+                        "Model %s attempt %d failed: %r", model, attempt + 1, e
+                    )
+                    if not last_error.retryable or attempt == settings.llm_max_retries:
+                        break
+                    delay = backoff_delay(
+                        attempt,
+                        settings.llm_retry_base_delay,
+                        settings.llm_retry_max_delay,
+                        last_error.retry_after,
+                    )
+                    left = remaining()
+                    if delay is None or (left is not None and delay >= left):
+                        # Fail fast; last_error carries any Retry-After to the client
+                        break
+                    await asyncio.sleep(delay)
+                    continue
+
+                breaker.record_success()
+                if model != settings.hf_model_id:
+                    LLM_FALLBACKS.labels("model").inc()
+                return model, result
+
+            logger.warning("Giving up on model %s: %s", model, last_error)
+
+        raise last_error
+
+    async def _generate(
+        self,
+        prompt: str,
+        model: str,
+        profile: TaskProfile,
+        task: Optional[str] = None,
+    ) -> str:
+        if profile.parser is not None:
+            # Stream even though the caller wants the whole text, so we can
+            # hang up as soon as the output is structurally complete
+            parser = profile.parser()
+            tokens = await self._open_stream(prompt, model, profile)
             try:
-                # Conversational-style call (chat completion)
-                resp = hf_text_client.chat_completion(
-                    model=settings.hf_model_id,
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=700,
+                async for chunk in tokens:
+                    if parser.feed(chunk):
+                        LLM_EARLY_STOPS.labels(task or "default").inc()
+                        break
+            finally:
+                await tokens.aclose()
+            return parser.text()
+
+        return await llm_backend.generate(prompt, model, profile)
+
+    async def _stream_model(self, prompt: str, task: Optional[str] = None) -> AsyncIterator[str]:
+        """Yield generated text as the model produces it.
+
+        Opening the stream gets the same timeout, retry and model fallback
+        as `_call_model`; text_generation is tried first, chat_completion
+        for conversational-only models. Errors after the first token are
+        raised as UpstreamError. For tasks with an output parser the stream
+        ends, and the upstream call is closed, once the output is complete.
+        """
+        self._check_configured()
+
+        profile = profile_for(task)
+        parser = profile.parser() if profile.parser is not None else None
+        cache_key = self._cache_key(prompt, profile)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            logger.info("LLM cache hit (%d characters)", len(cached))
+            yield cached
+            return
+
+        capped = cap_profile(profile)
+        if capped is not profile:
+            profile = capped
+            cache_key = self._cache_key(prompt, profile)
+
+        async with llm_admission.slot():
+            # Time to first token; the rest is paced by the client
+            with stage("llm"):
+                model, tokens = await self._with_fallbacks(
+                    lambda prompt, model: self._open_stream(prompt, model, profile), prompt
                 )
-                if isinstance(resp, dict):
-                    choices = resp.get("choices", [])
-                    if choices:
-                        content = choices[0].get("message", {}).get("content")
-                        if content:
-                            logger.info(
-                                "HF chat_completion returned %d characters",
-                                len(content),
-                            )
-                            return content
-
-                logger.warning("Unexpected chat_completion response format: %s", resp)
-                return str(resp)
-
-            except Exception as ee:
-                logger.exception(
-                    "HF chat_completion also failed for conversational model"
-                )
-                return "Sorry, I could not generate a response at this time."
-
-        except Exception:
-            logger.exception("Unexpected Hugging Face API error via InferenceClient")
-            return "Sorry, I could not generate a response at this time."
-        
 
-    def rewrite_summary(self, resume_text: str, job_description: str) -> str:
-        prompt = f"""
+            chunks = []
+            try:
+                while True:
+                    timeout, deadline_limited = timeout_for(settings.llm_timeout_seconds)
+                    try:
+                        chunk = await asyncio.wait_for(tokens.__anext__(), timeout=timeout)
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        if deadline_limited:
+                            raise deadline_exceeded(
+                                "llm", "The request deadline passed while the response was streaming."
+                            ) from None
+                        raise
+
+                    if parser is not None and parser.feed(chunk):
+                        # Only the part of this chunk that completes the output
+                        chunk = parser.text()[len("".join(chunks)) :]
+                        if chunk:
+                            chunks.append(chunk)
+                            yield chunk
+                        LLM_EARLY_STOPS.labels(task or "default").inc()
+                        break
+
+                    chunks.append(chunk)
+                    yield chunk
+            except UpstreamError:
+                raise
+            except Exception as e:
+                logger.exception("Streaming model call failed")
+                raise as_upstream_error(e) from e
+            finally:
+                await tokens.aclose()
+
+        if chunks:
+            text = "".join(chunks)
+            record_tokens(prompt, text)
+            if model == settings.hf_model_id:
+                llm_cache.set(cache_key, text)
+
+    async def _open_stream(
+        self,
+        prompt: str,
+        model: str,
+        profile: TaskProfile = profile_for(None),
+    ) -> AsyncIterator[str]:
+        return await llm_backend.stream(prompt, model, profile)
+
+    @staticmethod
+    @stage("prompt")
+    def _summary_prompt(resume_text: str, job_description: str) -> str:
+        prompt = context_prefix("rewrite_summary", resume_text, job_description) + """
 You are an expert technical resume writer.
 
 Your task is to rewrite ONLY the SUMMARY section of the resume so it best matches the job description.
@@ -224,15 +727,6 @@ Your task is to rewrite ONLY the SUMMARY section of the resume so it best matche
 4. Focus on backend, APIs, full-stack, cloud, data, and performance-related work if relevant to the JD.
 5. Optimize wording for ATS and clarity while staying 100% truthful.
 
-============================
-📄 INPUTS
-============================
-JOB DESCRIPTION:
-{job_description}
-
-FULL RESUME:
-{resume_text}
-
 ============================
 📤 OUTPUT FORMAT (VERY IMPORTANT)
 ============================
@@ -244,15 +738,48 @@ SUMMARY:
 
 No additional commentary, no markdown, no bullets.
 """
-        return self._call_model(prompt)
+        return prompt
 
+    async def rewrite_summary(self, resume_text: str, job_description: str) -> str:
+        return await self._call_model(
+            self._summary_prompt(resume_text, job_description), task="rewrite_summary"
+        )
+
+    def stream_summary(self, resume_text: str, job_description: str) -> AsyncIterator[str]:
+        return self._stream_model(
+            self._summary_prompt(resume_text, job_description), task="rewrite_summary"
+        )
 
-hf_client = HuggingFaceClient(settings.hf_api_key)
+
+hf_client = HuggingFaceClient()
 
 class CareerService:
     """Facade for cover letter and smart resume features."""
 
-    def generate_cover_letter(
+    async def load_resume(
+        self,
+        file_bytes: bytes,
+        content_type: str,
+        resume_id: Optional[str] = None,
+    ) -> Tuple[str, str]:
+        """Return ``(resume_id, text)`` for an upload, parsing it only on first sight.
+
+        Pass ``resume_id`` when the SHA-256 was already computed during ingestion.
+        """
+        resume_id = resume_id or resume_id_for(file_bytes)
+        resume_text = resume_store.get(resume_id)
+        if resume_text is None:
+            resume_text = normalize_resume_text(
+                await extract_resume_text(file_bytes, content_type)
+            )
+            resume_store.put(resume_id, resume_text)
+
+        return resume_id, resume_text
+
+    def get_resume_text(self, resume_id: str) -> Optional[str]:
+        return resume_store.get(resume_id)
+
+    async def generate_cover_letter(
         self,
         job_title: str,
         company_name: str,
@@ -260,15 +787,15 @@ class CareerService:
         candidate_summary: str,
         tone: str,
     ) -> str:
-        return hf_client.generate_cover_letter(
+        return await hf_client.generate_cover_letter(
             job_title=job_title,
             company_name=company_name,
             job_description=job_description,
-            candidate_summary=candidate_summary,
+            resume_text=candidate_summary,
             tone=tone,
         )
-        
-    def generate_cover_letter_from_file(
+
+    async def generate_cover_letter_from_file(
         self,
         job_title: str,
         company_name: str,
@@ -276,88 +803,335 @@ class CareerService:
         tone: str,
         resume_bytes: bytes,
         resume_content_type: str,
+        resume_id: Optional[str] = None,
     ) -> str:
         """Extract resume text and generate a tailored cover letter."""
-        if resume_content_type == "application/pdf":
-            resume_text = extract_text_from_pdf(resume_bytes)
-        else:
-            resume_text = resume_bytes.decode("utf-8", errors="ignore")
+        _, resume_text = await self.load_resume(resume_bytes, resume_content_type, resume_id)
 
+        return await self.generate_cover_letter_from_text(
+            job_title=job_title,
+            company_name=company_name,
+            job_description=job_description,
+            tone=tone,
+            resume_text=resume_text,
+        )
+
+    async def generate_cover_letter_from_text(
+        self,
+        job_title: str,
+        company_name: str,
+        job_description: str,
+        tone: str,
+        resume_text: str,
+    ) -> str:
         logger.info(
             "Cover letter – resume text length: %d characters",
             len(resume_text),
         )
 
-        return hf_client.generate_cover_letter(
+        return await hf_client.generate_cover_letter(
             job_title=job_title,
             company_name=company_name,
             job_description=job_description,
             resume_text=resume_text,
             tone=tone,
-        )        
+        )
 
-    def improve_resume(self, resume_text: str, job_description: str) -> str:
-        return hf_client.improve_resume(
+    async def stream_cover_letter_from_text(
+        self,
+        job_title: str,
+        company_name: str,
+        job_description: str,
+        tone: str,
+        resume_text: str,
+    ) -> AsyncIterator[str]:
+        async for chunk in hf_client.stream_cover_letter(
+            job_title=job_title,
+            company_name=company_name,
+            job_description=job_description,
+            resume_text=resume_text,
+            tone=tone,
+        ):
+            yield chunk
+
+    def resolve_job_description(self, job_description: str, job_title: str = "") -> str:
+        """The text prompts should use for ``job_description``.
+
+        A variant of a posting seen before becomes that posting's text, so
+        the prompts, and with them cached results, are shared. Counts one
+        request for the posting, for `popular_job_postings`; call it once
+        per request.
+        """
+        if not settings.jd_dedup_enabled or not job_description.strip():
+            return job_description
+        posting = jd_index.resolve(job_description)
+        jd_index.record(posting, job_title)
+        return posting.text
+
+    def popular_job_postings(self, limit: int) -> List[JobPosting]:
+        return jd_index.popular(limit)
+
+    def keyword_gap(self, resume_text: str, job_description: str) -> KeywordGapReport:
+        return analyze_keyword_gap(resume_text, job_description)
+
+    async def improve_resume(self, resume_text: str, job_description: str) -> str:
+        return await hf_client.improve_resume(
             resume_text=resume_text,
             job_description=job_description,
         )
 
-    def improve_resume_from_file(
+    async def improve_resume_from_file(
         self,
         file_bytes: bytes,
         content_type: str,
         job_description: str,
-    ) -> Tuple[str, List[str]]:
-        if content_type == "application/pdf":
-            resume_text = extract_text_from_pdf(file_bytes)
-        else:
-            resume_text = file_bytes.decode("utf-8", errors="ignore")
+        resume_id: Optional[str] = None,
+    ) -> List[str]:
+        _, resume_text = await self.load_resume(file_bytes, content_type, resume_id)
 
-        logger.info("Resume text passed to LLM length: %d", len(resume_text))
+        return await self.improve_resume_from_text(resume_text, job_description)
 
-        raw_output = hf_client.improve_resume(
-            resume_text=resume_text,
-            job_description=job_description,
-        )
+    async def improve_resume_from_text(
+        self,
+        resume_text: str,
+        job_description: str,
+    ) -> List[str]:
+        logger.info("Resume text passed to LLM length: %d", len(resume_text))
 
-        suggestions = []
+        try:
+            raw_output = await hf_client.improve_resume(
+                resume_text=resume_text,
+                job_description=job_description,
+            )
+        except (UpstreamError, AdmissionRejected) as e:
+            # Degrade to the local keyword analysis rather than failing
+            logger.warning("Model unavailable for suggestions (%s); using keyword analysis", e)
+            return keyword_suggestions(resume_text, job_description)
 
-        if "SUGGESTIONS:" in raw_output:
-            lines = raw_output.split("SUGGESTIONS:", 1)[1].strip().splitlines()
-            for line in lines:
-                line = line.strip()
-                if line.startswith("-"):
-                    suggestions.append(line[1:].strip())
+        with stage("parse"):
+            suggestions = parse_suggestions(raw_output)
 
         logger.info("Parsed %d suggestions from LLM output", len(suggestions))
 
         return suggestions
 
-    def rewrite_summary_from_file(
+    async def rewrite_summary_from_file(
         self,
         file_bytes: bytes,
         content_type: str,
         job_description: str,
+        resume_id: Optional[str] = None,
     ) -> str:
         """Extract text from uploaded resume and get a rewritten summary from the LLM."""
-        if content_type == "application/pdf":
-            resume_text = extract_text_from_pdf(file_bytes)
-        else:
-            resume_text = file_bytes.decode("utf-8", errors="ignore")
+        _, resume_text = await self.load_resume(file_bytes, content_type, resume_id)
 
+        return await self.rewrite_summary_from_text(resume_text, job_description)
+
+    async def rewrite_summary_from_text(
+        self,
+        resume_text: str,
+        job_description: str,
+    ) -> str:
         logger.info("Resume text passed to summary rewriter length: %d", len(resume_text))
 
-        raw_output = hf_client.rewrite_summary(
+        raw_output = await hf_client.rewrite_summary(
             resume_text=resume_text,
             job_description=job_description,
         )
 
-        summary = raw_output.strip()
-
-        if summary.upper().startswith("SUMMARY:"):
-            summary = summary[len("SUMMARY:") :].strip()
-
-        return summary
+        with stage("parse"):
+            return parse_summary(raw_output)
 
+    async def stream_summary_from_text(
+        self,
+        resume_text: str,
+        job_description: str,
+    ) -> AsyncIterator[str]:
+        """Yield the rewritten summary as it is generated, minus the "SUMMARY:" label."""
+        label = "SUMMARY:"
+        head = ""
+        label_checked = False
 
-career_service = CareerService()
\ No newline at end of file
+        async for chunk in hf_client.stream_summary(
+            resume_text=resume_text,
+            job_description=job_description,
+        ):
+            if label_checked:
+                yield chunk
+                continue
+
+            # Hold back the first few characters until we know whether the
+            # model opened with the label we asked for.
+            head += chunk
+            if len(head.lstrip()) < len(label):
+                continue
+            label_checked = True
+            head = head.lstrip()
+            if head.upper().startswith(label):
+                head = head[len(label) :].lstrip()
+            if head:
+                yield head
+
+        if not label_checked and head.strip():
+            yield head.strip()
+
+    async def evaluate_interview(self, answers: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Score and critique every (question, answer) pair of a mock interview.
+
+        Answers are evaluated `FEEDBACK_BATCH` at a time, the batches
+        concurrently; feedback is cached per pair, so a pair already seen
+        in any earlier session costs nothing. Answers whose feedback the
+        model left out or garbled get one more try in a later batch. Each
+        result has ``index``, ``question`` and ``status`` ("ok" or "error").
+        """
+        results: List[Dict[str, Any]] = [
+            {"index": index, "question": question} for index, (question, _) in enumerate(answers)
+        ]
+        # Cache key -> positions with that pair, so repeated pairs are evaluated once
+        pending: Dict[str, List[int]] = {}
+        for index, (question, answer) in enumerate(answers):
+            if not answer.strip():
+                results[index].update(status="error", error="No answer was given.")
+                continue
+            key = feedback_cache_key(question, answer)
+            cached = llm_cache.get(key)
+            if cached is not None:
+                results[index].update(status="ok", **json.loads(cached))
+            else:
+                pending.setdefault(key, []).append(index)
+
+        errors: Dict[str, str] = {}
+        for _ in range(2):
+            keys = [key for key in pending if key not in errors]
+            batches = [keys[i : i + FEEDBACK_BATCH] for i in range(0, len(keys), FEEDBACK_BATCH)]
+            outcomes = await asyncio.gather(
+                *(
+                    hf_client.evaluate_answers([answers[pending[key][0]] for key in batch])
+                    for batch in batches
+                ),
+                return_exceptions=True,
+            )
+            for batch, outcome in zip(batches, outcomes):
+                if isinstance(outcome, Exception):
+                    logger.error("Interview feedback batch failed: %r", outcome)
+                    for key in batch:
+                        errors[key] = str(outcome) or type(outcome).__name__
+                    continue
+                for position, key in enumerate(batch):
+                    feedback = outcome.get(position)
+                    if feedback is None:
+                        continue
+                    llm_cache.set(key, json.dumps(asdict(feedback)))
+                    for index in pending.pop(key):
+                        results[index].update(status="ok", **asdict(feedback))
+
+        for key, indexes in pending.items():
+            error = errors.get(key, "The model's feedback on this answer could not be read.")
+            for index in indexes:
+                results[index].update(status="error", error=error)
+        return results
+
+    async def generate_cover_letters_batch(
+        self,
+        resume_text: str,
+        jobs: List[Dict[str, str]],
+        concurrency: int,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Generate one cover letter per job, yielding each result as it finishes.
+
+        At most ``concurrency`` generations run at once. Results carry the
+        job's ``index`` since they arrive out of order.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate(index: int, job: Dict[str, str]) -> Dict[str, Any]:
+            result: Dict[str, Any] = {
+                "index": index,
+                "job_title": job["job_title"],
+                "company_name": job["company_name"],
+            }
+            async with semaphore:
+                try:
+                    result["cover_letter"] = await self.generate_cover_letter_from_text(
+                        job_title=job["job_title"],
+                        company_name=job["company_name"],
+                        job_description=job["job_description"],
+                        tone=job.get("tone", "professional"),
+                        resume_text=resume_text,
+                    )
+                    result["status"] = "ok"
+                except Exception as e:
+                    logger.error("Batch cover letter %d failed: %r", index, e)
+                    result["status"] = "error"
+                    result["error"] = str(e) or type(e).__name__
+            return result
+
+        tasks = [asyncio.create_task(generate(i, job)) for i, job in enumerate(jobs)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The client went away or the stream was closed early
+            for task in tasks:
+                task.cancel()
+
+    async def full_analysis_from_text(
+        self,
+        resume_text: str,
+        job_title: str,
+        company_name: str,
+        job_description: str,
+        tone: str,
+        combined: bool = False,
+    ) -> Dict[str, Any]:
+        """Run suggestions, summary rewrite and cover letter concurrently.
+
+        With ``combined`` all three are first asked for in one generation;
+        only parts missing from its output are generated separately. A
+        failing part is reported under ``errors`` instead of failing the
+        whole analysis.
+        """
+        analysis: Dict[str, Any] = {"errors": {}}
+        if combined:
+            try:
+                raw_output = await hf_client.full_analysis(
+                    job_title=job_title,
+                    company_name=company_name,
+                    job_description=job_description,
+                    resume_text=resume_text,
+                    tone=tone,
+                )
+            except (UpstreamError, AdmissionRejected) as e:
+                logger.warning("Combined full analysis failed (%s); generating parts separately", e)
+            else:
+                with stage("parse"):
+                    analysis.update(parse_combined(raw_output))
+                missing = [name for name in COMBINED_SECTIONS if name not in analysis]
+                if missing:
+                    logger.warning("Combined output lacked %s; generating them separately", missing)
+
+        parts = {
+            "suggestions": lambda: self.improve_resume_from_text(resume_text, job_description),
+            "rewritten_summary": lambda: self.rewrite_summary_from_text(resume_text, job_description),
+            "cover_letter": lambda: self.generate_cover_letter_from_text(
+                job_title=job_title,
+                company_name=company_name,
+                job_description=job_description,
+                tone=tone,
+                resume_text=resume_text,
+            ),
+        }
+        parts = {name: make for name, make in parts.items() if name not in analysis}
+        results = await asyncio.gather(*(make() for make in parts.values()), return_exceptions=True)
+
+        for name, result in zip(parts, results):
+            if isinstance(result, Exception):
+                logger.error("Full analysis part %s failed: %r", name, result)
+                analysis["errors"][name] = str(result) or type(result).__name__
+            else:
+                analysis[name] = result
+
+        return analysis
+
+
+career_service = CareerService()
@@ -0,0 +1,71 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, TypeVar
+
+from .deadlines import clear_deadline, deadline_exceeded, remaining
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    def __init__(self, task: "asyncio.Task[T]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into a single execution.
+
+    The first caller starts the work; callers arriving while it runs await
+    the same task and get the same result or exception. The key is
+    forgotten as soon as the task finishes. If every waiter is cancelled,
+    the shared task is cancelled too.
+
+    The shared work runs without a request deadline, since it serves
+    callers with different ones. Each caller waits only until its own
+    deadline and then gets DeadlineExceeded (counted under
+    ``deadline_stage``), leaving the work running for the others.
+    """
+
+    def __init__(self, deadline_stage: str = "llm"):
+        self.deadline_stage = deadline_stage
+        self._calls: Dict[str, _Call] = {}
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(self._without_deadline(fn)))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, key=key, call=call: self._forget(key, call))
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            left = remaining()
+            if left is not None and left <= 0:
+                raise deadline_exceeded(self.deadline_stage)
+            # Unlike wait_for, asyncio.wait leaves the shared task running on timeout
+            done, _ = await asyncio.wait({call.task}, timeout=left)
+            if not done:
+                raise deadline_exceeded(
+                    self.deadline_stage, "The request deadline passed while waiting for the result."
+                )
+            return call.task.result()
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+
+    @staticmethod
+    async def _without_deadline(fn: Callable[[], Awaitable[T]]) -> T:
+        # Runs in the task's own copy of the context
+        clear_deadline()
+        return await fn()
+
+    def _forget(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"in_flight": len(self._calls), "coalesced": self.coalesced}
@@ -0,0 +1,196 @@
+import re
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+# A line such as "Note:" or "EXPLANATION:" that starts commentary we did not
+# ask for. Only these labels end the output: "Key strengths: ..." can be
+# part of a summary or a suggestion.
+_COMMENTARY_LABEL = re.compile(
+    r"^(?:notes?|explanations?|commentary|disclaimer|rationale|reasoning"
+    r"|additional notes|changes made)\s*:",
+    re.IGNORECASE,
+)
+
+
+class OutputParser:
+    """Consumes generated text as it streams in.
+
+    ``done`` becomes true as soon as the expected structure is complete;
+    ``text()`` is then the output up to that point, without whatever the
+    model would have added after it.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.end: Optional[int] = None
+        self._pos = 0  # start of the first line not yet scanned
+
+    @property
+    def done(self) -> bool:
+        return self.end is not None
+
+    def feed(self, chunk: str) -> bool:
+        if not self.done:
+            self.buffer += chunk
+            while not self.done:
+                line_end = self.buffer.find("\n", self._pos)
+                if line_end == -1:
+                    break
+                self._line(self.buffer[self._pos : line_end].strip(), self._pos, line_end)
+                self._pos = line_end + 1
+        return self.done
+
+    def close(self) -> None:
+        """Scan the last line, which has no trailing newline."""
+        if not self.done and self._pos < len(self.buffer):
+            self._line(self.buffer[self._pos :].strip(), self._pos, len(self.buffer))
+            self._pos = len(self.buffer)
+
+    def text(self) -> str:
+        return self.buffer if self.end is None else self.buffer[: self.end]
+
+    def _line(self, line: str, start: int, end: int) -> None:
+        raise NotImplementedError
+
+
+class BulletListParser(OutputParser):
+    """``LABEL:`` followed by "- " bullets; done after ``max_items`` bullets.
+
+    Text on the lines right after a bullet continues it, since models wrap
+    long bullets; text after a blank line is ignored. A commentary label
+    ends the list. The last bullet is only complete once the next line
+    shows it is not wrapped.
+    """
+
+    def __init__(self, label: str, max_items: int):
+        super().__init__()
+        self.label = label.upper()
+        self.max_items = max_items
+        self.items: List[str] = []
+        self._in_list = False
+        self._after_item = False
+        # End of the last bullet once max_items have been seen
+        self._full_end: Optional[int] = None
+
+    def _line(self, line: str, start: int, end: int) -> None:
+        if not self._in_list:
+            # Tolerate a missing label when the model goes straight to bullets
+            if line.upper().startswith(self.label) or line.startswith("-"):
+                self._in_list = True
+                if not line.startswith("-"):
+                    return
+            else:
+                return
+
+        continuation = (
+            self._after_item
+            and bool(line)
+            and not line.startswith("-")
+            and not _COMMENTARY_LABEL.match(line)
+        )
+        if continuation:
+            self.items[-1] = f"{self.items[-1]} {line}"
+            if self._full_end is not None:
+                self._full_end = end
+        elif self._full_end is not None:
+            self.end = self._full_end
+        elif line.startswith("-"):
+            self.items.append(line[1:].strip())
+            self._after_item = True
+            if len(self.items) == self.max_items:
+                self._full_end = end
+        elif not line:
+            self._after_item = False
+        elif self.items and _COMMENTARY_LABEL.match(line):
+            self.end = start
+
+    def close(self) -> None:
+        super().close()
+        if not self.done and self._full_end is not None:
+            self.end = self._full_end
+
+
+class LabelledTextParser(OutputParser):
+    """``LABEL:`` followed by up to ``max_lines`` lines of text.
+
+    Done at the first blank line or commentary label (see
+    `_COMMENTARY_LABEL`) after some text, or after ``max_lines`` lines.
+    """
+
+    def __init__(self, label: str, max_lines: int):
+        super().__init__()
+        self.label = label.upper()
+        self.max_lines = max_lines
+        self.lines = 0
+
+    def _line(self, line: str, start: int, end: int) -> None:
+        if not line:
+            if self.lines:
+                self.end = start
+            return
+
+        if self.lines == 0 and line.upper().startswith(self.label):
+            line = line[len(self.label) :].strip()
+            if not line:
+                return
+        elif self.lines and _COMMENTARY_LABEL.match(line):
+            self.end = start
+            return
+
+        self.lines += 1
+        if self.lines == self.max_lines:
+            self.end = end
+
+
+@dataclass(frozen=True)
+class TaskProfile:
+    """How much one task may generate and what its output looks like."""
+
+    max_new_tokens: int
+    # Passed to the model; generation stops before any of these
+    stop: Tuple[str, ...] = ()
+    # Builds a parser that recognises complete output, so generation can be
+    # cut short; None for free-form text
+    parser: Optional[Callable[[], OutputParser]] = field(default=None, compare=False)
+
+
+# Questions asked for per interview_questions generation
+QUESTION_BATCH = 8
+# Answers evaluated per interview_feedback generation
+FEEDBACK_BATCH = 4
+
+# Commentary the prompts forbid but models still like to append
+_COMMENTARY_STOPS = ("\nNote:", "\nExplanation:", "\n\n\n")
+
+TASK_PROFILES = {
+    "improve_resume": TaskProfile(
+        max_new_tokens=256,
+        stop=_COMMENTARY_STOPS,
+        parser=lambda: BulletListParser("SUGGESTIONS:", max_items=4),
+    ),
+    "rewrite_summary": TaskProfile(
+        max_new_tokens=160,
+        stop=_COMMENTARY_STOPS,
+        parser=lambda: LabelledTextParser("SUMMARY:", max_lines=3),
+    ),
+    "cover_letter": TaskProfile(max_new_tokens=700),
+    # Suggestions, summary and cover letter in one delimited generation
+    "full_analysis": TaskProfile(max_new_tokens=1100, stop=("<<<END>>>",)),
+    "interview_question": TaskProfile(max_new_tokens=120),
+    # A batch of questions for the interview question pool
+    "interview_questions": TaskProfile(
+        max_new_tokens=60 * QUESTION_BATCH,
+        stop=_COMMENTARY_STOPS,
+        parser=lambda: BulletListParser("QUESTIONS:", max_items=QUESTION_BATCH),
+    ),
+    # Feedback on up to FEEDBACK_BATCH answers in one delimited generation
+    "interview_feedback": TaskProfile(
+        max_new_tokens=250 * FEEDBACK_BATCH, stop=("<<<DONE>>>",)
+    ),
+}
+
+DEFAULT_PROFILE = TaskProfile(max_new_tokens=700)
+
+
+def profile_for(task: Optional[str]) -> TaskProfile:
+    return TASK_PROFILES.get(task, DEFAULT_PROFILE) if task else DEFAULT_PROFILE
@@ -0,0 +1,80 @@
+import pytest
+
+from app import admission, services
+from app.jd_dedup import JobDescriptionIndex
+from app.jobs import job_store
+from app.matching import MatchIndex, matching_engine
+from app.llm_cache import MemoryLLMCache
+from app.question_pool import question_store
+
+
+@pytest.fixture(autouse=True)
+def fresh_llm_cache(monkeypatch):
+    """Keep cached model output from leaking between tests."""
+    cache = MemoryLLMCache(max_items=100, ttl_seconds=60)
+    monkeypatch.setattr(services, "llm_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def dummy_api_key(monkeypatch):
+    """Model calls are faked, but the backend still wants a token configured."""
+    monkeypatch.setattr(services.settings, "hf_api_key", "test-key")
+
+
+@pytest.fixture(autouse=True)
+def fast_upstream_failures(monkeypatch):
+    """Fresh circuit breakers and no real backoff sleeps."""
+    monkeypatch.setattr(services, "circuit_breakers", {})
+    monkeypatch.setattr(services.settings, "llm_retry_base_delay", 0.0)
+    monkeypatch.setattr(services.settings, "llm_retry_max_delay", 0.0)
+
+
+@pytest.fixture(autouse=True)
+def fresh_admission(monkeypatch):
+    """Per-test admission state so one test's traffic cannot throttle another."""
+    monkeypatch.setattr(admission, "rate_limiter", admission.RateLimiter(per_minute=600, burst=100))
+    monkeypatch.setattr(
+        services,
+        "llm_admission",
+        admission.AdmissionController(max_concurrent=16, max_waiting=32, max_wait_seconds=1),
+    )
+
+
+@pytest.fixture(autouse=True)
+def fresh_matching_index(monkeypatch):
+    """Empty, in-memory matching indexes that are never saved to disk."""
+    monkeypatch.setattr(matching_engine, "directory", None)
+    monkeypatch.setattr(matching_engine, "resumes", MatchIndex("resumes"))
+    monkeypatch.setattr(matching_engine, "jobs", MatchIndex("jobs"))
+    return matching_engine
+
+
+@pytest.fixture(autouse=True)
+def fresh_job_store(monkeypatch):
+    """An in-memory job store per test instead of jobs.sqlite3."""
+    monkeypatch.setattr(job_store, "path", ":memory:")
+    monkeypatch.setattr(job_store, "_db", None)
+    return job_store
+
+
+@pytest.fixture(autouse=True)
+def fresh_question_store(monkeypatch):
+    """An in-memory question store per test instead of questions.sqlite3."""
+    monkeypatch.setattr(question_store, "path", ":memory:")
+    monkeypatch.setattr(question_store, "_db", None)
+    return question_store
+
+
+@pytest.fixture(autouse=True)
+def fresh_jd_index(monkeypatch):
+    """An empty job description index, so postings from other tests are not reused."""
+    index = JobDescriptionIndex(max_items=100, min_similarity=0.95)
+    monkeypatch.setattr(services, "jd_index", index)
+    return index
+
+
+@pytest.fixture(autouse=True)
+def no_startup_warmup(monkeypatch):
+    """Tests that enter the lifespan should not spawn PDF workers or load models."""
+    monkeypatch.setattr(services.settings, "startup_warmup", False)
@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import admission
+from app.admission import AdmissionController, AdmissionRejected, RateLimiter
+from app.main import app
+from app.metrics import LLM_ADMISSION_ACTIVE, LLM_ADMISSIONS, RATE_LIMITED
+
+client = TestClient(app)
+
+
+def test_controller_caps_concurrency_and_queues():
+    controller = AdmissionController(max_concurrent=2, max_waiting=10, max_wait_seconds=1)
+    running = 0
+    peak = 0
+
+    async def work():
+        nonlocal running, peak
+        async with controller.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    async def run():
+        await asyncio.gather(*[work() for _ in range(6)])
+
+    asyncio.run(run())
+
+    assert peak == 2
+    assert controller.stats()["admitted"] == 6
+    assert controller.active == 0
+
+
+def test_controller_sheds_load_when_queue_is_full():
+    controller = AdmissionController(max_concurrent=1, max_waiting=1, max_wait_seconds=1)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        queued = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire()
+
+        release.set()
+        await holder
+        await queued
+        controller.release()
+
+    asyncio.run(run())
+
+    assert controller.rejected == 1
+    assert controller.active == 0
+
+
+def test_controller_times_out_waiters():
+    controller = AdmissionController(max_concurrent=1, max_waiting=5, max_wait_seconds=0.01)
+
+    async def run():
+        await controller.acquire()
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire()
+        controller.release()
+
+    asyncio.run(run())
+
+    assert controller.waiting == 0
+    assert controller.active == 0
+
+
+def test_rate_limiter_refuses_after_burst():
+    limiter = RateLimiter(per_minute=60, burst=2)
+
+    assert limiter.check("a") == 0
+    assert limiter.check("a") == 0
+    assert 0 < limiter.check("a") <= 1
+    # Other clients have their own bucket
+    assert limiter.check("b") == 0
+
+
+def _upload(api_key):
+    return client.post(
+        "/api/career/resumes",
+        files={"file": ("resume.txt", b"Resume text.", "text/plain")},
+        headers={"X-API-Key": api_key},
+    )
+
+
+def test_rate_limited_client_gets_429_with_retry_after(monkeypatch):
+    monkeypatch.setattr(admission, "rate_limiter", RateLimiter(per_minute=1, burst=1))
+    monkeypatch.setattr(admission.settings, "rate_limit_api_keys", ["client-1", "client-2"])
+    limited = RATE_LIMITED._value.get()
+
+    assert _upload("client-1").status_code == 200
+    resp = _upload("client-1")
+
+    assert resp.status_code == 429
+    assert int(resp.headers["retry-after"]) >= 1
+    assert RATE_LIMITED._value.get() == limited + 1
+    # A configured key has its own bucket
+    assert _upload("client-2").status_code == 200
+
+
+def test_unknown_api_keys_share_the_ip_bucket(monkeypatch):
+    limiter = RateLimiter(per_minute=1, burst=1)
+    monkeypatch.setattr(admission, "rate_limiter", limiter)
+
+    statuses = [_upload(f"made-up-{i}").status_code for i in range(3)]
+
+    assert statuses == [200, 429, 429]
+    assert limiter.stats()["clients"] == 1
+
+
+def test_admission_is_exported_to_prometheus():
+    controller = AdmissionController(max_concurrent=1, max_waiting=0, max_wait_seconds=1)
+    active = LLM_ADMISSION_ACTIVE._value.get()
+    rejected = LLM_ADMISSIONS.labels("rejected")._value.get()
+
+    async def run():
+        await controller.acquire()
+        assert LLM_ADMISSION_ACTIVE._value.get() == active + 1
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire()
+        controller.release()
+
+    asyncio.run(run())
+
+    assert LLM_ADMISSION_ACTIVE._value.get() == active
+    assert LLM_ADMISSIONS.labels("rejected")._value.get() == rejected + 1
@@ -1,4 +1,6 @@
+import hashlib
 import io
+import json
 from fastapi.testclient import TestClient
 
 from app.main import app
@@ -16,8 +18,10 @@ def test_health_check():
 
 def test_smart_resume_upload_returns_suggestions(monkeypatch):
     # Arrange: fake implementation so we don't call Hugging Face
-    def fake_improve_resume_from_file(file_bytes, content_type, job_description):
+    async def fake_improve_resume_from_file(file_bytes, content_type, job_description, resume_id):
         assert content_type == "text/plain"
+        # The hash computed while reading the upload is passed on, not recomputed
+        assert resume_id == hashlib.sha256(file_bytes).hexdigest()
         assert "backend" in job_description.lower()  # check JD flowed through
         # Return suggestions as if AI produced them
         return [
@@ -56,8 +60,9 @@ def test_smart_resume_upload_returns_suggestions(monkeypatch):
 
 
 def test_rewrite_summary_upload_returns_summary(monkeypatch):
-    def fake_rewrite_summary_from_file(file_bytes, content_type, job_description):
+    async def fake_rewrite_summary_from_file(file_bytes, content_type, job_description, resume_id):
         assert content_type == "text/plain"
+        assert resume_id == hashlib.sha256(file_bytes).hexdigest()
         assert "intern" in job_description.lower()
         return "Backend-focused Software Engineering student with experience in APIs and cloud."
 
@@ -88,15 +93,17 @@ def test_rewrite_summary_upload_returns_summary(monkeypatch):
 
 
 def test_cover_letter_upload_returns_cover_letter(monkeypatch):
-    def fake_generate_cover_letter_from_file(
+    async def fake_generate_cover_letter_from_file(
         job_title,
         company_name,
         job_description,
         tone,
         resume_bytes,
         resume_content_type,
+        resume_id,
     ):
         assert job_title == "Software Engineer Intern"
+        assert resume_id == hashlib.sha256(resume_bytes).hexdigest()
         assert company_name == "CoolTech Inc"
         assert "python" in job_description.lower()
         assert resume_content_type == "text/plain"
@@ -133,3 +140,181 @@ def test_cover_letter_upload_returns_cover_letter(monkeypatch):
     body = resp.json()
     assert "cover_letter" in body
     assert body["cover_letter"].startswith("Dear Hiring Manager")
+
+
+def test_rewrite_summary_stream_sends_tokens_as_events(monkeypatch):
+    from app import services
+
+    async def fake_text_generation(prompt, model, max_new_tokens, stream, stop):
+        assert stream is True
+
+        async def tokens():
+            for token in ["SUM", "MARY: ", "Backend ", "engineer."]:
+                yield token
+
+        return tokens()
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", fake_text_generation)
+
+    resp = client.post(
+        "/api/career/rewrite-summary-upload/stream",
+        files={"file": ("resume.txt", b"Backend engineer resume.", "text/plain")},
+        data={"job_description": "Backend role."},
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = [line for line in resp.text.split("\n\n") if line]
+    tokens = [json.loads(e[len("data: "):])["token"] for e in events if e.startswith("data: ")]
+    assert "".join(tokens) == "Backend engineer."
+    assert events[-1].startswith("event: done")
+
+
+def test_resume_id_can_replace_the_upload(monkeypatch):
+    resume_content = b"My   resume\n\n\n\nwith backend experience."
+
+    resp = client.post(
+        "/api/career/resumes",
+        files={"file": ("resume.txt", resume_content, "text/plain")},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["resume_id"] == hashlib.sha256(resume_content).hexdigest()
+
+    async def fake_improve_resume_from_text(resume_text, job_description):
+        assert resume_text == "My resume\n\nwith backend experience."
+        return ["Mention the APIs you built."]
+
+    monkeypatch.setattr(
+        career_service,
+        "improve_resume_from_text",
+        fake_improve_resume_from_text,
+    )
+
+    resp = client.post(
+        "/api/career/smart-resume-upload",
+        data={"resume_id": body["resume_id"], "job_description": "Backend role."},
+    )
+
+    assert resp.status_code == 200
+    assert resp.json() == {"suggestions": ["Mention the APIs you built."]}
+
+
+def test_unknown_resume_id_returns_404():
+    resp = client.post(
+        "/api/career/rewrite-summary-upload",
+        data={"resume_id": "0" * 64, "job_description": "Backend role."},
+    )
+
+    assert resp.status_code == 404
+
+
+def test_full_analysis_reports_failed_parts_separately(monkeypatch):
+    async def fake_improve_resume_from_text(resume_text, job_description):
+        return ["Quantify your impact."]
+
+    async def fake_rewrite_summary_from_text(resume_text, job_description):
+        raise RuntimeError("model overloaded")
+
+    async def fake_generate_cover_letter_from_text(
+        job_title, company_name, job_description, tone, resume_text
+    ):
+        assert company_name == "CoolTech Inc"
+        return "Dear Hiring Manager,"
+
+    monkeypatch.setattr(career_service, "improve_resume_from_text", fake_improve_resume_from_text)
+    monkeypatch.setattr(career_service, "rewrite_summary_from_text", fake_rewrite_summary_from_text)
+    monkeypatch.setattr(
+        career_service,
+        "generate_cover_letter_from_text",
+        fake_generate_cover_letter_from_text,
+    )
+
+    resp = client.post(
+        "/api/career/full-analysis",
+        files={"resume": ("resume.txt", b"Python backend resume.", "text/plain")},
+        data={
+            "job_title": "Software Engineer Intern",
+            "company_name": "CoolTech Inc",
+            "job_description": "We use Python for backend services.",
+        },
+    )
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["resume_id"] == hashlib.sha256(b"Python backend resume.").hexdigest()
+    assert body["suggestions"] == ["Quantify your impact."]
+    assert body["cover_letter"] == "Dear Hiring Manager,"
+    assert body["rewritten_summary"] is None
+    assert body["errors"] == {"rewritten_summary": "model overloaded"}
+
+
+def test_unreadable_pdf_returns_422():
+    resp = client.post(
+        "/api/career/resumes",
+        files={"file": ("resume.pdf", b"%PDF-1.4 garbage", "application/pdf")},
+    )
+
+    assert resp.status_code == 422
+
+
+def test_batch_cover_letters_stream_one_line_per_job(monkeypatch):
+    async def fake_generate_cover_letter_from_text(
+        job_title, company_name, job_description, tone, resume_text
+    ):
+        if company_name == "BrokenCorp":
+            raise RuntimeError("generation failed")
+        return f"Dear {company_name} team,"
+
+    monkeypatch.setattr(
+        career_service,
+        "generate_cover_letter_from_text",
+        fake_generate_cover_letter_from_text,
+    )
+
+    jobs = [
+        {"job_title": "Backend Intern", "company_name": "CoolTech Inc", "job_description": "Python"},
+        {"job_title": "SWE", "company_name": "BrokenCorp", "job_description": "Go"},
+        {"job_title": "Data Intern", "company_name": "DataCo", "job_description": "SQL", "tone": "friendly"},
+    ]
+
+    resp = client.post(
+        "/api/career/cover-letters/batch",
+        files={"resume": ("resume.txt", b"Python, Go and SQL resume.", "text/plain")},
+        data={"jobs": json.dumps(jobs)},
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    results = sorted(
+        (json.loads(line) for line in resp.text.splitlines()),
+        key=lambda r: r["index"],
+    )
+    assert [r["status"] for r in results] == ["ok", "error", "ok"]
+    assert results[0]["cover_letter"] == "Dear CoolTech Inc team,"
+    assert results[1]["error"] == "generation failed"
+    assert results[2]["company_name"] == "DataCo"
+
+
+def test_batch_cover_letters_rejects_malformed_jobs():
+    resp = client.post(
+        "/api/career/cover-letters/batch",
+        files={"resume": ("resume.txt", b"Resume.", "text/plain")},
+        data={"jobs": json.dumps([{"job_title": "No company"}])},
+    )
+
+    assert resp.status_code == 422
+
+
+def test_keyword_gap_endpoint():
+    resp = client.post(
+        "/api/career/keyword-gap",
+        files={"file": ("resume.txt", b"Python developer using Docker.", "text/plain")},
+        data={"job_description": "Python, Docker and Kubernetes required."},
+    )
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["matched_keywords"] == ["docker", "python"]
+    assert body["missing_keywords"] == ["kubernetes"]
+    assert body["suggestions"]
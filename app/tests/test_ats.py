@@ -0,0 +1,75 @@
+import asyncio
+
+from app import services
+from app.ats import analyze_keyword_gap, extract_terms
+from app.resilience import UpstreamUnavailable
+from app.services import career_service
+
+JD = (
+    "Backend Engineer. Requirements: Python, FastAPI, PostgreSQL, Kubernetes and AWS. "
+    "Experience with RESTful APIs, CI/CD and microservices. Kafka is a plus."
+)
+RESUME = "Built REST APIs in Python with Flask, deployed on k8s in AWS with Postgres."
+
+
+def test_extract_terms_normalizes_synonyms_and_phrases():
+    terms = extract_terms("Deployed to K8s on Amazon Web Services; RESTful APIs in Golang.")
+
+    assert "kubernetes" in terms
+    assert "aws" in terms
+    assert "rest api" in terms
+    assert "go" in terms
+
+
+def test_dotnet_keeps_its_leading_dot():
+    assert extract_terms(".NET Core and C#/.NET") == [".net", "core", "c#", ".net"]
+
+    report = analyze_keyword_gap("Built services in .NET.", "Senior .NET developer")
+    assert ".net" in report.matched_keywords
+
+
+def test_go_and_rest_as_plain_english_are_not_keywords():
+    jd = (
+        "You are ready to go from day one and will support the rest of our team. "
+        "Python and Kubernetes required."
+    )
+
+    report = analyze_keyword_gap("Python developer.", jd)
+
+    assert "go" not in report.missing_keywords
+    assert "rest api" not in report.missing_keywords
+    assert "kubernetes" in report.missing_keywords
+
+
+def test_go_and_rest_in_a_skill_context_are_keywords():
+    for text in ("Go developer", "Experience with Go.", "Python, Go and Rust"):
+        assert "go" in extract_terms(text), text
+    for text in ("Design REST endpoints.", "build rest services"):
+        assert "rest api" in extract_terms(text), text
+
+
+def test_keyword_gap_reports_matches_and_missing_terms():
+    report = analyze_keyword_gap(RESUME, JD)
+
+    assert {"python", "kubernetes", "aws", "postgresql", "rest api"} <= set(report.matched_keywords)
+    assert {"fastapi", "kafka", "ci/cd", "microservices"} <= set(report.missing_keywords)
+    assert 0 < report.match_score < 100
+    assert any("fastapi" in s for s in report.suggestions)
+
+
+def test_keyword_gap_perfect_match_scores_100():
+    report = analyze_keyword_gap("Python and Kafka", "Python, Kafka")
+
+    assert report.match_score == 100.0
+    assert report.missing_keywords == []
+
+
+def test_suggestions_degrade_to_keyword_analysis_when_model_unavailable(monkeypatch):
+    async def unavailable(resume_text, job_description):
+        raise UpstreamUnavailable("circuit open")
+
+    monkeypatch.setattr(services.hf_client, "improve_resume", unavailable)
+
+    suggestions = asyncio.run(career_service.improve_resume_from_text(RESUME, JD))
+
+    assert suggestions == analyze_keyword_gap(RESUME, JD).suggestions
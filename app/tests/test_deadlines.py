@@ -0,0 +1,180 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app import services
+from app.deadlines import DeadlineExceeded, _deadline, cap_profile, remaining, timeout_for
+from app.main import app
+from app.metrics import CLIENT_DISCONNECTS
+from app.task_profiles import profile_for
+
+client = TestClient(app)
+
+COVER_LETTER_FORM = {
+    "job_title": "Backend Engineer",
+    "company_name": "Acme",
+    "job_description": "Python APIs",
+}
+RESUME = {"resume": ("resume.txt", b"Python engineer, deadline test.", "text/plain")}
+
+
+@pytest.fixture
+def deadline():
+    """Set the request deadline ``seconds`` from now, as the middleware would."""
+    tokens = []
+
+    def set_deadline(seconds):
+        tokens.append(_deadline.set(time.monotonic() + seconds))
+
+    yield set_deadline
+    for token in reversed(tokens):
+        _deadline.reset(token)
+
+
+@pytest.fixture
+def quick_generation(monkeypatch):
+    """Deadline maths that allows sub-second deadlines in tests."""
+    monkeypatch.setattr(services.settings, "llm_first_token_seconds", 0.0)
+    monkeypatch.setattr(services.settings, "llm_min_new_tokens", 1)
+    monkeypatch.setattr(services.settings, "llm_tokens_per_second", 30.0)
+
+
+def test_no_deadline_leaves_limits_alone():
+    profile = profile_for("cover_letter")
+
+    assert remaining() is None
+    assert timeout_for(60) == (60, False)
+    assert cap_profile(profile) is profile
+
+
+def test_deadline_caps_timeout_and_tokens(deadline):
+    deadline(4)
+
+    timeout, limited = timeout_for(60)
+    capped = cap_profile(profile_for("cover_letter"))
+
+    assert limited and 3 < timeout <= 4
+    # (4s - 1s to the first token) * 30 tokens/s
+    assert 85 <= capped.max_new_tokens <= 90
+    assert capped.stop == profile_for("cover_letter").stop
+
+
+def test_deadline_too_short_for_min_tokens(deadline):
+    deadline(1.5)
+
+    with pytest.raises(DeadlineExceeded):
+        cap_profile(profile_for("cover_letter"))
+
+
+def test_invalid_deadline_header_is_rejected():
+    for value in ("soon", "0", "-5"):
+        resp = client.get("/health", headers={"X-Request-Timeout": value})
+        assert resp.status_code == 400
+
+
+def test_unmeetable_deadline_fails_before_reading_the_resume(monkeypatch):
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("no work should start")
+
+    monkeypatch.setattr(services.career_service, "generate_cover_letter_from_file", unexpected)
+
+    resp = client.post(
+        "/api/career/cover-letter",
+        data=COVER_LETTER_FORM,
+        files=RESUME,
+        headers={"X-Request-Timeout": "0.5"},
+    )
+
+    assert resp.status_code == 504
+    # Routes without a model call are unaffected
+    resp = client.post(
+        "/api/career/keyword-gap",
+        data={"job_description": "Python"},
+        files={"file": RESUME["resume"]},
+        headers={"X-Request-Timeout": "0.5"},
+    )
+    assert resp.status_code == 200
+
+
+def test_deadline_bounds_the_upstream_call(monkeypatch, quick_generation):
+    calls = []
+
+    async def slow_text_generation(prompt, model, max_new_tokens):
+        calls.append(max_new_tokens)
+        await asyncio.sleep(5)
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", slow_text_generation)
+
+    start = time.perf_counter()
+    resp = client.post(
+        "/api/career/cover-letter",
+        data=COVER_LETTER_FORM,
+        files=RESUME,
+        headers={"X-Request-Timeout": "0.3"},
+    )
+
+    assert resp.status_code == 504
+    assert time.perf_counter() - start < 2
+    # One attempt with the token cap, no retries, and no breaker failure
+    assert len(calls) == 1 and calls[0] <= 9
+    assert all(breaker.failures == 0 for breaker in services.circuit_breakers.values())
+
+
+def test_client_disconnect_cancels_the_model_call(monkeypatch):
+    started = asyncio.Event()
+    cancelled = []
+
+    async def hanging_text_generation(prompt, model, max_new_tokens):
+        started.set()
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", hanging_text_generation)
+
+    request = httpx.Request(
+        "POST", "http://test/api/career/cover-letter", data=COVER_LETTER_FORM, files=RESUME
+    )
+    body = request.read()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/career/cover-letter",
+        "raw_path": b"/api/career/cover-letter",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(k.lower(), v) for k, v in request.headers.raw],
+        "client": ("127.0.0.1", 50000),
+        "server": ("test", 80),
+    }
+    sent = []
+
+    async def main():
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            # The client hangs up while the model is still generating
+            await started.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        await asyncio.wait_for(app(scope, receive, send), timeout=5)
+
+    disconnects = CLIENT_DISCONNECTS._value.get()
+    asyncio.run(main())
+
+    assert cancelled == [True]
+    assert sent == []
+    assert CLIENT_DISCONNECTS._value.get() == disconnects + 1
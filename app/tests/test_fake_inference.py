@@ -0,0 +1,77 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import services
+from app.main import app
+from benchmarks import corpus
+from benchmarks.fake_inference_server import FakeInferenceServer, FakeServerConfig
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    """Route real model calls to the local fake inference server."""
+    with FakeInferenceServer(config=FakeServerConfig(latency=0)) as server:
+        monkeypatch.setattr(services.settings, "hf_inference_base_url", server.url)
+        yield server
+
+
+def test_full_request_path_against_fake_server(fake_server):
+    text = corpus.resume_text("medium")
+
+    resp = client.post(
+        "/api/career/smart-resume-upload",
+        files={"file": ("resume.pdf", corpus.resume_pdf(text, pages=2), "application/pdf")},
+        data={"job_description": corpus.job_description()},
+    )
+
+    assert resp.status_code == 200
+    assert len(resp.json()["suggestions"]) == 4
+    assert fake_server.requests == 1
+
+
+def test_streaming_against_fake_server(fake_server):
+    fake_server.config.tokens_per_second = 1000
+
+    with client.stream(
+        "POST",
+        "/api/career/rewrite-summary-upload/stream",
+        files={"file": ("resume.txt", corpus.resume_text("small").encode(), "text/plain")},
+        data={"job_description": corpus.job_description()},
+    ) as resp:
+        body = "".join(resp.iter_text())
+
+    assert resp.status_code == 200
+    assert "Backend" in body
+    assert "event: done" in body
+
+
+def test_injected_errors_are_retried(fake_server, monkeypatch):
+    fake_server.config.error_rate = 1.0
+    monkeypatch.setattr(services.settings, "llm_max_retries", 1)
+
+    resp = client.post(
+        "/api/career/rewrite-summary-upload",
+        files={"file": ("resume.txt", b"Python developer.", "text/plain")},
+        data={"job_description": "Backend role"},
+    )
+
+    assert resp.status_code == 503
+    assert fake_server.requests == 2
+
+
+def test_combined_full_analysis_is_one_model_call(fake_server):
+    resp = client.post(
+        "/api/career/full-analysis?combined=true",
+        files={"resume": ("resume.txt", corpus.resume_text("small", seed=7).encode(), "text/plain")},
+        data={"job_title": "Backend Engineer", "company_name": "Acme", "job_description": corpus.job_description()},
+    )
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert len(body["suggestions"]) == 4
+    assert body["rewritten_summary"].startswith("Backend engineer")
+    assert body["cover_letter"].startswith("Dear Hiring Manager")
+    assert body["errors"] == {}
+    assert fake_server.requests == 1
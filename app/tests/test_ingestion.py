@@ -0,0 +1,169 @@
+import asyncio
+import hashlib
+
+from fastapi.testclient import TestClient
+
+from app import ingestion
+from app.ingestion import sniff_content_type
+from app.main import app
+from app.tests.pdf_factory import make_pdf
+
+client = TestClient(app)
+
+
+def test_sniff_content_type():
+    assert sniff_content_type(make_pdf(["Resume"])) == "application/pdf"
+    assert sniff_content_type("Résumé text".encode("utf-8")) == "text/plain"
+    assert sniff_content_type(b"\x89PNG\r\n\x1a\n\x00\x00") is None
+
+
+def test_upload_type_comes_from_content_not_header():
+    pdf = make_pdf(["Backend engineer"])
+
+    resp = client.post(
+        "/api/career/resumes",
+        files={"file": ("resume.txt", pdf, "text/plain")},
+    )
+
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "resume_id": hashlib.sha256(pdf).hexdigest(),
+        "characters": len("Backend engineer"),
+    }
+
+
+def test_binary_upload_is_rejected():
+    resp = client.post(
+        "/api/career/resumes",
+        files={"file": ("resume.pdf", b"\x89PNG\r\n\x1a\n\x00\x00", "application/pdf")},
+    )
+
+    assert resp.status_code == 400
+
+
+def test_oversized_upload_is_rejected_with_413(monkeypatch):
+    monkeypatch.setattr(ingestion.settings, "max_upload_bytes", 1024)
+
+    resp = client.post(
+        "/api/career/resumes",
+        files={"file": ("resume.txt", b"x" * 2048, "text/plain")},
+    )
+
+    assert resp.status_code == 413
+
+
+def test_middleware_rejects_large_content_length_before_reading():
+    received = []
+
+    async def inner_app(scope, receive, send):
+        received.append(scope)
+
+    middleware = ingestion.UploadSizeLimitMiddleware(inner_app, max_bytes=10, max_request_bytes=10)
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        raise AssertionError("body should not be read")
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [
+            (b"content-type", b"multipart/form-data; boundary=x"),
+            (b"content-length", str(10 * 1024 * 1024).encode()),
+        ],
+    }
+
+    asyncio.run(middleware(scope, receive, send))
+
+    assert received == []
+    assert sent[0]["status"] == 413
+
+
+def test_middleware_limits_non_upload_bodies_separately():
+    async def inner_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = ingestion.UploadSizeLimitMiddleware(inner_app, max_bytes=10, max_request_bytes=100)
+
+    def status(content_type: bytes, length: int) -> int:
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        headers = [(b"content-type", content_type), (b"content-length", str(length).encode())]
+        scope = {"type": "http", "method": "POST", "headers": headers}
+        asyncio.run(middleware(scope, receive, send))
+        return sent[0]["status"]
+
+    # A JSON body is not held to the upload limit, only to its own
+    assert status(b"application/json", 50) == 200
+    assert status(b"application/json", 101) == 413
+    # A multipart body may carry the upload on top of the other fields
+    assert status(b"multipart/form-data; boundary=x", 110) == 200
+    assert status(b"multipart/form-data; boundary=x", 111) == 413
+
+
+def test_middleware_rejects_chunked_body_once_it_passes_the_limit():
+    seen = []
+
+    async def inner_app(scope, receive, send):
+        while True:
+            message = await receive()
+            seen.append(message["type"])
+            if message["type"] != "http.request" or not message.get("more_body"):
+                break
+        await send({"type": "http.response.start", "status": 400, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = ingestion.UploadSizeLimitMiddleware(
+        inner_app, max_bytes=0, max_request_bytes=64 * 1024
+    )
+    chunks = [{"type": "http.request", "body": b"x" * 32 * 1024, "more_body": True}] * 10
+    sent = []
+
+    async def receive():
+        return chunks.pop()
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "headers": []}
+    asyncio.run(middleware(scope, receive, send))
+
+    # Two chunks fill the allowance; the third is refused
+    assert seen == ["http.request", "http.request", "http.disconnect"]
+    assert len(chunks) == 7
+    assert [m.get("status") for m in sent if m["type"] == "http.response.start"] == [413]
+
+
+def test_chunked_upload_over_the_limit_gets_413():
+    boundary = "chunkedboundary"
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="resume.txt"\r\n'
+        "Content-Type: text/plain\r\n\r\n"
+    ).encode() + b"x" * (
+        ingestion.settings.max_upload_bytes + ingestion.settings.max_request_bytes + ingestion.CHUNK_SIZE
+    )
+
+    def chunked():
+        for start in range(0, len(body), ingestion.CHUNK_SIZE):
+            yield body[start : start + ingestion.CHUNK_SIZE]
+
+    resp = client.post(
+        "/api/career/resumes",
+        content=chunked(),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+
+    # Refused by the middleware while streaming, not after spooling the upload
+    assert resp.status_code == 413
+    assert resp.text == "Request body too large."
@@ -0,0 +1,143 @@
+import asyncio
+import re
+
+from fastapi.testclient import TestClient
+
+from app import services
+from app.main import app
+from app.services import career_service, feedback_cache_key, hf_client, parse_feedback
+
+client = TestClient(app)
+
+
+def section(number, score=7):
+    return (
+        f"<<<ANSWER {number}>>>\n"
+        f"SCORE: {score}/10\n"
+        "STRENGTHS:\n- Clear structure.\n- Relevant example.\n"
+        "IMPROVEMENTS:\n- Quantify the impact.\n"
+        f"SAMPLE ANSWER: A better answer {number}.\n"
+    )
+
+
+def fake_model(monkeypatch, skip=(), garbled_first=False):
+    """Answer every "### Answer n" in the prompt, leaving out numbers in ``skip`` once.
+
+    With ``garbled_first`` the first call returns text without any sections.
+    """
+    prompts = []
+
+    async def fake_text_generation(prompt, model, max_new_tokens, **kwargs):
+        prompts.append(prompt)
+        if garbled_first and len(prompts) == 1:
+            return "Sure! Here is my evaluation of the answers: they look good."
+        numbers = [int(n) for n in re.findall(r"^### Answer (\d+)$", prompt, re.M)]
+        omitted = skip if len(prompts) == 1 else ()
+        return "".join(section(n, score=n) for n in numbers if n not in omitted) + "<<<DONE>>>"
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", fake_text_generation)
+    return prompts
+
+
+def test_parse_feedback_reads_sections_and_skips_garbled_ones():
+    raw = (
+        section(1, score=8)
+        + "<<<ANSWER 2>>>\nI think this answer was fine.\n"
+        + section(3, score=12)
+        + "<<<DONE>>>\n<<<ANSWER 4>>>\nSCORE: 1"
+    )
+
+    feedback = parse_feedback(raw)
+
+    # Answer 3's score is out of range, so it is left for a retry
+    assert sorted(feedback) == [1]
+    assert feedback[1].score == 8.0
+    assert feedback[1].strengths == ["Clear structure.", "Relevant example."]
+    assert feedback[1].improvements == ["Quantify the impact."]
+    assert feedback[1].suggested_answer == "A better answer 1."
+
+
+def test_feedback_cache_key_keeps_question_and_answer_apart():
+    assert feedback_cache_key("Q\n\nA", "B") != feedback_cache_key("Q", "A\n\nB")
+
+
+def test_generate_feedback_returns_parsed_fields(monkeypatch):
+    fake_model(monkeypatch)
+
+    score, strengths, improvements, suggested = asyncio.run(
+        hf_client.generate_feedback("Tell me about a conflict.", "I listened first.")
+    )
+
+    assert score == 1.0
+    assert strengths == ["Clear structure.", "Relevant example."]
+    assert improvements == ["Quantify the impact."]
+    assert suggested == "A better answer 1."
+
+
+def test_session_is_evaluated_in_batches_and_cached_per_answer(monkeypatch):
+    prompts = fake_model(monkeypatch)
+    answers = [(f"Question {i}?", f"Answer {i}.") for i in range(6)]
+
+    results = asyncio.run(career_service.evaluate_interview(answers + [answers[0]]))
+
+    # Six distinct answers, four per call
+    assert len(prompts) == 2
+    assert [result["status"] for result in results] == ["ok"] * 7
+    assert results[6]["score"] == results[0]["score"]
+    assert [result["index"] for result in results] == list(range(7))
+
+    again = asyncio.run(career_service.evaluate_interview(list(reversed(answers))))
+    assert len(prompts) == 2
+    assert [result["question"] for result in again] == [f"Question {i}?" for i in reversed(range(6))]
+
+
+def test_answers_missing_from_the_output_are_retried(monkeypatch):
+    prompts = fake_model(monkeypatch, skip=(2,))
+    answers = [("Q1?", "A1."), ("Q2?", "A2."), ("Q3?", "")]
+
+    results = asyncio.run(career_service.evaluate_interview(answers))
+
+    assert len(prompts) == 2
+    assert "Q2?" in prompts[1] and "Q1?" not in prompts[1]
+    assert [result["status"] for result in results] == ["ok", "ok", "error"]
+    assert results[2]["error"] == "No answer was given."
+
+
+def test_garbled_output_is_not_cached_and_is_retried(monkeypatch):
+    prompts = fake_model(monkeypatch, garbled_first=True)
+    answers = [("Q1?", "A1."), ("Q2?", "A2.")]
+
+    results = asyncio.run(career_service.evaluate_interview(answers))
+
+    # The retry sends the same prompt, and reaches the model again
+    assert len(prompts) == 2 and prompts[0] == prompts[1]
+    assert [result["status"] for result in results] == ["ok", "ok"]
+
+
+def test_garbled_output_is_not_cached(monkeypatch):
+    prompts = fake_model(monkeypatch, garbled_first=True)
+
+    first = asyncio.run(hf_client.evaluate_answers([("Q1?", "A1.")]))
+    second = asyncio.run(hf_client.evaluate_answers([("Q1?", "A1.")]))
+    third = asyncio.run(hf_client.evaluate_answers([("Q1?", "A1.")]))
+
+    assert first == {}
+    assert second[0].score == 1.0 and third == second
+    # The parsed output was cached; the garbled one was not
+    assert len(prompts) == 2
+
+
+def test_feedback_endpoint(monkeypatch):
+    fake_model(monkeypatch)
+
+    answers = [{"question": "Q1?", "answer": "A1."}, {"question": "Q2?", "answer": "A2."}]
+    resp = client.post("/api/interview/feedback", json={"answers": answers})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [result["score"] for result in body["results"]] == [1.0, 2.0]
+    assert body["average_score"] == 1.5
+
+    too_many = [{"question": "Q?", "answer": "A."}] * (services.settings.feedback_max_answers + 1)
+    assert client.post("/api/interview/feedback", json={"answers": too_many}).status_code == 400
+    assert client.post("/api/interview/feedback", json={"answers": []}).status_code == 400
@@ -0,0 +1,131 @@
+from fastapi.testclient import TestClient
+
+from app import services
+from app.jd_dedup import JobDescriptionIndex, normalize_job_description
+from app.main import app
+
+client = TestClient(app)
+
+POSTING = """Senior Backend Engineer
+About the role
+We are looking for a backend engineer to design, build and operate the APIs behind our payments platform.
+Responsibilities
+• Design and build scalable REST and gRPC services in Python and Go
+• Own services in production on AWS, including monitoring and on-call
+• Work with product and data teams to ship features every week
+• Review code and mentor other engineers on the team
+Requirements
+• 5+ years of experience building backend systems
+• Strong knowledge of PostgreSQL, Redis and message queues such as Kafka
+• Experience with Docker, Kubernetes and infrastructure as code
+• Clear written communication
+"""
+# The same posting as pasted from another job board
+REPOSTED = (
+    POSTING.replace("•", "▪").replace("\n", "  \n\n")
+    + "Apply now\nhttps://jobs.example.com/123?utm_source=board\nPosted 3 days ago\n"
+)
+# ...and with a location line added
+WITH_LOCATION = POSTING + "Location: Remote (US)\n"
+
+
+def index():
+    return JobDescriptionIndex(max_items=100, min_similarity=0.95)
+
+
+def test_normalize_drops_job_board_noise_but_keeps_wording():
+    normalized = normalize_job_description(REPOSTED)
+
+    assert normalized == normalize_job_description(POSTING)
+    assert "- Design and build scalable REST" in normalized
+    assert "Apply now" not in normalized and "utm_source" not in normalized
+    assert normalize_job_description("Ｐｙｔｈｏｎ\u200b developer") == "Python developer"
+
+
+def test_variants_resolve_to_the_first_posting_seen():
+    jds = index()
+
+    first = jds.resolve(POSTING)
+    assert jds.resolve(REPOSTED) is first
+    assert jds.resolve(WITH_LOCATION) is first
+    assert jds.resolve(WITH_LOCATION.upper()) is first
+
+    assert jds.lookups == {"new": 1, "exact": 2, "near": 1}
+    assert first.text == normalize_job_description(POSTING)
+    assert len(first.variant_keys) == 2
+
+
+def test_different_postings_stay_apart():
+    jds = index()
+
+    first = jds.resolve(POSTING)
+    other_stack = jds.resolve(POSTING.replace("Python and Go", "Java and Kotlin"))
+    unrelated = jds.resolve("Data scientist building forecasting models in Python and SQL.")
+
+    assert len({first.id, other_stack.id, unrelated.id}) == 3
+
+
+def test_least_recently_used_postings_are_evicted():
+    jds = JobDescriptionIndex(max_items=2, min_similarity=0.95)
+    first = jds.resolve(POSTING)
+    jds.resolve("Data scientist building forecasting models in Python and SQL.")
+    jds.resolve(POSTING)  # refreshes the first posting
+    jds.resolve("Frontend engineer working in React and TypeScript on design systems.")
+
+    assert len(jds) == 2
+    assert jds.resolve(REPOSTED) is first
+    assert jds.resolve("Data scientist building forecasting models in Python and SQL.") is not None
+    assert len(jds) == 2
+
+
+def test_reposted_job_description_reuses_the_cached_cover_letter(monkeypatch, fresh_jd_index):
+    prompts = []
+
+    async def fake_text_generation(prompt, model, max_new_tokens):
+        prompts.append(prompt)
+        return "Dear Acme, ..."
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", fake_text_generation)
+
+    letters = []
+    for jd in (POSTING, REPOSTED, WITH_LOCATION):
+        resp = client.post(
+            "/api/career/cover-letter",
+            data={"job_title": "Backend Engineer", "company_name": "Acme", "job_description": jd},
+            files={"resume": ("resume.txt", b"Python engineer, JD dedup test.", "text/plain")},
+        )
+        assert resp.status_code == 200
+        letters.append(resp.json()["cover_letter"])
+
+    assert len(prompts) == 1
+    assert letters == ["Dear Acme, ..."] * 3
+    # One lookup per request
+    assert sum(fresh_jd_index.lookups.values()) == 3
+
+    popular = client.get("/api/career/job-descriptions/popular").json()
+    assert len(popular) == 1
+    assert popular[0]["requests"] == 3
+    assert popular[0]["variants"] == 2
+    assert popular[0]["job_title"] == "Backend Engineer"
+    assert popular[0]["preview"].startswith("Senior Backend Engineer")
+
+
+def test_full_analysis_counts_one_lookup(monkeypatch, fresh_jd_index):
+    async def fake_text_generation(prompt, model, max_new_tokens, **kwargs):
+        if kwargs.get("stream"):
+            async def tokens():
+                yield "SUGGESTIONS:\n- One.\n\nSUMMARY: Engineer.\n"
+
+            return tokens()
+        return "Dear Acme, ..."
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", fake_text_generation)
+
+    resp = client.post(
+        "/api/career/full-analysis",
+        data={"job_title": "Backend Engineer", "company_name": "Acme", "job_description": POSTING},
+        files={"resume": ("resume.txt", b"Python engineer, lookup count test.", "text/plain")},
+    )
+
+    assert resp.status_code == 200
+    assert fresh_jd_index.lookups == {"new": 1, "exact": 0, "near": 0}
@@ -0,0 +1,155 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.admission import AdmissionRejected
+from app.jobs import FAILED, RUNNING, SUCCEEDED, JobQueue, JobStore
+from app.main import app
+from app.resilience import UpstreamUnavailable
+from app.services import career_service
+
+LETTER_FORM = {
+    "job_title": "Backend Engineer",
+    "company_name": "Acme",
+    "job_description": "Python and AWS",
+}
+RESUME_FILE = {"resume": ("resume.txt", b"Python developer.", "text/plain")}
+
+
+@pytest.fixture
+def client():
+    # Entering the client runs the lifespan, which starts the job workers
+    with TestClient(app) as client:
+        yield client
+
+
+def _wait_for(client, job_id: str, timeout: float = 5.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        body = client.get(f"/api/career/jobs/{job_id}").json()
+        if body["status"] in (SUCCEEDED, FAILED):
+            return body
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_job_store_round_trip_and_expiry():
+    store = JobStore(":memory:", ttl_seconds=60)
+    job_id = store.create("cover-letter")
+
+    store.update(job_id, RUNNING)
+    assert store.get(job_id).status == RUNNING
+
+    store.update(job_id, SUCCEEDED, result={"cover_letter": "Hi"}, status_code=200)
+    job = store.get(job_id)
+    assert job.result == {"cover_letter": "Hi"}
+    assert job.status_code == 200
+
+    expired = JobStore(":memory:", ttl_seconds=0)
+    assert expired.get(expired.create("cover-letter")) is None
+    assert store.get("missing") is None
+
+
+def test_async_cover_letter_returns_job_then_result(client, monkeypatch):
+    async def fake_generate_cover_letter_from_file(**kwargs):
+        await asyncio.sleep(0.05)
+        return "Dear Acme, ..."
+
+    monkeypatch.setattr(
+        career_service, "generate_cover_letter_from_file", fake_generate_cover_letter_from_file
+    )
+
+    resp = client.post(
+        "/api/career/cover-letter", params={"async": 1}, files=RESUME_FILE, data=LETTER_FORM
+    )
+
+    assert resp.status_code == 202
+    accepted = resp.json()
+    assert accepted["status"] == "queued"
+    assert resp.headers["location"] == accepted["status_url"]
+
+    job = _wait_for(client, accepted["job_id"])
+    assert job["status"] == SUCCEEDED
+    assert job["kind"] == "cover-letter"
+    assert job["result"] == {"cover_letter": "Dear Acme, ..."}
+
+
+def test_failed_job_keeps_the_status_code(client, monkeypatch):
+    async def unavailable(**kwargs):
+        raise UpstreamUnavailable("The language model is busy.")
+
+    monkeypatch.setattr(career_service, "generate_cover_letter_from_file", unavailable)
+
+    resp = client.post(
+        "/api/career/cover-letter?async=1", files=RESUME_FILE, data=LETTER_FORM
+    )
+    job = _wait_for(client, resp.json()["job_id"])
+
+    assert job["status"] == FAILED
+    assert job["status_code"] == 503
+    assert "busy" in job["error"]
+
+
+def test_job_events_stream_status_and_result(client, monkeypatch):
+    async def fake_rewrite_summary_from_file(file_bytes, content_type, job_description, resume_id):
+        await asyncio.sleep(0.05)
+        return "Backend engineer."
+
+    monkeypatch.setattr(career_service, "rewrite_summary_from_file", fake_rewrite_summary_from_file)
+
+    resp = client.post(
+        "/api/career/rewrite-summary-upload?async=1",
+        files={"file": ("resume.txt", b"Python developer.", "text/plain")},
+        data={"job_description": "Backend"},
+    )
+    events_url = resp.json()["events_url"]
+
+    with client.stream("GET", events_url) as stream:
+        body = "".join(stream.iter_text())
+
+    assert "event: status" in body
+    assert 'event: result\ndata: {"rewritten_summary": "Backend engineer."}' in body
+    assert body.rstrip().endswith("event: done\ndata: {}")
+
+
+def test_unknown_job_is_404(client):
+    assert client.get("/api/career/jobs/nope").status_code == 404
+    assert client.get("/api/career/jobs/nope/events").status_code == 404
+
+
+def test_full_queue_rejects_new_jobs():
+    queue = JobQueue(JobStore(":memory:", ttl_seconds=60), workers=0, max_queued=1)
+
+    async def work():
+        return {}
+
+    async def submit_two():
+        queue.submit("test", work)
+        queue.submit("test", work)
+
+    with pytest.raises(AdmissionRejected):
+        asyncio.run(submit_two())
+
+
+def test_stop_fails_jobs_still_queued():
+    store = JobStore(":memory:", ttl_seconds=60)
+    queue = JobQueue(store, workers=1, max_queued=10)
+
+    async def work():
+        await asyncio.sleep(10)
+        return {}
+
+    async def submit_and_stop():
+        job_ids = [queue.submit("test", work) for _ in range(3)]
+        await asyncio.sleep(0)  # let the worker pick up the first job
+        await queue.stop()
+        return job_ids
+
+    job_ids = asyncio.run(submit_and_stop())
+
+    for job_id in job_ids:
+        job = store.get(job_id)
+        assert job.status == FAILED
+        assert job.status_code == 503
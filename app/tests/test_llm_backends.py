@@ -0,0 +1,136 @@
+import asyncio
+import socket
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import services
+from app.llm_backends import OpenAICompatibleBackend
+from app.main import app
+from app.task_profiles import profile_for
+from benchmarks.fake_inference_server import FakeInferenceServer, FakeServerConfig
+
+client = TestClient(app)
+PROFILE = profile_for(None)
+
+
+@pytest.fixture(scope="module")
+def running_servers():
+    with FakeInferenceServer() as first, FakeInferenceServer() as second:
+        yield first, second
+
+
+@pytest.fixture
+def servers(running_servers):
+    """Two fake inference servers with fresh config and request counts."""
+    for server in running_servers:
+        server.config = FakeServerConfig(latency=0)
+        server.requests = 0
+    return running_servers
+
+
+def _unused_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def run(backend, make_coro):
+    async def main():
+        try:
+            return await make_coro()
+        finally:
+            await backend.aclose()
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("api", ["completions", "chat"])
+def test_generate_and_stream(servers, api):
+    backend = OpenAICompatibleBackend([servers[0].url], api=api)
+
+    async def both():
+        text = await backend.generate("Write the letter.", "m", PROFILE)
+        stream = await backend.stream("Write the letter.", "m", PROFILE)
+        return text, [chunk async for chunk in stream]
+
+    text, chunks = run(backend, both)
+
+    assert text.startswith("Dear Hiring Manager")
+    assert len(chunks) > 1 and "".join(chunks) == text
+    assert backend.endpoints[0].in_flight == 0
+
+
+def test_requests_are_spread_across_servers(servers):
+    backend = OpenAICompatibleBackend([server.url for server in servers])
+
+    async def many():
+        await asyncio.gather(*[backend.generate("Write.", "m", PROFILE) for _ in range(10)])
+
+    run(backend, many)
+
+    assert servers[0].requests + servers[1].requests == 10
+    assert servers[0].requests >= 3 and servers[1].requests >= 3
+
+
+def test_unreachable_server_is_taken_out_of_rotation(servers):
+    backend = OpenAICompatibleBackend([_unused_url(), servers[0].url], health_check_seconds=60)
+
+    async def calls():
+        results = []
+        for _ in range(6):
+            try:
+                results.append(await backend.generate("Write.", "m", PROFILE))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    results = run(backend, calls)
+
+    # At most the first call reaches the dead server; the rest avoid it
+    assert sum(isinstance(r, Exception) for r in results) <= 1
+    assert backend.endpoints[0].healthy is False
+    assert servers[0].requests >= 5
+
+
+def test_health_checks_mark_servers_up_and_down(servers):
+    servers[1].config.healthy = False
+    backend = OpenAICompatibleBackend([server.url for server in servers])
+
+    async def checked():
+        await backend.check_health()
+        await asyncio.gather(*[backend.generate("Write.", "m", PROFILE) for _ in range(4)])
+        servers[1].config.healthy = True
+        await backend.check_health()
+
+    run(backend, checked)
+
+    assert servers[1].requests == 0
+    assert [endpoint.healthy for endpoint in backend.endpoints] == [True, True]
+
+
+def test_early_closed_stream_releases_the_endpoint(servers):
+    backend = OpenAICompatibleBackend([servers[0].url])
+
+    async def unread():
+        stream = await backend.stream("Write.", "m", PROFILE)
+        await stream.aclose()
+
+    run(backend, unread)
+
+    assert backend.endpoints[0].in_flight == 0
+
+
+def test_career_endpoint_uses_the_configured_backend(servers, monkeypatch):
+    backend = OpenAICompatibleBackend([server.url for server in servers])
+    monkeypatch.setattr(services, "llm_backend", backend)
+
+    resp = client.post(
+        "/api/career/smart-resume-upload",
+        files={"file": ("resume.txt", b"Python engineer, backend test.", "text/plain")},
+        data={"job_description": "Backend role"},
+    )
+
+    assert resp.status_code == 200
+    assert len(resp.json()["suggestions"]) == 4
+    assert servers[0].requests + servers[1].requests == 1
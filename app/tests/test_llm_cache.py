@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from app import services
+from app.resilience import UpstreamError
+from app.llm_cache import SQLiteLLMCache, cache_enabled, make_cache_key
+
+
+def test_cache_key_depends_on_model_prompt_and_params():
+    key = make_cache_key("model-a", "prompt", {"max_new_tokens": 700})
+
+    assert key == make_cache_key("model-a", "prompt", {"max_new_tokens": 700})
+    assert key != make_cache_key("model-b", "prompt", {"max_new_tokens": 700})
+    assert key != make_cache_key("model-a", "prompt!", {"max_new_tokens": 700})
+    assert key != make_cache_key("model-a", "prompt", {"max_new_tokens": 100})
+
+
+def test_call_model_serves_repeat_prompts_from_cache(monkeypatch, fresh_llm_cache):
+    calls = []
+
+    async def fake_text_generation(prompt, model, max_new_tokens):
+        calls.append(prompt)
+        return "generated"
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", fake_text_generation)
+
+    async def call_twice():
+        return [await services.hf_client._call_model("same prompt") for _ in range(2)]
+
+    assert asyncio.run(call_twice()) == ["generated", "generated"]
+    assert len(calls) == 1
+    assert fresh_llm_cache.stats() == {"backend": "memory", "hits": 1, "misses": 1}
+
+
+def test_failed_calls_are_not_cached(monkeypatch, fresh_llm_cache):
+    async def failing_text_generation(prompt, model, max_new_tokens):
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", failing_text_generation)
+
+    with pytest.raises(UpstreamError):
+        asyncio.run(services.hf_client._call_model("failing prompt"))
+
+    assert fresh_llm_cache.get(services.hf_client._cache_key("failing prompt")) is None
+
+
+def test_opt_out_skips_cache(fresh_llm_cache):
+    fresh_llm_cache.set("key", "value")
+
+    token = cache_enabled.set(False)
+    try:
+        assert fresh_llm_cache.get("key") is None
+    finally:
+        cache_enabled.reset(token)
+
+    assert fresh_llm_cache.get("key") == "value"
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = SQLiteLLMCache(path, max_items=10, ttl_seconds=60)
+    reader = SQLiteLLMCache(path, max_items=10, ttl_seconds=60)
+
+    writer.set("key", "value")
+
+    assert reader.get("key") == "value"
+    assert reader.stats()["hits"] == 1
+
+
+def test_sqlite_cache_trims_to_max_items(tmp_path):
+    cache = SQLiteLLMCache(str(tmp_path / "cache.sqlite3"), max_items=2, ttl_seconds=60)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
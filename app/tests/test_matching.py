@@ -0,0 +1,110 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.matching import MatchIndex, MatchingEngine, term_frequencies
+
+client = TestClient(app)
+
+RESUMES = {
+    "backend": "Python developer. FastAPI, PostgreSQL, Docker and Kubernetes on AWS.",
+    "frontend": "Frontend engineer. React, TypeScript, CSS and accessibility.",
+    "data": "Data scientist. Python, pandas, scikit-learn and machine learning models.",
+}
+
+
+def _index(engine: MatchingEngine) -> None:
+    for resume_id, text in RESUMES.items():
+        engine.resumes.add(resume_id, text)
+    engine.jobs.add("api", "Backend engineer: Python, FastAPI, Kubernetes, AWS", {"job_title": "API"})
+    engine.jobs.add("ui", "React and TypeScript developer for our web app", {"job_title": "UI"})
+
+
+def test_ranks_resumes_for_a_job_and_jobs_for_a_resume():
+    engine = MatchingEngine()
+    _index(engine)
+
+    resumes = engine.rank_resumes_for_job("api", k=3)
+    jobs = engine.rank_jobs_for_resume("frontend", k=2)
+
+    assert [resume_id for resume_id, _ in resumes][0] == "backend"
+    assert resumes[0][1] > resumes[1][1] >= resumes[2][1]
+    assert [job_id for job_id, _ in jobs] == ["ui", "api"]
+    assert engine.rank_jobs_for_resume("missing") is None
+
+
+def test_batched_ranking_matches_single_queries():
+    engine = MatchingEngine()
+    _index(engine)
+
+    batched = engine.rank_resumes_for_jobs(["api", "ui", "missing"], k=3)
+
+    assert set(batched) == {"api", "ui"}
+    assert batched["api"] == engine.rank_resumes_for_job("api", k=3)
+    assert batched["ui"] == engine.rank_resumes_for_job("ui", k=3)
+
+
+def test_remove_and_re_add_update_document_frequencies():
+    index = MatchIndex("resumes")
+    index.add("a", "python kafka")
+    index.add("b", "python react")
+    df_before = index.df.copy()
+
+    assert index.remove("b")
+    assert not index.remove("b")
+    index.add("a", "python kafka")  # re-adding replaces the old row
+
+    assert len(index) == 1
+    assert index.df.sum() == df_before.sum() - 2
+    assert [doc_id for doc_id, _ in index.search_text("python", k=5)] == ["a"]
+
+
+def test_save_and_load_memory_mapped(tmp_path):
+    engine = MatchingEngine(str(tmp_path))
+    _index(engine)
+    engine.resumes.remove("data")
+    engine.save()
+
+    loaded = MatchingEngine(str(tmp_path))
+
+    assert len(loaded.resumes) == 2
+    assert loaded.rank_resumes_for_job("api", k=2) == engine.rank_resumes_for_job("api", k=2)
+    assert loaded.jobs.meta_for("ui") == {"job_title": "UI"}
+
+    # Still writable after loading
+    loaded.resumes.add("data", RESUMES["data"])
+    assert len(loaded.resumes) == 3
+
+
+def test_empty_text_has_no_features():
+    assert term_frequencies("").nnz == 0
+
+
+def test_matching_endpoints():
+    resp = client.post(
+        "/api/matching/resumes",
+        files={"file": ("resume.txt", RESUMES["backend"].encode(), "text/plain")},
+    )
+    assert resp.status_code == 200
+    resume_id = resp.json()["id"]
+
+    resp = client.post(
+        "/api/matching/jobs",
+        json=[
+            {"job_id": "api", "job_title": "API", "job_description": "Python, FastAPI and AWS"},
+            {"job_title": "UI", "job_description": "React and TypeScript"},
+        ],
+    )
+    assert resp.status_code == 200
+    assert [doc["id"] for doc in resp.json()][0] == "api"
+
+    resp = client.get(f"/api/matching/resumes/{resume_id}/jobs", params={"k": 5})
+    assert resp.status_code == 200
+    top = resp.json()["matches"][0]
+    assert top["id"] == "api" and top["job_title"] == "API" and top["score"] > 0
+
+    resp = client.get("/api/matching/jobs/api/resumes")
+    assert [match["id"] for match in resp.json()["matches"]] == [resume_id]
+
+    assert client.delete(f"/api/matching/resumes/{resume_id}").status_code == 204
+    assert client.get(f"/api/matching/resumes/{resume_id}/jobs").status_code == 404
+    assert client.post("/api/matching/resumes", data={"resume_id": "nope"}).status_code == 404
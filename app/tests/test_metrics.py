@@ -0,0 +1,74 @@
+from fastapi.testclient import TestClient
+
+from app import services
+from app.main import app
+from app.metrics import LLM_CALLS, LLM_FALLBACKS, stage
+
+client = TestClient(app)
+
+
+def _sample(metric, **labels) -> float:
+    for family in metric.collect():
+        for sample in family.samples:
+            if sample.name.endswith("_total") and sample.labels == labels:
+                return sample.value
+    return 0.0
+
+
+def test_stage_outside_a_request_is_a_no_op():
+    with stage("parse"):
+        pass
+
+
+def test_server_timing_header_lists_request_stages(monkeypatch):
+    async def fake_text_generation(prompt, model, max_new_tokens, stream, stop):
+        async def tokens():
+            yield "SUMMARY: Backend engineer."
+
+        return tokens()
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", fake_text_generation)
+
+    resp = client.post(
+        "/api/career/rewrite-summary-upload",
+        # Not uploaded by any other test, so extraction is not skipped
+        files={"file": ("resume.txt", b"Python developer, metrics test.", "text/plain")},
+        data={"job_description": "Backend role"},
+    )
+
+    assert resp.status_code == 200
+    timing = resp.headers["server-timing"]
+    for name in ("upload", "extract", "prompt", "llm", "parse", "total"):
+        assert f"{name};dur=" in timing
+
+
+def test_metrics_endpoint_reports_stages_and_llm_paths(monkeypatch):
+    async def conversational_only(prompt, model, max_new_tokens, stream, stop):
+        raise ValueError("Model is not supported for task text-generation, only conversational")
+
+    async def fake_chat_completion(model, messages, max_tokens, stream, stop):
+        async def chunks():
+            yield {"choices": [{"delta": {"content": "SUMMARY: Chat summary."}}]}
+
+        return chunks()
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", conversational_only)
+    monkeypatch.setattr(services.hf_text_client, "chat_completion", fake_chat_completion)
+    model = services.settings.hf_model_id
+    chat_before = _sample(LLM_CALLS, model=model, api="chat_completion", outcome="ok")
+    fallbacks_before = _sample(LLM_FALLBACKS, kind="chat_completion")
+
+    resp = client.post(
+        "/api/career/rewrite-summary-upload",
+        files={"file": ("resume.txt", b"Go developer.", "text/plain")},
+        data={"job_description": "Platform role"},
+    )
+    assert resp.status_code == 200
+
+    assert _sample(LLM_CALLS, model=model, api="chat_completion", outcome="ok") == chat_before + 1
+    assert _sample(LLM_FALLBACKS, kind="chat_completion") == fallbacks_before + 1
+
+    body = client.get("/metrics").text
+    assert 'career_stage_seconds_count{endpoint="/api/career/rewrite-summary-upload",stage="llm"}' in body
+    assert "career_llm_tokens_bucket" in body
+    assert "career_http_requests_in_flight" in body
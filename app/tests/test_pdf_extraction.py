@@ -0,0 +1,131 @@
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app import pdf_extraction
+from app.pdf_extraction import (
+    PdfExtractionError,
+    PdfExtractionTimeout,
+    PdfWorkersUnavailable,
+    extract_pdf_text,
+    extract_text_from_pdf,
+)
+from app.tests.pdf_factory import make_pdf
+
+
+def test_extract_text_from_pdf_joins_pages():
+    pdf = make_pdf(["Backend engineer", "Python and APIs"])
+
+    assert extract_text_from_pdf(pdf) == "Backend engineer\nPython and APIs"
+
+
+def test_extract_text_from_pdf_honours_limits():
+    pdf = make_pdf([f"Page {i}" for i in range(5)])
+
+    assert extract_text_from_pdf(pdf, max_pages=2) == "Page 0\nPage 1"
+    assert extract_text_from_pdf(pdf, max_chars=4) == "Page"
+
+
+def test_pool_extraction_fans_out_long_documents(monkeypatch):
+    monkeypatch.setattr(pdf_extraction.settings, "pdf_pages_per_worker", 2)
+    monkeypatch.setattr(pdf_extraction.settings, "pdf_max_pages", 5)
+    pdf = make_pdf([f"Page {i}" for i in range(7)])
+
+    try:
+        text = asyncio.run(extract_pdf_text(pdf))
+    finally:
+        pdf_extraction.shutdown_pool()
+
+    assert text == "\n".join(f"Page {i}" for i in range(5))
+
+
+def test_pool_extraction_rejects_invalid_pdf():
+    try:
+        with pytest.raises(PdfExtractionError):
+            asyncio.run(extract_pdf_text(b"%PDF-1.4 not really a pdf"))
+    finally:
+        pdf_extraction.shutdown_pool()
+
+
+def test_pool_extraction_times_out(monkeypatch):
+    async def slow_extract(pool, file_bytes):
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(pdf_extraction, "_extract_in_pool", slow_extract)
+    monkeypatch.setattr(pdf_extraction.settings, "pdf_timeout_seconds", 0.01)
+
+    with pytest.raises(PdfExtractionTimeout):
+        asyncio.run(extract_pdf_text(b"%PDF-1.4"))
+
+
+def test_reset_only_kills_the_pool_it_was_given():
+    stale = pdf_extraction._get_pool()
+    pdf_extraction._reset_pool(stale)
+    current = pdf_extraction._get_pool()
+
+    try:
+        # A request that used the old pool gives up late
+        pdf_extraction._reset_pool(stale)
+        assert pdf_extraction._get_pool() is current
+    finally:
+        pdf_extraction.shutdown_pool()
+
+
+def test_pool_broken_by_another_upload_is_retried(monkeypatch):
+    used = []
+
+    async def extract(pool, file_bytes):
+        used.append(pool)
+        if len(used) == 1:
+            # Another upload timed out and reset the pool under us
+            pdf_extraction._reset_pool(pool)
+            raise BrokenProcessPool("terminated")
+        return "Resume text"
+
+    monkeypatch.setattr(pdf_extraction, "_extract_in_pool", extract)
+
+    try:
+        assert asyncio.run(extract_pdf_text(b"%PDF-1.4")) == "Resume text"
+    finally:
+        pdf_extraction.shutdown_pool()
+
+    assert len(used) == 2 and used[0] is not used[1]
+
+
+def test_pool_that_keeps_breaking_is_a_server_error(monkeypatch):
+    async def broken(pool, file_bytes):
+        raise BrokenProcessPool("terminated")
+
+    monkeypatch.setattr(pdf_extraction, "_extract_in_pool", broken)
+
+    try:
+        with pytest.raises(PdfWorkersUnavailable):
+            asyncio.run(extract_pdf_text(b"%PDF-1.4"))
+    finally:
+        pdf_extraction.shutdown_pool()
+
+
+def test_pool_shut_down_before_submit_is_retried():
+    pool = pdf_extraction._get_pool()
+    # Shut down under a request that already picked it up
+    pool.shutdown(wait=False)
+
+    try:
+        text = asyncio.run(extract_pdf_text(make_pdf(["Hello resume"])))
+    finally:
+        pdf_extraction.shutdown_pool()
+
+    assert "Hello resume" in text
+
+
+def test_pool_that_stays_shut_down_is_a_server_error(monkeypatch):
+    def shut_down_pool():
+        pool = pdf_extraction.ProcessPoolExecutor(max_workers=1)
+        pool.shutdown(wait=False)
+        return pool
+
+    monkeypatch.setattr(pdf_extraction, "_get_pool", shut_down_pool)
+
+    with pytest.raises(PdfWorkersUnavailable):
+        asyncio.run(extract_pdf_text(b"%PDF-1.4"))
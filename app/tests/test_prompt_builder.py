@@ -0,0 +1,68 @@
+import pytest
+
+from app import prompt_builder
+from app.prompt_builder import count_tokens, fit_resume_to_budget
+from app.resume_sections import split_sections
+
+RESUME = """Jane Doe
+jane@example.com
+
+SUMMARY
+Backend engineer who builds Python APIs.
+
+EXPERIENCE
+- Built REST APIs in Python and FastAPI serving 2M requests a day.
+- Organised the office book club and holiday party.
+- Migrated batch jobs to AWS Lambda, cutting cost by 40%.
+
+Skills: Python, FastAPI, PostgreSQL, AWS
+
+EDUCATION
+B.Sc. Computer Science, State University
+"""
+
+
+@pytest.fixture(autouse=True)
+def estimated_tokens(monkeypatch):
+    monkeypatch.setattr(prompt_builder.settings, "prompt_use_model_tokenizer", False)
+    prompt_builder._model_tokenizer.cache_clear()
+    yield
+    prompt_builder._model_tokenizer.cache_clear()
+
+
+def test_split_sections_recognises_headings():
+    sections = split_sections(RESUME)
+
+    assert sections["header"] == "Jane Doe\njane@example.com"
+    assert sections["summary"] == "Backend engineer who builds Python APIs."
+    assert sections["skills"] == "Python, FastAPI, PostgreSQL, AWS"
+    assert sections["experience"].count("\n") == 2
+    assert sections["education"].startswith("B.Sc.")
+
+
+def test_short_resume_is_sent_unchanged():
+    assert fit_resume_to_budget("cover_letter", RESUME, "Python backend role") == RESUME
+
+
+def test_long_resume_keeps_most_relevant_sections(monkeypatch):
+    budget = prompt_builder.TASK_BUDGETS["rewrite_summary"]
+    monkeypatch.setitem(
+        prompt_builder.TASK_BUDGETS,
+        "rewrite_summary",
+        prompt_builder.PromptBudget(resume_tokens=45, sections=budget.sections),
+    )
+
+    fitted = fit_resume_to_budget(
+        "rewrite_summary",
+        RESUME,
+        "We need a Python engineer to build REST APIs with FastAPI.",
+    )
+
+    # Section labels add a few tokens on top of the content budget
+    assert count_tokens(fitted) <= 55
+    assert "Backend engineer who builds Python APIs." in fitted
+    assert "Python, FastAPI, PostgreSQL, AWS" in fitted
+    assert "Built REST APIs in Python" in fitted
+    assert "book club" not in fitted
+    assert "State University" not in fitted
+    assert fitted.index("SUMMARY:") < fitted.index("SKILLS:") < fitted.index("EXPERIENCE:")
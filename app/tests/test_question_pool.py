@@ -0,0 +1,173 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import question_pool as question_pool_module
+from app import services
+from app.main import app
+from app.question_pool import QuestionPool, QuestionStore, normalize_role, pool_key
+from app.resilience import UpstreamUnavailable
+
+SPEC = ("Backend Engineer", "technical", "medium")
+
+
+@pytest.fixture
+def client():
+    # Entering the client runs the lifespan, which starts the refill workers
+    with TestClient(app) as client:
+        yield client
+
+
+def fake_batches(monkeypatch, batches):
+    """Make generate_questions return the given batches in turn, then nothing new."""
+    calls = []
+
+    async def generate_questions(role, interview_type, difficulty, avoid=()):
+        calls.append(list(avoid))
+        return batches[len(calls) - 1] if len(calls) <= len(batches) else batches[-1]
+
+    monkeypatch.setattr(question_pool_module.hf_client, "generate_questions", generate_questions)
+    return calls
+
+
+def test_store_deduplicates_and_pops_oldest_first():
+    store = QuestionStore(":memory:", seen_ttl_seconds=60)
+    key = pool_key(*SPEC)
+
+    assert store.add(key, ["What is a B-tree?", "what is a b tree", "Explain CAP."]) == 2
+    assert store.available(key) == 2
+    assert store.pop(key) == "What is a B-tree?"
+
+    # Served questions still count as seen
+    assert store.add(key, ["What is a B-tree??"]) == 0
+    assert store.pop(key) == "Explain CAP."
+    assert store.pop(key) is None
+    assert store.pop(pool_key("Data Engineer", "technical", "medium")) is None
+
+
+def test_pool_key_ignores_case_spacing_and_seniority():
+    assert pool_key(" backend  engineer", "Technical", "MEDIUM") == pool_key(*SPEC)
+    assert pool_key("Sr. Backend Engineer II", "technical", "medium") == pool_key(*SPEC)
+    assert normalize_role("C++ Developer") == "c++ developer"
+    assert normalize_role("Lead") == "lead"
+
+
+def test_store_keeps_only_the_most_recently_used_pools():
+    store = QuestionStore(":memory:", seen_ttl_seconds=60)
+    for role in ("first", "second", "third"):
+        store.add(pool_key(role, "technical", "easy"), [f"{role} question?"])
+
+    store.evict_pools(keep=2)
+
+    assert store.available(pool_key("first", "technical", "easy")) == 0
+    assert store.available(pool_key("third", "technical", "easy")) == 1
+
+
+def test_cold_pool_generates_one_batch_then_refills_in_background(monkeypatch):
+    batches = [[f"Question {i}?" for i in range(start, start + 3)] for start in (0, 3, 6)]
+    calls = fake_batches(monkeypatch, batches)
+    pool = QuestionPool(
+        QuestionStore(":memory:", 60), low_water=3, target=6, workers=1, refill_after=1
+    )
+
+    async def main():
+        served = [await pool.next_question(*SPEC)]
+        await pool._queue.join()
+        served.append(await pool.next_question(*SPEC))
+        await pool.stop()
+        return served
+
+    served = asyncio.run(main())
+
+    assert served == [("Question 0?", False), ("Question 1?", True)]
+    # Cold batch, then the background refill up to the target
+    assert len(calls) == 3
+    assert "Question 0?" in calls[1]
+    assert pool.cold_misses == 1 and pool.generated == 3 + 3 + 1
+
+
+def test_pools_are_only_refilled_after_repeat_requests(monkeypatch):
+    calls = fake_batches(monkeypatch, [[f"Question {i}?" for i in range(3)]])
+    pool = QuestionPool(
+        QuestionStore(":memory:", 60), low_water=3, target=6, workers=0, refill_after=2
+    )
+
+    async def main():
+        pool.start()
+        # A role asked for once costs a single batch
+        for role in ("Role A", "Role B", "Role C"):
+            await pool.next_question(role, "technical", "easy")
+        queued_after_one_request = pool._queue.qsize()
+        await pool.next_question("Role A", "technical", "easy")
+        queued_after_repeat = pool._queue.qsize()
+        await pool.stop()
+        return queued_after_one_request, queued_after_repeat
+
+    assert asyncio.run(main()) == (0, 1)
+    assert len(calls) == 3
+
+
+def test_refill_queue_is_bounded(monkeypatch):
+    pool = QuestionPool(
+        QuestionStore(":memory:", 60), low_water=1, target=5, workers=0, max_queued=2
+    )
+
+    async def main():
+        for role in ("a", "b", "c", "a"):
+            pool.schedule_refill(role, "technical", "easy")
+        queued = pool._queue.qsize()
+        await pool.stop()
+        return queued
+
+    assert asyncio.run(main()) == 2
+    assert pool.dropped_refills == 1
+
+
+def test_refill_stops_when_the_model_only_repeats_itself(monkeypatch):
+    calls = fake_batches(monkeypatch, [["Same question?"]])
+    pool = QuestionPool(QuestionStore(":memory:", 60), low_water=1, target=5, workers=1)
+
+    added = asyncio.run(pool.refill(*SPEC))
+
+    assert added == 1
+    assert len(calls) == 2
+    assert pool.duplicates == 1
+
+
+def test_empty_generation_is_an_upstream_error(monkeypatch):
+    fake_batches(monkeypatch, [[]])
+    pool = QuestionPool(QuestionStore(":memory:", 60), low_water=1, target=5, workers=1)
+
+    with pytest.raises(UpstreamUnavailable):
+        asyncio.run(pool.next_question(*SPEC))
+
+
+def test_questions_endpoint_serves_parsed_questions(client, monkeypatch):
+    async def fake_text_generation(prompt, model, max_new_tokens, stream, stop):
+        async def tokens():
+            yield "QUESTIONS:\n"
+            for i in range(1, 9):
+                yield f"- How would you design service {i}?\n"
+
+        return tokens()
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", fake_text_generation)
+    body = {"role": "Backend Engineer", "interview_type": "technical", "difficulty": "medium"}
+
+    first = client.post("/api/interview/questions", json=body)
+    second = client.post("/api/interview/questions", json=body)
+
+    assert first.status_code == 200 and second.status_code == 200
+    assert first.json()["question"] == "How would you design service 1?"
+    assert first.json()["from_pool"] is False
+    assert second.json()["question"] == "How would you design service 2?"
+    assert second.json()["from_pool"] is True
+
+
+def test_questions_endpoint_validates_type_and_difficulty(client):
+    resp = client.post(
+        "/api/interview/questions",
+        json={"role": "Backend Engineer", "difficulty": "impossible"},
+    )
+    assert resp.status_code == 422
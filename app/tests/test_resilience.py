@@ -0,0 +1,159 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import services
+from app.main import app
+from app.resilience import (
+    CircuitBreaker,
+    UpstreamTimeout,
+    UpstreamUnavailable,
+    backoff_delay,
+    parse_retry_after,
+)
+
+client = TestClient(app)
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeHTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = FakeResponse(status_code, headers)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+
+def test_backoff_is_jittered_capped_and_honours_retry_after():
+    for attempt in range(10):
+        assert 0 <= backoff_delay(attempt, base=0.5, cap=4.0) <= 4.0
+    assert backoff_delay(0, base=0.5, cap=4.0, retry_after=3) == 3
+    # Longer than the cap: give up rather than retry early
+    assert backoff_delay(0, base=0.5, cap=4.0, retry_after=30) is None
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    breaker.opened_at -= 61
+    assert breaker.allow()       # one trial call
+    assert not breaker.allow()   # ...and only one
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_call_model_retries_retryable_errors(monkeypatch):
+    attempts = []
+
+    async def flaky_text_generation(prompt, model, max_new_tokens):
+        attempts.append(model)
+        if len(attempts) < 3:
+            raise FakeHTTPError(503, {"retry-after": "0"})
+        return "generated"
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", flaky_text_generation)
+
+    assert asyncio.run(services.hf_client._call_model("retry prompt")) == "generated"
+    assert len(attempts) == 3
+
+
+def test_call_model_falls_back_to_next_model(monkeypatch):
+    monkeypatch.setattr(services.settings, "hf_fallback_model_ids", ["backup/model"])
+    attempts = []
+
+    async def text_generation(prompt, model, max_new_tokens):
+        attempts.append(model)
+        if model != "backup/model":
+            raise FakeHTTPError(404)
+        return "from backup"
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", text_generation)
+
+    assert asyncio.run(services.hf_client._call_model("fallback prompt")) == "from backup"
+    # 404 is not retried on the primary
+    assert attempts == [services.settings.hf_model_id, "backup/model"]
+
+
+def test_call_model_times_out(monkeypatch):
+    monkeypatch.setattr(services.settings, "llm_timeout_seconds", 0.01)
+    monkeypatch.setattr(services.settings, "llm_max_retries", 0)
+
+    async def slow_text_generation(prompt, model, max_new_tokens):
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", slow_text_generation)
+
+    with pytest.raises(UpstreamTimeout):
+        asyncio.run(services.hf_client._call_model("slow prompt"))
+
+
+def test_open_circuit_fails_fast(monkeypatch):
+    monkeypatch.setattr(services.settings, "llm_max_retries", 0)
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+    breaker.record_failure()
+    services.circuit_breakers[services.settings.hf_model_id] = breaker
+
+    async def unexpected_call(prompt, model, max_new_tokens):
+        raise AssertionError("upstream should not be called")
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", unexpected_call)
+
+    with pytest.raises(UpstreamUnavailable):
+        asyncio.run(services.hf_client._call_model("circuit prompt"))
+
+
+def test_long_retry_after_fails_fast_and_reaches_the_client(monkeypatch):
+    monkeypatch.setattr(services.settings, "llm_max_retries", 2)
+    monkeypatch.setattr(services.settings, "llm_retry_max_delay", 8.0)
+    attempts = []
+
+    async def rate_limited(prompt, model, max_new_tokens):
+        attempts.append(model)
+        raise FakeHTTPError(429, {"retry-after": "30"})
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", rate_limited)
+
+    with pytest.raises(UpstreamUnavailable) as excinfo:
+        asyncio.run(services.hf_client._call_model("rate limited prompt"))
+
+    assert len(attempts) == 1
+    assert excinfo.value.retry_after == 30
+
+
+def test_upstream_failure_maps_to_http_error_with_retry_after(monkeypatch):
+    monkeypatch.setattr(services.settings, "llm_max_retries", 0)
+
+    async def rate_limited(prompt, model, max_new_tokens):
+        raise FakeHTTPError(429, {"retry-after": "12"})
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", rate_limited)
+
+    resp = client.post(
+        "/api/career/cover-letter",
+        files={"resume": ("resume.txt", b"Python resume.", "text/plain")},
+        data={
+            "job_title": "SWE",
+            "company_name": "CoolTech Inc",
+            "job_description": "Python.",
+        },
+    )
+
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "12"
@@ -0,0 +1,46 @@
+import asyncio
+
+from app import services
+from app.resume_store import ResumeStore
+from app.services import career_service
+
+
+def test_store_evicts_least_recently_used():
+    store = ResumeStore(max_items=2, ttl_seconds=60)
+    store.put("a", "A")
+    store.put("b", "B")
+    assert store.get("a") == "A"
+
+    store.put("c", "C")
+
+    assert store.get("b") is None
+    assert store.get("a") == "A"
+    assert store.get("c") == "C"
+
+
+def test_store_expires_entries():
+    store = ResumeStore(max_items=2, ttl_seconds=-1)
+    store.put("a", "A")
+
+    assert store.get("a") is None
+    assert len(store) == 0
+
+
+def test_load_resume_parses_each_file_once(monkeypatch):
+    calls = []
+
+    async def fake_extract_resume_text(file_bytes, content_type):
+        calls.append(file_bytes)
+        return "Parsed resume"
+
+    monkeypatch.setattr(services, "extract_resume_text", fake_extract_resume_text)
+
+    async def load_twice():
+        first = await career_service.load_resume(b"%PDF-unique-bytes", "application/pdf")
+        second = await career_service.load_resume(b"%PDF-unique-bytes", "application/pdf")
+        return first, second
+
+    first, second = asyncio.run(load_twice())
+
+    assert first == second
+    assert len(calls) == 1
@@ -0,0 +1,141 @@
+import asyncio
+import time
+
+from app import services
+from app.services import career_service
+
+
+def test_call_model_runs_generations_concurrently(monkeypatch):
+    async def fake_text_generation(prompt, model, max_new_tokens, stream, stop):
+        await asyncio.sleep(0.2)
+
+        async def tokens():
+            yield "SUGGESTIONS:\n- Quantify your API work."
+
+        return tokens()
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", fake_text_generation)
+
+    async def run():
+        return await asyncio.gather(
+            *[
+                career_service.improve_resume_from_file(
+                    file_bytes=b"Backend engineer",
+                    content_type="text/plain",
+                    job_description=f"Backend role {i}",
+                )
+                for i in range(10)
+            ]
+        )
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    assert results == [["Quantify your API work."]] * 10
+    # Ten 0.2 s generations overlap instead of running back to back.
+    assert elapsed < 1.0
+
+
+def test_stream_model_falls_back_to_chat_completion(monkeypatch):
+    async def fake_text_generation(prompt, model, max_new_tokens, stream):
+        raise ValueError("Model is only supported for task 'conversational'.")
+
+    async def fake_chat_completion(model, messages, max_tokens, stream):
+        async def chunks():
+            for piece in ["Dear ", "Hiring ", "Manager"]:
+                yield {"choices": [{"delta": {"content": piece}}]}
+
+        return chunks()
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", fake_text_generation)
+    monkeypatch.setattr(services.hf_text_client, "chat_completion", fake_chat_completion)
+
+    async def collect():
+        return [chunk async for chunk in services.hf_client._stream_model("prompt")]
+
+    assert asyncio.run(collect()) == ["Dear ", "Hiring ", "Manager"]
+
+
+def test_batch_generation_respects_concurrency_limit(monkeypatch):
+    running = 0
+    peak = 0
+
+    async def fake_generate_cover_letter_from_text(**kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "letter"
+
+    monkeypatch.setattr(
+        career_service,
+        "generate_cover_letter_from_text",
+        fake_generate_cover_letter_from_text,
+    )
+
+    jobs = [
+        {"job_title": "SWE", "company_name": f"Company {i}", "job_description": "JD"}
+        for i in range(10)
+    ]
+
+    async def collect():
+        return [
+            result
+            async for result in career_service.generate_cover_letters_batch(
+                resume_text="resume", jobs=jobs, concurrency=3
+            )
+        ]
+
+    results = asyncio.run(collect())
+
+    assert sorted(r["index"] for r in results) == list(range(10))
+    assert peak == 3
+
+
+def test_task_prompts_share_a_byte_identical_prefix():
+    resume = "SUMMARY\nBackend engineer.\nEXPERIENCE\n- Built Python APIs.\nSKILLS\nPython, AWS"
+    jd = "Python backend role"
+    prompts = [
+        services.HuggingFaceClient._improve_resume_prompt(resume, jd),
+        services.HuggingFaceClient._summary_prompt(resume, jd),
+        services.HuggingFaceClient._cover_letter_prompt("SWE", "Acme", jd, resume, "professional"),
+        services.HuggingFaceClient._combined_prompt("SWE", "Acme", jd, resume, "professional"),
+    ]
+
+    prefix = services.context_prefix("cover_letter", resume, jd)
+    assert all(prompt.startswith(prefix) for prompt in prompts)
+    assert resume in prefix and jd in prefix
+
+
+def test_combined_full_analysis_regenerates_missing_parts(monkeypatch):
+    prompts = []
+
+    async def fake_call_model(prompt, task=None):
+        prompts.append(task)
+        if task == "full_analysis":
+            # No cover letter section
+            return "<<<SUGGESTIONS>>>\n- Add metrics.\n<<<SUMMARY>>>\nSUMMARY: Engineer.\n<<<END>>>"
+        return "Dear Hiring Manager"
+
+    monkeypatch.setattr(services.hf_client, "_call_model", fake_call_model)
+
+    analysis = asyncio.run(
+        career_service.full_analysis_from_text(
+            resume_text="resume",
+            job_title="SWE",
+            company_name="Acme",
+            job_description="JD",
+            tone="professional",
+            combined=True,
+        )
+    )
+
+    assert analysis == {
+        "errors": {},
+        "suggestions": ["Add metrics."],
+        "rewritten_summary": "Engineer.",
+        "cover_letter": "Dear Hiring Manager",
+    }
+    assert prompts == ["full_analysis", "cover_letter"]
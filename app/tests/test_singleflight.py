@@ -0,0 +1,129 @@
+import asyncio
+import time
+
+import pytest
+
+from app import services
+from app.deadlines import DeadlineExceeded, _deadline
+from app.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def run():
+        return await asyncio.gather(*[flight.do("key", work) for _ in range(5)])
+
+    assert asyncio.run(run()) == ["result"] * 5
+    assert calls == 1
+    assert flight.stats() == {"in_flight": 0, "coalesced": 4}
+
+
+def test_errors_reach_every_waiter_and_key_is_released():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def run():
+        results = await asyncio.gather(
+            *[flight.do("key", fail) for _ in range(3)],
+            return_exceptions=True,
+        )
+        # A later call starts a fresh execution
+        later = await flight.do("key", lambda: asyncio.sleep(0, result="ok"))
+        return results, later
+
+    results, later = asyncio.run(run())
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert later == "ok"
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_shared_task_is_cancelled_when_all_waiters_leave():
+    flight = SingleFlight()
+    cancelled = False
+
+    async def slow():
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    async def run():
+        waiter = asyncio.create_task(flight.do("key", slow))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    assert cancelled
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_call_model_coalesces_identical_prompts(monkeypatch):
+    calls = 0
+
+    async def fake_text_generation(prompt, model, max_new_tokens):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "generated"
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", fake_text_generation)
+
+    async def run():
+        return await asyncio.gather(
+            *[services.hf_client._call_model("burst prompt") for _ in range(4)]
+        )
+
+    assert asyncio.run(run()) == ["generated"] * 4
+    assert calls == 1
+
+
+def test_each_waiter_applies_its_own_deadline(monkeypatch):
+    prompt_deadlines = []
+
+    async def fake_text_generation(prompt, model, max_new_tokens):
+        prompt_deadlines.append(_deadline.get())
+        await asyncio.sleep(0.3)
+        return "generated"
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", fake_text_generation)
+    # Long enough that the token cap is not what separates the two calls
+    monkeypatch.setattr(services.settings, "llm_first_token_seconds", 0.0)
+    monkeypatch.setattr(services.settings, "llm_min_new_tokens", 1)
+    monkeypatch.setattr(services.settings, "llm_tokens_per_second", 10000.0)
+
+    async def with_deadline(seconds):
+        _deadline.set(time.monotonic() + seconds)
+        return await services.hf_client._call_model("shared prompt")
+
+    async def run():
+        impatient = asyncio.create_task(with_deadline(0.1))
+        await asyncio.sleep(0)
+        patient = asyncio.create_task(services.hf_client._call_model("shared prompt"))
+        return await asyncio.gather(impatient, patient, return_exceptions=True)
+
+    start = time.perf_counter()
+    impatient, patient = asyncio.run(run())
+
+    assert isinstance(impatient, DeadlineExceeded)
+    assert patient == "generated"
+    # One upstream call, made without the first caller's deadline
+    assert prompt_deadlines == [None]
+    assert time.perf_counter() - start < 1
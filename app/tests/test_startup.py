@@ -0,0 +1,62 @@
+import asyncio
+import subprocess
+import sys
+import threading
+
+from fastapi.testclient import TestClient
+
+from app import warmup
+from app.main import app
+from app.services import settings
+
+
+def test_importing_the_app_defers_heavy_dependencies():
+    code = (
+        "import sys, app.main; "
+        "print(','.join(m for m in ('huggingface_hub', 'pypdf') if m in sys.modules))"
+    )
+    # No HF_API_KEY: the app still imports and reports itself not ready
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, env={}
+    )
+    assert out.stdout.strip() == ""
+
+
+def test_ready_waits_for_the_warm_up(monkeypatch):
+    gate = threading.Event()
+    monkeypatch.setattr(warmup.readiness, "checks", {})
+    monkeypatch.setattr(warmup, "_steps", lambda: {"slow": gate.wait})
+    monkeypatch.setattr(settings, "hf_api_key", "x")
+
+    async def run():
+        task = asyncio.create_task(warmup.warm_up())
+        await asyncio.sleep(0.05)
+        while_pending = warmup.readiness.report()
+        gate.set()
+        await task
+        return while_pending, warmup.readiness.report()
+
+    (ready_before, checks_before), (ready_after, checks_after) = asyncio.run(run())
+
+    assert not ready_before and checks_before["slow"] == warmup.PENDING
+    assert ready_after and checks_after == {"slow": warmup.OK, "llm_backend": warmup.OK}
+
+
+def test_ready_reports_failed_steps_and_missing_key(monkeypatch):
+    def broken():
+        raise RuntimeError("no workers")
+
+    monkeypatch.setattr(warmup.readiness, "checks", {})
+    monkeypatch.setattr(warmup, "_steps", lambda: {"pdf_workers": broken})
+    monkeypatch.setattr(settings, "hf_api_key", "")
+    asyncio.run(warmup.warm_up())
+
+    with TestClient(app) as client:
+        assert client.get("/health").json() == {"status": "ok"}
+        resp = client.get("/ready")
+
+    assert resp.status_code == 503
+    assert resp.json()["checks"] == {
+        "pdf_workers": "failed: no workers",
+        "llm_backend": "Hugging Face API key not configured.",
+    }
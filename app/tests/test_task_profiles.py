@@ -0,0 +1,124 @@
+import asyncio
+
+from app import services
+from app.services import career_service
+from app.task_profiles import BulletListParser, LabelledTextParser, profile_for
+
+
+def feed_all(parser, chunks):
+    for chunk in chunks:
+        if parser.feed(chunk):
+            break
+    parser.close()
+    return parser
+
+
+def test_bullet_parser_stops_after_max_items():
+    parser = feed_all(
+        BulletListParser("SUGGESTIONS:", max_items=2),
+        ["SUGG", "ESTIONS:\n- One.\n", "- Two.", "\n- Three.\n"],
+    )
+
+    assert parser.done
+    assert parser.items == ["One.", "Two."]
+    assert parser.text() == "SUGGESTIONS:\n- One.\n- Two."
+
+
+def test_bullet_parser_stops_at_commentary_and_tolerates_missing_label():
+    parser = feed_all(
+        BulletListParser("SUGGESTIONS:", max_items=4),
+        ["- One.\n- Two.\n", "Note: these changes will help.\n"],
+    )
+
+    assert parser.items == ["One.", "Two."]
+    assert parser.text() == "- One.\n- Two.\n"
+
+
+def test_bullet_parser_joins_wrapped_bullets():
+    parser = feed_all(
+        BulletListParser("SUGGESTIONS:", max_items=2),
+        ["SUGGESTIONS:\n- Quantify the impact of the\n", "  billing migration.\n- Two.\n"],
+    )
+
+    assert parser.items == ["Quantify the impact of the billing migration.", "Two."]
+    assert parser.text().endswith("- Two.")
+
+    # Text after a blank line is not part of the list
+    raw = "SUGGESTIONS:\n- One is long\nand wraps.\n\nI hope this helps!\n- Two.\n"
+    assert services.parse_suggestions(raw) == ["One is long and wraps.", "Two."]
+
+
+def test_labelled_text_parser_drops_label_line_and_trailing_commentary():
+    parser = feed_all(
+        LabelledTextParser("SUMMARY:", max_lines=3),
+        ["SUMMARY:\nBackend engineer ", "with Python.\nNote: kept it short.\n"],
+    )
+
+    assert parser.done
+    assert parser.lines == 1
+    assert parser.text() == "SUMMARY:\nBackend engineer with Python.\n"
+
+
+def test_labelled_text_parser_keeps_label_like_summary_lines():
+    raw = "SUMMARY: Backend engineer.\nKey strengths: Python, AWS.\n\nNote: kept it short."
+
+    assert services.parse_summary(raw) == "Backend engineer.\nKey strengths: Python, AWS."
+
+
+def test_parse_helpers_ignore_output_after_the_structure():
+    raw = "SUGGESTIONS:\n- A.\n- B.\n- C.\n- D.\n- E.\n\nNote: these are generic."
+    assert services.parse_suggestions(raw) == ["A.", "B.", "C.", "D."]
+    assert services.parse_summary("SUMMARY: Engineer.\n\nExplanation: rewritten.") == "Engineer."
+
+
+def test_unknown_task_gets_the_default_profile():
+    assert profile_for("no_such_task") == profile_for(None)
+    assert profile_for("rewrite_summary").max_new_tokens < profile_for(None).max_new_tokens
+
+
+def test_improve_resume_closes_the_stream_after_the_fourth_bullet(monkeypatch):
+    sent = []
+    closed = []
+    calls = []
+
+    async def fake_text_generation(prompt, model, max_new_tokens, stream, stop):
+        calls.append({"max_new_tokens": max_new_tokens, "stop": stop})
+
+        async def tokens():
+            try:
+                for token in ["SUGGESTIONS:\n"] + [f"- Bullet {i}.\n" for i in range(1, 10)]:
+                    sent.append(token)
+                    yield token
+            finally:
+                closed.append(True)
+
+        return tokens()
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", fake_text_generation)
+
+    suggestions = asyncio.run(
+        career_service.improve_resume_from_text("Backend engineer, early stop test.", "Python role")
+    )
+
+    assert suggestions == [f"Bullet {i}." for i in range(1, 5)]
+    # The 5th bullet's line shows that the 4th is not wrapped
+    assert len(sent) == 6
+    assert closed == [True]
+    assert calls == [{"max_new_tokens": 256, "stop": list(profile_for("improve_resume").stop)}]
+
+
+def test_summary_stream_ends_when_the_summary_is_complete(monkeypatch):
+    async def fake_text_generation(prompt, model, max_new_tokens, stream, stop):
+        async def tokens():
+            for token in ["SUMMARY: Backend ", "engineer.\n\nI focused ", "on the JD."]:
+                yield token
+
+        return tokens()
+
+    monkeypatch.setattr(services.hf_text_client, "text_generation", fake_text_generation)
+
+    async def collect():
+        stream = services.hf_client._stream_model("prompt", task="rewrite_summary")
+        return [chunk async for chunk in stream]
+
+    assert "".join(asyncio.run(collect())) == "SUMMARY: Backend engineer.\n"
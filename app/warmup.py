@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from .config import settings
+from .matching import matching_engine
+from .pdf_extraction import warm_pool
+from .prompt_builder import _model_tokenizer
+from .services import llm_backend
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+OK = "ok"
+
+
+class Readiness:
+    """Progress of the startup warm-up, reported by /ready.
+
+    Each step is "pending", "ok" or "failed: <reason>". A step that fails
+    is retried lazily by the first request that needs it, but the process
+    stays unready so a load balancer keeps traffic away.
+    """
+
+    def __init__(self):
+        self.checks: Dict[str, str] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def report(self) -> Tuple[bool, Dict[str, str]]:
+        checks = dict(self.checks)
+        checks["llm_backend"] = llm_backend.missing_configuration() or OK
+        return all(state == OK for state in checks.values()), checks
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        seconds = None
+        if self.started_at is not None and self.finished_at is not None:
+            seconds = round(self.finished_at - self.started_at, 3)
+        return {"warmup_seconds": seconds}
+
+
+readiness = Readiness()
+
+
+def _steps() -> Dict[str, Callable[[], object]]:
+    return {
+        "inference_client": llm_backend.load,
+        "tokenizer": _model_tokenizer,
+        "matching_index": matching_engine.load,
+        "pdf_workers": warm_pool,
+    }
+
+
+async def _run_step(name: str, step: Callable[[], object]) -> None:
+    start = time.perf_counter()
+    try:
+        await asyncio.to_thread(step)
+    except Exception as e:
+        logger.exception("Warm-up step %s failed", name)
+        readiness.checks[name] = f"failed: {e}"
+    else:
+        readiness.checks[name] = OK
+        logger.info("Warm-up step %s took %.2fs", name, time.perf_counter() - start)
+
+
+async def warm_up() -> None:
+    """Load everything the first requests would otherwise wait for, in parallel."""
+    steps = _steps()
+    readiness.checks = {name: PENDING for name in steps}
+    readiness.started_at = time.perf_counter()
+    await asyncio.gather(*[_run_step(name, step) for name, step in steps.items()])
+    readiness.finished_at = time.perf_counter()
+
+
+def start_warmup() -> Optional[asyncio.Task]:
+    """Schedule `warm_up` so the server accepts requests (e.g. /health) meanwhile."""
+    if not settings.startup_warmup:
+        return None
+    return asyncio.create_task(warm_up())
@@ -0,0 +1,48 @@
+import json
+import logging
+import os
+import statistics
+from typing import Dict, List, Optional
+
+
+def configure_offline_env(inference_base_url: Optional[str] = None, backend: str = "huggingface") -> None:
+    """Settings for a self-contained run. Call before importing `app`.
+
+    No tokenizer download, no rate limiting, no LLM cache (every request
+    reaches the model) and an in-memory matching index. ``backend`` picks
+    how the app talks to ``inference_base_url``: the Hugging Face client or
+    the pooled OpenAI-compatible backend.
+    """
+    os.environ.setdefault("HF_API_KEY", "benchmark")
+    os.environ["PROMPT_USE_MODEL_TOKENIZER"] = "false"
+    os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+    os.environ["LLM_CACHE_BACKEND"] = "none"
+    os.environ["MATCHING_INDEX_DIR"] = ""
+    os.environ["LLM_BACKEND"] = backend
+    if inference_base_url:
+        os.environ["HF_INFERENCE_BASE_URL"] = inference_base_url
+        os.environ["LLM_BASE_URLS"] = json.dumps([inference_base_url])
+
+
+def quiet_app_logs() -> None:
+    """Per-request INFO logs would dominate the timings."""
+    for name in ("app", "httpx", "httpx2"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """Latency percentiles in milliseconds."""
+    values = sorted(latencies)
+    return {
+        "p50": percentile(values, 50) * 1000,
+        "p95": percentile(values, 95) * 1000,
+        "p99": percentile(values, 99) * 1000,
+        "mean": (statistics.fmean(values) if values else 0.0) * 1000,
+    }
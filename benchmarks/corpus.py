@@ -0,0 +1,100 @@
+"""Synthetic resumes and job descriptions of varying sizes.
+
+Documents are generated from a fixed seed, so runs are comparable.
+"""
+import random
+from dataclasses import dataclass
+from typing import Dict, List
+
+from app.tests.pdf_factory import make_pdf
+
+SKILLS = [
+    "Python", "FastAPI", "Django", "PostgreSQL", "Redis", "Kafka", "Docker", "Kubernetes",
+    "AWS", "GCP", "Terraform", "React", "TypeScript", "Go", "Java", "Spark", "Airflow",
+    "CI/CD", "GitHub Actions", "Prometheus", "gRPC", "GraphQL", "pandas", "PyTorch",
+]
+VERBS = ["Built", "Designed", "Led", "Migrated", "Optimized", "Automated", "Shipped", "Scaled"]
+THINGS = [
+    "a billing service", "the search API", "an event pipeline", "the deployment tooling",
+    "a recommendation model", "the onboarding flow", "an internal dashboard", "the auth layer",
+]
+OUTCOMES = [
+    "cutting p95 latency by {n}%", "serving {n}k requests per minute", "saving {n} hours a week",
+    "reducing cloud spend by {n}%", "raising test coverage to {n}%", "for {n}k daily users",
+]
+
+# name -> (roles, bullets per role, pages)
+SIZES = {
+    "small": (1, 4, 1),
+    "medium": (3, 6, 2),
+    "large": (6, 10, 5),
+}
+
+
+@dataclass
+class Document:
+    name: str
+    text: str
+    pdf: bytes
+
+
+def _bullet(rng: random.Random) -> str:
+    skills = " and ".join(rng.sample(SKILLS, 2))
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 90))
+    return f"- {rng.choice(VERBS)} {rng.choice(THINGS)} with {skills}, {outcome}."
+
+
+def resume_text(size: str, seed: int = 0) -> str:
+    roles, bullets, _ = SIZES[size]
+    rng = random.Random(f"{size}-{seed}")
+
+    lines = [
+        f"Candidate {seed}",
+        f"candidate{seed}@example.com | +1 555 0100",
+        "",
+        "SUMMARY",
+        f"Software engineer with {roles + 1} years of experience in "
+        f"{', '.join(rng.sample(SKILLS, 3))}.",
+        "",
+        "EXPERIENCE",
+    ]
+    for role in range(roles):
+        lines.append(f"Software Engineer, Company {role} (20{18 + role} - 20{19 + role})")
+        lines.extend(_bullet(rng) for _ in range(bullets))
+        lines.append("")
+
+    lines.append("SKILLS")
+    lines.append(", ".join(rng.sample(SKILLS, 10)))
+    lines.append("")
+    lines.append("EDUCATION")
+    lines.append("B.S. Computer Science, State University")
+    return "\n".join(lines)
+
+
+def resume_pdf(text: str, pages: int) -> bytes:
+    lines = text.splitlines()
+    per_page = max(1, -(-len(lines) // pages))
+    return make_pdf(["\n".join(lines[i : i + per_page]) for i in range(0, len(lines), per_page)])
+
+
+def resumes(seed: int = 0) -> Dict[str, Document]:
+    docs = {}
+    for size, (_, _, pages) in SIZES.items():
+        text = resume_text(size, seed)
+        docs[size] = Document(size, text, resume_pdf(text, pages))
+    return docs
+
+
+def job_description(seed: int = 0) -> str:
+    rng = random.Random(f"jd-{seed}")
+    required = rng.sample(SKILLS, 5)
+    nice = rng.sample([s for s in SKILLS if s not in required], 3)
+    return (
+        f"Backend Engineer #{seed}. We are looking for an engineer to build reliable services.\n"
+        f"Requirements: {', '.join(required)}. Experience with microservices and testing.\n"
+        f"Nice to have: {', '.join(nice)}."
+    )
+
+
+def job_descriptions(count: int) -> List[str]:
+    return [job_description(seed) for seed in range(count)]
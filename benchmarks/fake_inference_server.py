@@ -0,0 +1,275 @@
+"""Local stand-in for the Hugging Face inference API.
+
+Serves the routes the backend calls once `HF_INFERENCE_BASE_URL` (or, with
+`LLM_BACKEND=openai`, `LLM_BASE_URLS`) points here:
+
+    POST /models/<model id>                        text_generation (TGI format)
+    POST /models/<model id>/v1/chat/completions    chat_completion (OpenAI format)
+    POST /v1/completions, /v1/chat/completions     OpenAI-compatible server
+    GET  /health                                   200, or 503 when not healthy
+
+All POST routes support streaming. Latency before the first token, token rate, output
+length and injected 503s are configurable, so the whole request path can be
+load tested without network access.
+
+    python -m benchmarks.fake_inference_server --port 8081 --latency 0.2 --tokens-per-second 50
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List, Optional, Tuple
+
+SUGGESTIONS_REPLY = """SUGGESTIONS:
+- Lead with the backend projects that match the posting's Python and AWS stack.
+- Quantify the latency and throughput improvements from the caching work.
+- Name the CI/CD tooling you used instead of describing it generically.
+- Move the Kubernetes deployment experience into the most recent role.
+"""
+SUMMARY_REPLY = (
+    "SUMMARY: Backend engineer with hands-on Python, FastAPI and PostgreSQL "
+    "experience, focused on reliable APIs and measurable performance wins."
+)
+LETTER_REPLY = (
+    "Dear Hiring Manager,\n\nI am excited to apply for this role. In my recent "
+    "projects I built and operated Python services on AWS, and I would bring the "
+    "same care for reliability and clear communication to your team.\n\n"
+    "Sincerely,\nCandidate"
+)
+COMBINED_REPLY = (
+    "<<<SUGGESTIONS>>>\n" + SUGGESTIONS_REPLY.split("\n", 1)[1]
+    + "<<<SUMMARY>>>\n" + SUMMARY_REPLY.split(": ", 1)[1] + "\n"
+    + "<<<COVER_LETTER>>>\n" + LETTER_REPLY + "\n<<<END>>>"
+)
+FILLER = "The candidate consistently delivered well tested features on schedule".split()
+
+
+@dataclass
+class FakeServerConfig:
+    latency: float = 0.05             # seconds before the first token
+    tokens_per_second: float = 0.0    # 0 sends all tokens at once
+    output_tokens: int = 0            # pad replies to this many words; 0 keeps them as is
+    error_rate: float = 0.0           # share of requests answered with 503
+    retry_after: int = 0
+    healthy: bool = True              # what GET /health reports
+
+
+def reply_for(prompt: str, output_tokens: int) -> List[str]:
+    """Words of a canned reply that the backend's parsers understand."""
+    if "<<<COVER_LETTER>>>" in prompt:
+        text = COMBINED_REPLY
+    elif "SUGGESTIONS:" in prompt:
+        text = SUGGESTIONS_REPLY
+    elif "ONLY the SUMMARY" in prompt:
+        text = SUMMARY_REPLY
+    else:
+        text = LETTER_REPLY
+
+    words = text.replace("\n", " \n ").split(" ")
+    while len(words) < output_tokens:
+        words.append(FILLER[len(words) % len(FILLER)])
+    # Keep the separators so joining the tokens rebuilds the text
+    return [word + " " if word != "\n" else word for word in words if word]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "FakeInferenceServer"
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        pass
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._send_json(404, {"error": "Not found"})
+        elif self.server.config.healthy:
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(503, {"status": "unhealthy"})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        config = self.server.config
+        self.server.requests += 1
+
+        if random.random() < config.error_rate:
+            self._send_json(503, {"error": "Model is overloaded"}, {"Retry-After": str(config.retry_after)})
+            return
+
+        time.sleep(config.latency)
+
+        if self.path.endswith("/chat/completions"):
+            messages = payload.get("messages") or [{}]
+            tokens = reply_for(messages[-1].get("content", ""), config.output_tokens)
+            self._chat(tokens, bool(payload.get("stream")))
+        elif self.path.endswith("/v1/completions"):
+            tokens = reply_for(payload.get("prompt", ""), config.output_tokens)
+            self._completions(tokens, bool(payload.get("stream")))
+        else:
+            tokens = reply_for(payload.get("inputs", ""), config.output_tokens)
+            self._text_generation(tokens, bool(payload.get("stream")))
+
+    def _pace(self, tokens: List[str]) -> Iterator[Tuple[int, str]]:
+        delay = 1 / self.server.config.tokens_per_second if self.server.config.tokens_per_second else 0
+        for index, token in enumerate(tokens):
+            if delay:
+                time.sleep(delay)
+            yield index, token
+
+    def _text_generation(self, tokens: List[str], stream: bool) -> None:
+        if not stream:
+            list(self._pace(tokens))
+            self._send_json(200, [{"generated_text": "".join(tokens)}])
+            return
+
+        self._start_stream()
+        for index, token in self._pace(tokens):
+            last = index == len(tokens) - 1
+            self._send_event({
+                "index": index,
+                "token": {"id": index, "text": token, "logprob": 0.0, "special": False},
+                "generated_text": "".join(tokens) if last else None,
+                "details": None,
+            })
+        self._end_stream()
+
+    def _chat(self, tokens: List[str], stream: bool) -> None:
+        base = {"id": "fake", "created": int(time.time()), "model": "fake", "system_fingerprint": "fake"}
+        if not stream:
+            list(self._pace(tokens))
+            self._send_json(200, {
+                **base,
+                "object": "chat.completion",
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)},
+            })
+            return
+
+        self._start_stream()
+        for _, token in self._pace(tokens):
+            self._send_event({
+                **base,
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": {"role": "assistant", "content": token}, "finish_reason": None}],
+            })
+        self._send_chunk(b"data: [DONE]\n\n")
+        self._end_stream()
+
+    def _completions(self, tokens: List[str], stream: bool) -> None:
+        base = {"id": "fake", "object": "text_completion", "created": int(time.time()), "model": "fake"}
+        if not stream:
+            list(self._pace(tokens))
+            self._send_json(200, {
+                **base,
+                "choices": [{"index": 0, "text": "".join(tokens), "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)},
+            })
+            return
+
+        self._start_stream()
+        for _, token in self._pace(tokens):
+            self._send_event({**base, "choices": [{"index": 0, "text": token, "finish_reason": None}]})
+        self._send_chunk(b"data: [DONE]\n\n")
+        self._end_stream()
+
+    def _send_json(self, status: int, body, headers: Optional[dict] = None) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _start_stream(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _send_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _send_event(self, body: dict) -> None:
+        self._send_chunk(b"data: " + json.dumps(body).encode() + b"\n\n")
+
+    def _end_stream(self) -> None:
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+class FakeInferenceServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, config: Optional[FakeServerConfig] = None):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.config = config or FakeServerConfig()
+        self.requests = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeInferenceServer":
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "FakeInferenceServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="0 sends all tokens at once")
+    parser.add_argument("--output-tokens", type=int, default=0, help="pad replies to this many words")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+
+
+def config_from_args(args: argparse.Namespace) -> FakeServerConfig:
+    return FakeServerConfig(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        output_tokens=args.output_tokens,
+        error_rate=args.error_rate,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8081)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeInferenceServer(args.port, config_from_args(args))
+    print(f"Fake inference server on {server.url} (set HF_INFERENCE_BASE_URL={server.url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Concurrent load driver for the career endpoints.
+
+    python -m benchmarks.load --requests 200 --concurrency 16 --latency 0.2
+
+By default the app runs in-process (httpx ASGI transport) against a local
+fake inference server, so the full path (upload, PDF extraction, prompt
+building, model call, parsing) is exercised with no network access. Pass
+``--url`` to drive an already running server instead. Reports throughput
+and p50/p95/p99 latency per endpoint.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from . import corpus
+from .common import configure_offline_env, quiet_app_logs, summarize
+from .fake_inference_server import FakeInferenceServer, add_config_arguments, config_from_args
+
+
+@dataclass
+class Scenario:
+    name: str
+    path: str
+    build: Callable[[int], Dict[str, Any]]  # request number -> httpx request kwargs
+
+
+def scenarios(size: str) -> Dict[str, Scenario]:
+    def resume_file(i: int, field: str = "file") -> Dict[str, Any]:
+        # A distinct document per request, so extraction is never skipped
+        text = corpus.resume_text(size, seed=i)
+        pdf = corpus.resume_pdf(text, corpus.SIZES[size][2])
+        return {field: ("resume.pdf", pdf, "application/pdf")}
+
+    def jd(i: int) -> str:
+        return corpus.job_description(seed=i)
+
+    def letter_fields(i: int) -> Dict[str, str]:
+        return {
+            "job_title": "Backend Engineer",
+            "company_name": f"Company {i}",
+            "job_description": jd(i),
+        }
+
+    return {
+        "resumes": Scenario("resumes", "/api/career/resumes", lambda i: {"files": resume_file(i)}),
+        "keyword-gap": Scenario(
+            "keyword-gap",
+            "/api/career/keyword-gap",
+            lambda i: {"files": resume_file(i), "data": {"job_description": jd(i)}},
+        ),
+        "rewrite-summary": Scenario(
+            "rewrite-summary",
+            "/api/career/rewrite-summary-upload",
+            lambda i: {"files": resume_file(i), "data": {"job_description": jd(i)}},
+        ),
+        "smart-resume": Scenario(
+            "smart-resume",
+            "/api/career/smart-resume-upload",
+            lambda i: {"files": resume_file(i), "data": {"job_description": jd(i)}},
+        ),
+        "cover-letter": Scenario(
+            "cover-letter",
+            "/api/career/cover-letter",
+            lambda i: {"files": resume_file(i, "resume"), "data": letter_fields(i)},
+        ),
+        "full-analysis": Scenario(
+            "full-analysis",
+            "/api/career/full-analysis",
+            lambda i: {"files": resume_file(i, "resume"), "data": letter_fields(i)},
+        ),
+        "full-combined": Scenario(
+            "full-combined",
+            "/api/career/full-analysis?combined=true",
+            lambda i: {"files": resume_file(i, "resume"), "data": letter_fields(i)},
+        ),
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    first_seed: int = 0,
+) -> Dict[str, Any]:
+    # Build request bodies up front so PDF generation is not timed
+    bodies = [scenario.build(first_seed + i) for i in range(requests)]
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    next_request = 0
+
+    async def worker() -> None:
+        nonlocal next_request
+        while next_request < requests:
+            body = bodies[next_request]
+            next_request += 1
+            start = perf_counter()
+            try:
+                resp = await client.post(scenario.path, **body)
+                status = resp.status_code
+            except httpx.HTTPError:
+                status = 0
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == 200:
+                latencies.append(perf_counter() - start)
+
+    start = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    elapsed = perf_counter() - start
+
+    return {
+        "scenario": scenario.name,
+        "requests": requests,
+        "errors": requests - statuses.get(200, 0),
+        "statuses": statuses,
+        "throughput": requests / elapsed,
+        **summarize(latencies),
+    }
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    header = f"{'endpoint':<16} {'reqs':>6} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['scenario']:<16} {r['requests']:>6} {r['errors']:>6} {r['throughput']:>8.1f} "
+            f"{r['p50']:>8.1f} {r['p95']:>8.1f} {r['p99']:>8.1f}"
+        )
+
+
+async def run(args: argparse.Namespace, base_url: Optional[str]) -> List[Dict[str, Any]]:
+    headers = {"Cache-Control": "no-cache"}
+    if base_url:
+        client = httpx.AsyncClient(base_url=base_url, headers=headers, timeout=120)
+    else:
+        from app.main import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://benchmark",
+            headers=headers,
+            timeout=120,
+        )
+
+    available = scenarios(args.size)
+    names = list(available) if args.scenarios == "all" else args.scenarios.split(",")
+    results = []
+    async with client:
+        # Start the PDF worker processes and HTTP connections before timing
+        await run_scenario(client, available["rewrite-summary"], args.warmup, args.concurrency, 10**6)
+
+        for number, name in enumerate(names):
+            # Distinct documents per scenario, so no request reuses an
+            # earlier upload's extracted text
+            first_seed = number * args.requests
+            results.append(
+                await run_scenario(client, available[name], args.requests, args.concurrency, first_seed)
+            )
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(description="Load test the career endpoints")
+    parser.add_argument("--requests", type=int, default=100, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=8, help="untimed requests before the run")
+    parser.add_argument("--size", choices=list(corpus.SIZES), default="medium")
+    parser.add_argument("--scenarios", default="all", help="comma-separated, e.g. keyword-gap,rewrite-summary")
+    parser.add_argument("--url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument(
+        "--backend",
+        choices=["huggingface", "openai"],
+        default="huggingface",
+        help="how the in-process app calls the fake server",
+    )
+    parser.add_argument("--json", help="also write the results to this file")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.url:
+        results = asyncio.run(run(args, args.url))
+    else:
+        with FakeInferenceServer(config=config_from_args(args)) as server:
+            configure_offline_env(server.url, backend=args.backend)
+            quiet_app_logs()
+            try:
+                results = asyncio.run(run(args, None))
+            finally:
+                from app.pdf_extraction import shutdown_pool
+
+                shutdown_pool()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,69 @@
+"""Micro-benchmarks for the CPU-bound steps of a request.
+
+    python -m benchmarks.micro [--repeat 5]
+
+Prints the median time per call for PDF extraction, text normalization,
+section splitting, prompt fitting, keyword analysis, matching-index
+vectorization and model-output parsing, for small/medium/large resumes.
+"""
+import argparse
+import timeit
+from typing import Callable, List, Tuple
+
+from .common import configure_offline_env, quiet_app_logs
+
+configure_offline_env()
+
+from app.ats import analyze_keyword_gap  # noqa: E402
+from app.matching import term_frequencies  # noqa: E402
+from app.pdf_extraction import extract_text_from_pdf  # noqa: E402
+from app.prompt_builder import fit_resume_to_budget  # noqa: E402
+from app.resume_sections import split_sections  # noqa: E402
+from app.resume_store import normalize_resume_text  # noqa: E402
+from app.services import parse_suggestions, parse_summary  # noqa: E402
+from benchmarks import corpus  # noqa: E402
+from benchmarks.fake_inference_server import SUGGESTIONS_REPLY, SUMMARY_REPLY  # noqa: E402
+
+
+def time_call(fn: Callable[[], object], repeat: int) -> float:
+    """Median seconds per call, auto-ranging the loop count like `python -m timeit`."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    runs = sorted(t / number for t in timer.repeat(repeat=repeat, number=number))
+    return runs[len(runs) // 2]
+
+
+def cases() -> List[Tuple[str, str, Callable[[], object]]]:
+    jd = corpus.job_description()
+    out = []
+    for size, doc in corpus.resumes().items():
+        text = doc.text
+        out += [
+            ("extract_text_from_pdf", size, lambda pdf=doc.pdf: extract_text_from_pdf(pdf)),
+            ("normalize_resume_text", size, lambda t=text: normalize_resume_text(t)),
+            ("split_sections", size, lambda t=text: split_sections(t)),
+            ("fit_resume_to_budget", size, lambda t=text: fit_resume_to_budget("rewrite_summary", t, jd)),
+            ("analyze_keyword_gap", size, lambda t=text: analyze_keyword_gap(t, jd)),
+            ("term_frequencies", size, lambda t=text: term_frequencies(t)),
+        ]
+    out += [
+        ("parse_suggestions", "-", lambda: parse_suggestions(SUGGESTIONS_REPLY)),
+        ("parse_summary", "-", lambda: parse_summary(SUMMARY_REPLY)),
+    ]
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for extraction and parsing")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    quiet_app_logs()
+
+    print(f"{'benchmark':<24} {'size':<8} {'per call':>12}")
+    for name, size, fn in cases():
+        seconds = time_call(fn, args.repeat)
+        print(f"{name:<24} {size:<8} {seconds * 1e6:>10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
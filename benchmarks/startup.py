@@ -0,0 +1,105 @@
+"""Cold-start benchmark: import time, time to /health and /ready, first upload.
+
+    python -m benchmarks.startup [--runs 5] [--no-warmup]
+
+Each run is a fresh interpreter, as on a scale-to-zero host. The child
+process imports the app, enters its lifespan, then times the first /health
+response, the first 200 from /ready and a first PDF upload (which needs a
+PDF worker process). ``--no-warmup`` sets STARTUP_WARMUP=false, so the
+upload pays for everything the warm-up would have loaded. Reports medians.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+from time import perf_counter
+from typing import Dict, List, Optional
+
+FIELDS = ("interpreter", "import", "health", "ready", "first_upload")
+
+
+async def _measure_child() -> Dict[str, float]:
+    start = perf_counter()
+    from app.main import app
+
+    timings = {"import": perf_counter() - start}
+
+    import httpx
+
+    from . import corpus
+
+    pdf = corpus.resume_pdf(corpus.resume_text("medium", seed=0), corpus.SIZES["medium"][2])
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url="http://startup", timeout=120
+    ) as client:
+        # From here on the server would be accepting connections
+        started = perf_counter()
+        resp = await client.get("/health")
+        resp.raise_for_status()
+        timings["health"] = perf_counter() - started
+
+        while (await client.get("/ready")).status_code != 200:
+            await asyncio.sleep(0.01)
+        timings["ready"] = perf_counter() - started
+
+        upload_start = perf_counter()
+        resp = await client.post(
+            "/api/career/resumes", files={"file": ("resume.pdf", pdf, "application/pdf")}
+        )
+        resp.raise_for_status()
+        timings["first_upload"] = perf_counter() - upload_start
+    return timings
+
+
+def _child() -> None:
+    from .common import configure_offline_env, quiet_app_logs
+
+    configure_offline_env()
+    quiet_app_logs()
+    print(json.dumps(asyncio.run(_measure_child())))
+
+
+def run_once(warmup: bool) -> Dict[str, float]:
+    env = dict(os.environ, STARTUP_WARMUP="true" if warmup else "false")
+
+    start = perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True, env=env)
+    interpreter = perf_counter() - start
+
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child"],
+        check=True,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    return {"interpreter": interpreter, **json.loads(out.stdout.strip().splitlines()[-1])}
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, float]:
+    parser = argparse.ArgumentParser(description="Measure cold-start latency")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-warmup", action="store_true", help="run with STARTUP_WARMUP=false")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child()
+        return {}
+
+    runs = [run_once(warmup=not args.no_warmup) for _ in range(args.runs)]
+    medians = {field: statistics.median(run[field] for run in runs) for field in FIELDS}
+
+    print(f"{'stage':<14} {'median ms':>10}")
+    print("-" * 25)
+    for field in FIELDS:
+        print(f"{field:<14} {medians[field] * 1000:>10.1f}")
+    return medians
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])